@@ -1,11 +1,22 @@
-import maya.cmds as cmds
-from PySide2.QtWidgets import QCheckBox, QGroupBox, QVBoxLayout, QLabel, QLineEdit, QGridLayout, QSpinBox, QWidget, \
-    QPushButton
+from scene_backend import cmds
+from PySide2.QtWidgets import QCheckBox, QGroupBox, QVBoxLayout, QLabel, QLineEdit, QGridLayout, QWidget, \
+    QPushButton, QTableView, QHeaderView, QAbstractItemView, QDoubleSpinBox, QSpinBox, \
+    QFileDialog, QHBoxLayout, QTableWidget, QTableWidgetItem
 
-from anim_cam_manager_utils import extend_keyframe, duplicate_camera, set_keyframe_all_attr, copy_keyframes, \
-    get_camera_name
+from anim_cam_manager_utils import DEFAULT_CAMERAS, query_cache
+from bake_cache import BakeCache
 from cam_entry import CameraEntry
-from frame_spinbox import FrameSpinbox
+from camera_discovery import discover_cameras
+from shot_table_model import FrameDelegate, ShotTableModel
+from shot_validator import filter_shot_ranges
+
+
+# A reload replaces the window class, so close the window of the one it replaces, killing its script jobs.
+if globals().get('_window') is not None:
+    _window.close()
+
+# The window is kept for the session, so it reopens instantly with the ranges as they were left.
+_window = None
 
 
 class AnimaticCamManager(QWidget):
@@ -18,14 +29,32 @@ class AnimaticCamManager(QWidget):
         self.setWindowTitle("Animatic Camera Window")
         self.warnings = []
         self.uber_cam = None
+        self.scheduler = None
+        # Baked shots are reused across builds and scenes.
+        self.bake_cache = BakeCache()
 
         # Params concerning the board.
         self.camera_entries = list()
-        self.spinbox_widgets = list()
+        self.shot_model = None
         self.cam_name_le = QLineEdit('UberCam')
         self.bake_cb = QCheckBox()
+        self.update_cb = QCheckBox()
+        self.reduce_cb = QCheckBox()
+        self.limit_memory_cb = QCheckBox()
+        self.live_cb = QCheckBox()
+        self.profile_cb = QCheckBox()
+        self.verify_cb = QCheckBox()
+        # Profiler of the last build, shown with its warnings.
+        self.profiler = None
+        self.tolerance_sb = QDoubleSpinBox()
+        self.memory_limit_sb = QSpinBox()
         # Don't create camera entries for default cameras.
-        self.cameras_to_avoid = ['top', 'front', 'side', 'persp']
+        self.cameras_to_avoid = DEFAULT_CAMERAS
+        # Whether the cameras may have changed, or another scene been opened, since the board was filled.
+        self.scene_changed = False
+        self.scene_replaced = False
+        self.script_jobs = list()
+        self.key_edit_callbacks = list()
 
         # Create the camera entries
         self.set_camera_entries()
@@ -33,6 +62,8 @@ class AnimaticCamManager(QWidget):
         # Create the window layout.
         self.init_gui()
 
+        self.install_scene_callbacks()
+
 
     def init_gui(self):
         '''Create and add widgets to the window.'''
@@ -44,35 +75,68 @@ class AnimaticCamManager(QWidget):
         settings_layout = QGridLayout()
 
         # Add widgets to the board
-        if self.camera_entries:
-            settings_layout.addWidget(QLabel("Camera To Create:"), 0, 0)
-            settings_layout.addWidget(self.cam_name_le, 0, 1)
-
-            settings_layout.addWidget(QLabel("Camera Name:"), 1, 0)
-            settings_layout.addWidget(QLabel("In Frame:"), 1, 1)
-            settings_layout.addWidget(QLabel("Out Frame:"), 1, 2)
-            settings_layout.addWidget(QLabel("Include Cam:"), 1, 3)
-
-        i = 0
-        if not self.camera_entries:
-            settings_layout.addWidget(QLabel("No cameras other than defaults in the scene."), 2, 0)
-        else:
-            for i, camera_entry in enumerate(self.camera_entries):
-                for j, widget in enumerate(camera_entry.widgets):
-                    settings_layout.addWidget(widget, i + 2, j)
-
-                    # Connect widgets on the camera entries to affect all others when their state is changed.
-                    if isinstance(widget, QCheckBox):
-                        widget.stateChanged.connect(lambda: self.reset_widget_colours())
-                    if isinstance(widget, FrameSpinbox):
-                        widget.valueChanged.connect(lambda: self.reset_widget_colours())
-
-            # Resets the spinboxes and updates colours respective of neighbouring boxes.
-            self.reset_widget_colours()
-
-            self.bake_cb.setChecked(True)
-            settings_layout.addWidget(QLabel("Bake and extend frames?"), i + 3, 0)
-            settings_layout.addWidget(self.bake_cb, i + 3, 1)
+        settings_layout.addWidget(QLabel("Camera To Create:"), 0, 0)
+        settings_layout.addWidget(self.cam_name_le, 0, 1)
+
+        # Only the visible rows are painted, and editors are only created for the cell being edited.
+        self.shot_model = ShotTableModel(self.camera_entries)
+        self.shot_table = QTableView()
+        self.shot_table.setModel(self.shot_model)
+        self.frame_delegate = FrameDelegate(self.shot_table)
+        self.shot_table.setItemDelegateForColumn(ShotTableModel.IN_COLUMN, self.frame_delegate)
+        self.shot_table.setItemDelegateForColumn(ShotTableModel.OUT_COLUMN, self.frame_delegate)
+        self.shot_table.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self.shot_table.verticalHeader().hide()
+        self.shot_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.shot_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.shot_table.setMinimumHeight(300 * self.scale)
+        settings_layout.addWidget(self.shot_table, 1, 0, 1, 4)
+
+        self.no_cameras_la = QLabel("No cameras other than defaults in the scene.")
+        settings_layout.addWidget(self.no_cameras_la, 2, 0, 1, 4)
+
+        self.bake_cb.setChecked(True)
+        settings_layout.addWidget(QLabel("Bake and extend frames?"), 3, 0)
+        settings_layout.addWidget(self.bake_cb, 3, 1)
+
+        settings_layout.addWidget(QLabel("Update existing uber cam?"), 4, 0)
+        settings_layout.addWidget(self.update_cb, 4, 1)
+
+        # Redundant baked keys are removed while the curves stay within the tolerance of every frame.
+        self.tolerance_sb.setDecimals(4)
+        self.tolerance_sb.setRange(0, 10)
+        self.tolerance_sb.setSingleStep(0.001)
+        self.tolerance_sb.setValue(0.001)
+        self.tolerance_sb.setEnabled(False)
+        self.tolerance_sb.setToolTip("In degrees for rotations and scene units for distances.")
+        self.reduce_cb.stateChanged.connect(lambda: self.tolerance_sb.setEnabled(self.reduce_cb.isChecked()))
+        settings_layout.addWidget(QLabel("Reduce baked keys?"), 5, 0)
+        settings_layout.addWidget(self.reduce_cb, 5, 1)
+        settings_layout.addWidget(QLabel("Tolerance:"), 5, 2)
+        settings_layout.addWidget(self.tolerance_sb, 5, 3)
+
+        # Long sequences are baked through windows of frames small enough to keep the samples under the limit.
+        self.memory_limit_sb.setRange(1, 65536)
+        self.memory_limit_sb.setSuffix(" MB")
+        self.memory_limit_sb.setValue(256)
+        self.memory_limit_sb.setEnabled(False)
+        self.limit_memory_cb.stateChanged.connect(
+            lambda: self.memory_limit_sb.setEnabled(self.limit_memory_cb.isChecked()))
+        settings_layout.addWidget(QLabel("Limit bake memory?"), 6, 0)
+        settings_layout.addWidget(self.limit_memory_cb, 6, 1)
+        settings_layout.addWidget(QLabel("Memory limit:"), 6, 2)
+        settings_layout.addWidget(self.memory_limit_sb, 6, 3)
+
+        # A live uber cam switches between the shot cameras instead of baking them, until it is finalized.
+        settings_layout.addWidget(QLabel("Live switching rig?"), 7, 0)
+        settings_layout.addWidget(self.live_cb, 7, 1)
+
+        settings_layout.addWidget(QLabel("Profile build?"), 8, 0)
+        settings_layout.addWidget(self.profile_cb, 8, 1)
+
+        # Baked samples are checked against maya on every frame, and held frames against the end frame of their shot.
+        settings_layout.addWidget(QLabel("Verify bake?"), 9, 0)
+        settings_layout.addWidget(self.verify_cb, 9, 1)
 
         settings_box = QGroupBox()
         settings_box.setLayout(settings_layout)
@@ -87,14 +151,15 @@ class AnimaticCamManager(QWidget):
         self.create_uber_cam_bt = QPushButton("Build Uber Camera", self)
         self.create_uber_cam_bt.clicked.connect(lambda: self.create_uber_cam())
 
-        if not self.camera_entries:
-            self.create_uber_cam_bt.setEnabled(False)
+        self.finalize_bt = QPushButton("Finalize Live Rig", self)
+        self.finalize_bt.clicked.connect(lambda: self.finalize_live_rig())
 
         self.refresh_window_bt = QPushButton("Refresh Window", self)
         self.refresh_window_bt.clicked.connect(lambda: self.refresh_window())
 
         bottom_buttons_layout.addWidget(self.create_uber_cam_bt, 0, 0)
-        bottom_buttons_layout.addWidget(self.refresh_window_bt, 0, 1)
+        bottom_buttons_layout.addWidget(self.finalize_bt, 0, 1)
+        bottom_buttons_layout.addWidget(self.refresh_window_bt, 0, 2)
 
         bottom_buttons_box.setLayout(bottom_buttons_layout)
 
@@ -103,188 +168,253 @@ class AnimaticCamManager(QWidget):
         self.window_main_layout.addWidget(settings_box)
         self.window_main_layout.addWidget(bottom_buttons_box)
 
+        self.update_board_state()
 
-    def reset_widget_colours(self):
-        '''Update the widget colours, called by changes to the ui.'''
 
-        # Reset the list.
-        self.spinbox_widgets = list()
+    def update_board_state(self):
+        '''Show the table or the no cameras message, and only allow building when there are cameras.'''
 
-        for camera_entry in self.camera_entries:
-            if camera_entry.to_include_cb.isChecked():
-                for widget in camera_entry.widgets:
-                    # Add function to track the colour if the widget is a QSpinBox.
-                    if isinstance(widget, FrameSpinbox):
-                        self.spinbox_widgets.append(widget)
+        self.shot_table.setVisible(bool(self.camera_entries))
+        self.no_cameras_la.setVisible(not self.camera_entries)
+        self.create_uber_cam_bt.setEnabled(bool(self.camera_entries) and not self.scheduler_running())
 
-        self.track_colour()
 
-        for widget in self.spinbox_widgets:
-            widget.update_colour()
+    def scheduler_running(self):
+        '''Returns whether a build is running in the background.'''
+        return bool(self.scheduler and self.scheduler.timer.isActive())
 
 
-    def track_colour(self):
-        '''Set the prev and next spinboxes relative to the current one to correctly track the colour.'''
+    def set_camera_entries(self):
+        '''Create the camera entry classes.'''
 
-        for k, spinbox in enumerate(self.spinbox_widgets):
+        camera_entries = list()
 
-            # Reset spinboxes
-            spinbox.prev_spinbox, spinbox.next_spinbox = None, None
+        # List through the cameras in maya and classes containing camera info.
+        for camera_record in discover_cameras(self.cameras_to_avoid):
+            camera_entries.append(CameraEntry(camera_record))
 
-            if len(self.spinbox_widgets) == 1:
-                break
-            if k != 0:
-                spinbox.prev_spinbox = self.spinbox_widgets[k-1]
-            if k != len(self.spinbox_widgets)-1:
-                spinbox.next_spinbox = self.spinbox_widgets[k+1]
+        self.camera_entries = camera_entries
 
 
-    def set_camera_entries(self):
-        '''Create the camera entry classes.'''
+    def filter_cameras(self):
+        '''Filter out the cameras to include based on checkboxes and whether frame ranges will disrupt tool.'''
 
-        camera_entries = list()
+        # Filter out cameras that are not checked in ui, then those whose frame ranges conflict with another.
+        included_cams = [scene_camera for scene_camera in self.camera_entries if scene_camera.to_include]
+        cams_to_include, warnings = filter_shot_ranges(included_cams)
+        self.warnings.extend(warnings)
 
-        # List through the cameras in maya and classes containing camera info and widgets.
-        for camera_name in self.get_cameras():
-            camera_entries.append(CameraEntry(camera_name))
+        return cams_to_include
 
-        self.camera_entries = camera_entries
 
+    def create_uber_cam(self):
+        '''Start building the uber cam based on the GUI inputs and camera entries.'''
+
+        # Filter out the cameras from the camera entries to just the ones we need.
+        cams_to_include = self.filter_cameras()
 
-    def get_cameras(self):
-        '''Get the full maya camera name paths.'''
+        shots = [camera_entry.get_shot_range() for camera_entry in cams_to_include]
 
-        scene_camera_full_names = cmds.ls(type=('camera'), l=True)
-        camera_full_names = list()
+        # A live uber cam only connects the shot cameras, so it is built straight away.
+        if self.live_cb.isChecked():
+            from live_rig import LiveRigBuilder
 
-        # Remove cameras to avoid from the list.
-        for camera_full_name in scene_camera_full_names:
-            camera_name = get_camera_name(camera_full_name)
+            builder = LiveRigBuilder(self.cam_name_le.text(), shots)
+            self.uber_cam = builder.build()
+            self.warnings.extend(builder.warnings)
+            self.show_warnings()
+            self.close()
+            return
 
-            if camera_name not in self.cameras_to_avoid:
-                camera_full_names.append(camera_full_name)
+        self.start_build(shots, self.bake_cb.isChecked())
 
-        return camera_full_names
 
+    def finalize_live_rig(self):
+        '''Bake the live uber cam named in the window in its place.'''
 
-    def filter_cameras(self):
-        '''Filter out the cameras to include based on checkboxes and whether frame ranges will disrupt tool.'''
+        from live_rig import finalize_rig, read_rig
 
-        cams_to_include = list()
+        cam_name = self.cam_name_le.text()
+        if not cmds.objExists(cam_name) or read_rig(cam_name) is None:
+            self.warnings.append(f"There is no live uber cam named {cam_name} to finalize.")
+            self.show_warnings()
+            return
 
-        # Filter out cameras that are not checked in ui, or whose frame ranges conflict.
-        for scene_camera in self.camera_entries:
-            if not scene_camera.to_include_cb.isChecked():
-                continue
-            if scene_camera.in_frame_sb.value() > scene_camera.out_frame_sb.value():
-                self.warnings.append(f"Ignoring {scene_camera.camera_name} as in frame greater than out frame.")
-                continue
-            cams_to_include.append(scene_camera)
+        # The live uber cam is put back if the bake fails.
+        try:
+            builder = finalize_rig(cam_name, undoable=True, verify_holds=self.verify_cb.isChecked(),
+                                   **self.get_builder_kwargs())
+        except Exception as error:
+            self.warnings.append(f"Finalize failed and the live uber cam was kept: {error}")
+            self.show_warnings()
+            return
 
-        # Filter out cameras whose frame overlaps with the next.
-        new_cams_to_include = list()
+        self.finish_uber_cam(builder, True)
 
-        # Filter out cameras whose frames overlap.
-        for i, scene_camera in enumerate(cams_to_include):
-            if not i == len(cams_to_include) - 1:
-                next_cam = cams_to_include[i + 1]
-                if scene_camera.out_frame_sb.value() >= next_cam.in_frame_sb.value():
-                    self.warnings.append(f"Ignoring {scene_camera.camera_name} as out frame overlaps with next camera.")
-                    continue
-            new_cams_to_include.append(scene_camera)
 
-        return new_cams_to_include
+    def get_builder_kwargs(self):
+        '''Returns the build options set in the window, as keyword arguments of an UberCamBuilder.'''
 
+        # The profiler is only imported once a build is started, keeping the window quick to open.
+        from build_profiler import BuildProfiler
 
-    def create_uber_cam(self):
-        '''Create the uber cam based on the GUI inputs and camera entries.'''
+        reduce_tolerance = self.tolerance_sb.value() if self.reduce_cb.isChecked() else None
+        memory_limit = self.memory_limit_sb.value() * 1024 * 1024 if self.limit_memory_cb.isChecked() else None
+        self.profiler = BuildProfiler() if self.profile_cb.isChecked() else None
 
-        # Filter out the cameras from the camera entries to just the ones we need.
-        cams_to_include = self.filter_cameras()
+        return {'bake_cache': self.bake_cache, 'reduce_tolerance': reduce_tolerance, 'profiler': self.profiler,
+                'memory_limit': memory_limit, 'verify_samples': self.verify_cb.isChecked()}
 
-        # Simply duplicate the only camera as the uber camera if there is only one cam to include.
-        if len(cams_to_include) == 1:
-            new_cam_path = duplicate_camera(cams_to_include[0].camera_path)
-            cmds.rename(new_cam_path, 'UberCam')
-            return
 
-        self.uber_cam = cmds.camera(name=self.cam_name_le.text())
-
-        # Loop through the cameras and copy keyframes, add a warning if there are gaps in frame ranges between cameras.
-        for i, scene_camera in enumerate(cams_to_include):
-            if i == len(cams_to_include) - 1:
-                self.copy_cam_keyframes(scene_camera, None)
-            else:
-                next_cam = cams_to_include[i + 1]
-                # Append warning if the out frame of this camera is not the frame before in frame of the next.
-                if scene_camera.out_frame_sb.value() + 1 != next_cam.in_frame_sb.value():
-                    warning = "On at lease one occasion," \
-                              " there are gaps of more than one frame between out frame and next in frame."
-                    if warning not in self.warnings:
-                        self.warnings.append(warning)
-                self.copy_cam_keyframes(scene_camera, next_cam)
-
-        # Display warnings if any.
-        if self.warnings:
-            warning_dialog = UberCamWarning(self.scale, self.warnings)
-            warning_dialog.show()
+    def start_build(self, shots, bake):
+        '''Start building an uber cam from the shots in the background, with the options set in the window.'''
+
+        # The builders are only imported once a build is started, keeping the window quick to open.
+        from build_scheduler import BuildProgress, BuildScheduler
+        from uber_cam_builder import UberCamBuilder
+
+        builder = UberCamBuilder(self.cam_name_le.text(), shots, bake, self.verify_cb.isChecked(),
+                                 update=self.update_cb.isChecked(), **self.get_builder_kwargs())
+
+        # Build a few units at a time from the event loop, so the build can be followed and cancelled.
+        self.scheduler = BuildScheduler(builder)
+        self.scheduler.finished.connect(lambda completed: self.finish_uber_cam(builder, completed))
+        self.build_progress = BuildProgress(self.scale, self.scheduler)
+        self.build_progress.show()
+
+        self.create_uber_cam_bt.setEnabled(False)
+        self.scheduler.start()
+
+
+    def finish_uber_cam(self, builder, completed):
+        '''Show the warnings of a build once it has completed, failed or been cancelled.'''
+
+        self.update_board_state()
+
+        if not completed:
+            # A cancelled build has been rolled back, leave the window open to fix the ranges. An update keeps the
+            # shots it rebuilt, so say what was kept.
+            if not self.scheduler.error:
+                self.warnings = list(builder.rollback_warnings)
+                if self.warnings:
+                    self.show_warnings()
+                return
+            self.warnings.append(f"Build failed and was rolled back: {self.scheduler.error}")
+            self.warnings.extend(builder.rollback_warnings)
+
+        self.uber_cam = builder.uber_cam
+        self.warnings.extend(builder.warnings)
+        if completed and builder.reduce_tolerance is not None:
+            self.warnings.append(f"Reduced the baked keys from {builder.key_counts['baked']} "
+                                 f"to {builder.key_counts['reduced']}.")
+
+        self.show_warnings()
+
+        if completed:
+            self.close()
+
+
+    def show_warnings(self):
+        '''Display warnings if any, and the profile of the build if it was profiled.'''
+
+        if self.warnings or self.profiler:
+            self.warning_dialog = UberCamWarning(self.scale, self.warnings, self.profiler)
+            self.warning_dialog.show()
             # Reset warnings.
             self.warnings = []
-
-        self.close()
+            self.profiler = None
 
 
-    def copy_cam_keyframes(self, scene_camera, next_cam):
-        '''Copy the camera keyframes from the scene_camera to the uber_cam.'''
+    def refresh_window(self, only_if_changed=False):
+        '''Update the board with the cameras added, removed or re-keyed since it was filled, keeping edited ranges.
 
-        # Duplicate cam as to not add keyframes to existing cam.
-        new_cam_path = duplicate_camera(scene_camera.camera_path)
-        set_keyframe_all_attr(new_cam_path, 0, False)
+        Only if changed, the scene is not queried at all unless a scene notification was received since.
+        '''
 
-        start_time = scene_camera.in_frame_sb.value()
-        end_time = scene_camera.out_frame_sb.value()
+        if only_if_changed and not (self.scene_changed or self.scene_replaced):
+            return
 
-        # Insert keyframe at the start and end of the ui time.
-        set_keyframe_all_attr(new_cam_path, start_time, True)
-        set_keyframe_all_attr(new_cam_path, end_time, True)
+        camera_records = discover_cameras(self.cameras_to_avoid)
 
-        # If bake every frame is checked.
-        if self.bake_cb.isChecked():
-            # Insert keyframes for every frame in the ui range.
-            for current_time in range(start_time, end_time):
-                set_keyframe_all_attr(new_cam_path, current_time, True)
-            # Extend the end of the cam animation to the beginning of the next camera.
-            if next_cam:
-                extend_keyframe(new_cam_path, end_time, next_cam.in_frame_sb.value() - end_time)
-                copy_keyframes(new_cam_path, self.uber_cam[0], start_time, next_cam.in_frame_sb.value())
-            else:
-                copy_keyframes(new_cam_path, self.uber_cam[0], start_time, end_time)
+        # Ranges edited in another scene mean nothing in this one.
+        if self.scene_replaced:
+            self.uber_cam = None
+            self.shot_model.reset_entries([CameraEntry(camera_record) for camera_record in camera_records])
         else:
-            # Copy keyframes to uber.
-            copy_keyframes(new_cam_path, self.uber_cam[0], start_time, end_time)
+            camera_records = {camera_record.camera_full_name: camera_record for camera_record in camera_records}
+            removed_rows = list()
+            rekeyed_rows = list()
 
-        # Delete the duplicate camera when we are done.
-        cmds.delete(new_cam_path)
+            for row, camera_entry in enumerate(self.camera_entries):
+                camera_record = camera_records.pop(camera_entry.camera_full_name, None)
+                if camera_record is None:
+                    removed_rows.append(row)
+                elif camera_entry.update_keyed_range(camera_record.keyed_range):
+                    rekeyed_rows.append(row)
 
+            self.shot_model.update_rows(rekeyed_rows)
+            self.shot_model.remove_rows(removed_rows)
+            # Records left are of cameras added since.
+            self.shot_model.append_entries([CameraEntry(camera_record) for camera_record in camera_records.values()])
 
-    def refresh_window(self):
-        """Refresh the current window."""
+        self.scene_changed = False
+        self.scene_replaced = False
+        self.update_board_state()
 
-        self.close()
-        create_new_window()
+
+    def install_scene_callbacks(self):
+        '''Listen for scene changes that may add, remove or re-key cameras, or replace the scene.'''
+
+        if self.script_jobs:
+            return
+
+        def set_scene_changed():
+            self.scene_changed = True
+
+        def set_scene_replaced():
+            self.scene_replaced = True
+
+        for event in ('DagObjectCreated', 'NameChanged', 'Undo', 'Redo'):
+            self.script_jobs.append(cmds.scriptJob(event=[event, set_scene_changed]))
+        for event in ('SceneOpened', 'NewSceneOpened'):
+            self.script_jobs.append(cmds.scriptJob(event=[event, set_scene_replaced]))
+        # Maya has no script job event for keys being edited or cameras deleted.
+        self.key_edit_callbacks = cmds.add_key_edit_callback(set_scene_changed)
+
+
+    def closeEvent(self, event):
+        '''Stop the window and the query cache listening for scene changes while the window is closed.'''
+
+        self.remove_scene_callbacks()
+        query_cache.remove_scene_callbacks()
+        super(AnimaticCamManager, self).closeEvent(event)
+
+
+    def remove_scene_callbacks(self):
+        '''Stop listening for scene changes.'''
+
+        for script_job in self.script_jobs:
+            if cmds.scriptJob(exists=script_job):
+                cmds.scriptJob(kill=script_job, force=True)
+        if self.key_edit_callbacks:
+            cmds.remove_callbacks(self.key_edit_callbacks)
+
+        self.script_jobs = list()
+        self.key_edit_callbacks = list()
 
 
 class UberCamWarning(QWidget):
-    def __init__(self, scale, warnings):
-        '''List warnings.'''
+    def __init__(self, scale, warnings, profiler=None):
+        '''List warnings, next to the time and commands of every stage if the build was profiled.'''
 
         super(UberCamWarning, self).__init__()
 
         self.scale = scale
-        self.setWindowTitle("Uber Cam Warning")
+        self.profiler = profiler
+        self.setWindowTitle("Uber Cam Summary" if profiler else "Uber Cam Warning")
 
         self.setContentsMargins(5 * self.scale, 5 * self.scale, 5 * self.scale, 5 * self.scale)
-        self.window_main_layout = QVBoxLayout()
+        self.window_main_layout = QHBoxLayout()
 
         settings_layout = QGridLayout()
         settings_layout.setColumnMinimumWidth(0, 300 * self.scale)
@@ -304,6 +434,66 @@ class UberCamWarning(QWidget):
         self.setLayout(self.window_main_layout)
         self.window_main_layout.addWidget(settings_box)
 
+        if profiler:
+            self.window_main_layout.addWidget(self.create_profile_box())
+
+
+    def create_profile_box(self):
+        '''Create the tables of the time, commands and keys of every stage and shot of the build.'''
+
+        profile_layout = QVBoxLayout()
+        report = self.profiler.get_report()
+
+        stage_rows = [[stage_name, stage['count'], f"{stage['seconds']:.3f}", stage['calls'],
+                       ', '.join(f"{command} {calls}" for command, calls in list(stage['commands'].items())[:3])]
+                      for stage_name, stage in report['stages'].items()]
+        profile_layout.addWidget(QLabel("Stages"))
+        profile_layout.addWidget(self.create_table(["Stage", "Runs", "Seconds", "Commands", "Top Commands"],
+                                                   stage_rows))
+
+        shot_rows = [[shot_name, f"{shot['seconds']:.3f}", shot['calls'], shot['keys']]
+                     for shot_name, shot in report['shots'].items()]
+        profile_layout.addWidget(QLabel("Shots"))
+        profile_layout.addWidget(self.create_table(["Shot", "Seconds", "Commands", "Keys"], shot_rows))
+
+        for cache_name, cache in report['caches'].items():
+            profile_layout.addWidget(QLabel(f"{cache_name}: {cache['hits']} hits, {cache['misses']} misses"))
+
+        self.save_report_bt = QPushButton("Save Report", self)
+        self.save_report_bt.clicked.connect(lambda: self.save_report())
+        profile_layout.addWidget(self.save_report_bt)
+
+        profile_box = QGroupBox("Profile")
+        profile_box.setLayout(profile_layout)
+
+        return profile_box
+
+
+    def create_table(self, headers, rows):
+        '''Create a read only table of rows of values.'''
+
+        table = QTableWidget(len(rows), len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().hide()
+        table.setMinimumWidth(500 * self.scale)
+
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(str(value)))
+        table.resizeColumnsToContents()
+
+        return table
+
+
+    def save_report(self):
+        '''Save the profile as a JSON report to compare with other builds.'''
+
+        report_path, _ = QFileDialog.getSaveFileName(self, "Save Build Report", "uber_cam_profile.json",
+                                                     "JSON (*.json)")
+        if report_path:
+            self.profiler.save(report_path, scene=cmds.file(query=True, sceneName=True))
+
 
     def close_window(self):
         """Close the current window."""
@@ -311,12 +501,26 @@ class UberCamWarning(QWidget):
         self.close()
 
 
-def create_new_window():
-    new_window = AnimaticCamManager(0.5)
-    new_window.show()
+def show_window(scale=0.5):
+    '''Show the window, creating it the first time and bringing it up to date with the scene after that.'''
+
+    global _window
+
+    if _window is None:
+        _window = AnimaticCamManager(scale)
+    else:
+        # Scene changes are not listened for while the window is closed, so check the cameras on reopening.
+        if not _window.script_jobs:
+            _window.install_scene_callbacks()
+            _window.scene_changed = True
+        _window.refresh_window(only_if_changed=True)
+
+    _window.show()
+    _window.raise_()
+    _window.activateWindow()
 
-    return new_window
+    return _window
 
 
 if __name__ == "__main__":
-    create_new_window()
+    show_window()
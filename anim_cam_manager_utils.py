@@ -1,17 +1,130 @@
-import maya.cmds as cmds
+from contextlib import contextmanager, ExitStack
 
+from build_profiler import profiled
+from scene_backend import cmds
 
-def extend_keyframe(transform_path, current_time, duration):
-    '''Extend the key attributes at the current time for a certain duration.'''
 
-    all_transform_key_attr = get_keyable_attributes(transform_path)
+# Cameras every scene starts with, never included in an uber cam.
+DEFAULT_CAMERAS = ['top', 'front', 'side', 'persp']
 
-    for new_keyframe_time in range(current_time + 1, current_time + duration + 1):
-        for attr in all_transform_key_attr:
-            key_value = cmds.getAttr(f"{transform_path}.{attr}", time=current_time)
-            cmds.setKeyframe(f"{transform_path}.{attr}", time=(new_keyframe_time, new_keyframe_time), value=key_value)
 
+class SceneQueryCache():
+    '''Cache of keyable attributes and shape paths per node, reused for the length of a build.'''
 
+    # Scene events after which cached paths or attributes may no longer be valid.
+    invalidating_events = ['SceneOpened', 'NewSceneOpened', 'NameChanged', 'Undo', 'Redo']
+
+    def __init__(self):
+
+        self.keyable_attributes = dict()
+        self.shape_paths = dict()
+        self.hits = 0
+        self.misses = 0
+        self.script_jobs = list()
+
+
+    def get_keyable_attributes(self, object_path):
+        '''Returns the keyable attributes on an object, querying maya only the first time.'''
+
+        if object_path in self.keyable_attributes:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.install_scene_callbacks()
+            self.keyable_attributes[object_path] = cmds.listAttr(object_path, keyable=True)
+
+        return self.keyable_attributes[object_path]
+
+
+    def get_shape_path(self, transform_path):
+        '''Returns the full path of the first shape under a transform, querying maya only the first time.'''
+
+        if transform_path in self.shape_paths:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.install_scene_callbacks()
+            self.shape_paths[transform_path] = cmds.listRelatives(transform_path, shapes=True, fullPath=True)[0]
+
+        return self.shape_paths[transform_path]
+
+
+    def install_scene_callbacks(self):
+        '''Clear the cache whenever the scene changes in a way that could invalidate it.'''
+
+        if self.script_jobs:
+            return
+
+        for event in self.invalidating_events:
+            self.script_jobs.append(cmds.scriptJob(event=[event, self.clear]))
+
+
+    def remove_scene_callbacks(self):
+        '''Kill the script jobs clearing the cache.'''
+
+        for script_job in self.script_jobs:
+            if cmds.scriptJob(exists=script_job):
+                cmds.scriptJob(kill=script_job, force=True)
+
+        self.script_jobs = list()
+
+
+    def clear(self):
+        '''Forget every cached query, called at the start of a build and on scene changes.'''
+
+        self.keyable_attributes = dict()
+        self.shape_paths = dict()
+
+
+    def reset_stats(self):
+        '''Reset the hit and miss counters.'''
+
+        self.hits = 0
+        self.misses = 0
+
+
+# A reload replaces the cache, so kill the script jobs of the one it replaces first.
+if globals().get('query_cache') is not None:
+    query_cache.remove_scene_callbacks()
+
+# Shared by every helper querying attributes or shapes.
+query_cache = SceneQueryCache()
+
+
+@contextmanager
+def suspended_scene(chunk_name, undoable=True):
+    '''Run a block of scene edits as one undo chunk, with viewport refresh, evaluation and auto key suspended.
+
+    Every setting is restored when the block exits, even when it raises. When not undoable, the edits are kept
+    off the undo queue entirely so its memory stays flat. With no chunk name, the edits join the undo chunk the
+    caller has open.
+    '''
+
+    with ExitStack() as restore_stack:
+        if undoable and chunk_name is not None:
+            cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+            restore_stack.callback(cmds.undoInfo, closeChunk=True)
+        else:
+            undo_state = cmds.undoInfo(query=True, state=True)
+            cmds.undoInfo(stateWithoutFlush=False)
+            restore_stack.callback(cmds.undoInfo, stateWithoutFlush=undo_state)
+
+        cmds.refresh(suspend=True)
+        restore_stack.callback(cmds.refresh, suspend=False)
+
+        # Pausing the viewport toggles it, so only toggle it back if it was running.
+        if not cmds.ogs(query=True, pause=True):
+            cmds.ogs(pause=True)
+            restore_stack.callback(cmds.ogs, pause=True)
+
+        auto_key_state = cmds.autoKeyframe(query=True, state=True)
+        cmds.autoKeyframe(state=False)
+        restore_stack.callback(cmds.autoKeyframe, state=auto_key_state)
+
+        yield
+
+
+@profiled
 def duplicate_camera(cam_to_dup):
     '''Duplicate the camera and copy the keyframes to the duplicate.'''
     new_cam_path = cmds.duplicate(cam_to_dup)[0]
@@ -23,28 +136,49 @@ def duplicate_camera(cam_to_dup):
     return new_cam_path
 
 
-def set_keyframe_all_attr(transform_path, frame, insert):
-    '''Set keyframes on all keyable attributes and the transform's shape.'''
-
-    all_transform_key_attr = get_keyable_attributes(transform_path)
+@profiled
+def transfer_keyframes(source_path, target_path, start_time, end_time):
+    '''Transfer the keyframes of a camera and its shape inside a time window directly onto the target camera.'''
 
-    # Set a key on everything.
-    for attr in all_transform_key_attr:
-        cmds.setKeyframe(transform_path, attribute=attr, insert=insert, time=(frame, frame))
+    # The curve option evaluates boundary keys into the clipboard, leaving the source curves untouched.
+    if get_keyframes(source_path):
+        cmds.copyKey(source_path, time=(start_time, end_time), option='curve')
+        cmds.pasteKey(target_path, time=(start_time, end_time), option='replace')
 
-    # Get the shape of the transform
-    shape_path = cmds.listRelatives(transform_path, shapes=True, fullPath=True)[0]
-    all_shape_key_attr = get_keyable_attributes(shape_path)
-
-    for attr in all_shape_key_attr:
-        cmds.setKeyframe(f"{shape_path}.{attr}", insert=insert, time=(frame, frame))
+    # Attributes without curves are not copied, key their static value at both ends of the window.
+    node_pairs = ((source_path, target_path), (get_shape_path(source_path), get_shape_path(target_path)))
+    for source_node, target_node in node_pairs:
+        for attr in get_static_attributes(source_node):
+            if not cmds.objExists(f"{target_node}.{attr}"):
+                continue
+            key_value = cmds.getAttr(f"{source_node}.{attr}")
+            for key_time in (start_time, end_time):
+                cmds.setKeyframe(f"{target_node}.{attr}", time=(key_time, key_time), value=key_value)
 
 
 def get_keyable_attributes(object_path):
     '''Returns the keyable attributes on an object.'''
-    return cmds.listAttr(object_path, keyable=True)
+    return query_cache.get_keyable_attributes(object_path)
+
+
+@profiled
+def get_static_attributes(object_path):
+    '''Returns the keyable attributes on an object that are not driven by an anim curve.'''
 
+    connections = cmds.listConnections(object_path, source=True, destination=False, connections=True,
+                                       plugs=False, type='animCurve') or list()
+    # Connections come in (attribute on object, anim curve) pairs.
+    animated_attributes = {plug.split('.', 1)[-1] for plug in connections[::2]}
 
+    return [attr for attr in get_keyable_attributes(object_path) or list() if attr not in animated_attributes]
+
+
+def get_shape_path(transform_path):
+    '''Returns the full path of the first shape under a transform.'''
+    return query_cache.get_shape_path(transform_path)
+
+
+@profiled
 def copy_keyframes(source_object, target_object, start_time, end_time):
     '''Copies all keyframes from one maya object to another.'''
 
@@ -66,3 +200,4 @@ def get_camera_name(camera_full_name):
     camera_name = camera_full_name.split('|')[-2]
 
     return camera_name
+
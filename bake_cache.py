@@ -0,0 +1,165 @@
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+
+class BakeCache():
+    '''Size bounded cache of baked shot samples on disk, keyed by the contents of what was baked.
+
+    Each entry is a small header followed by the samples of every plug as little-endian doubles. The least
+    recently used entries are evicted once the cache grows past its maximum size.
+    '''
+
+    file_extension = '.bake'
+    # Magic, version, plug count and frame count.
+    header = struct.Struct('<4sHII')
+    magic = b'ACMB'
+    version = 1
+
+    def __init__(self, cache_dir=None, max_bytes=512 * 1024 * 1024):
+
+        self.cache_dir = cache_dir or os.environ.get('ANIM_CAM_BAKE_CACHE') or \
+            os.path.join(tempfile.gettempdir(), 'anim_cam_manager_bake_cache')
+        self.max_bytes = max_bytes
+        # Size of every entry, read from disk on first use.
+        self.entry_sizes = None
+        self.hits = 0
+        self.misses = 0
+
+
+    def reset_stats(self):
+        '''Reset the hit and miss counters.'''
+
+        self.hits = 0
+        self.misses = 0
+
+
+    def get_key(self, curve_hash, attributes, start_time, end_time, hold_time):
+        '''Returns the key of the samples of a shot's attributes between start and end time.'''
+
+        key_hash = hashlib.sha1(curve_hash.encode())
+        key_hash.update(f"{attributes}{start_time}:{end_time}:{hold_time}".encode())
+
+        return key_hash.hexdigest()
+
+
+    def get_path(self, key):
+        '''Returns the file an entry is stored in.'''
+        return os.path.join(self.cache_dir, f"{key}{self.file_extension}")
+
+
+    def load(self, key):
+        '''Returns the samples stored for a key, one array per plug, None if there is no valid entry.'''
+
+        path = self.get_path(key)
+
+        try:
+            with open(path, 'rb') as cache_file:
+                data = cache_file.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        magic, version, plug_count, frame_count = None, None, 0, 0
+        if len(data) >= self.header.size:
+            magic, version, plug_count, frame_count = self.header.unpack_from(data)
+
+        if magic != self.magic or version != self.version or \
+                len(data) != self.header.size + plug_count * frame_count * 8:
+            self.remove(key)
+            self.misses += 1
+            return None
+
+        samples = array('d')
+        samples.frombytes(data[self.header.size:])
+        if sys.byteorder == 'big':
+            samples.byteswap()
+
+        # Touch the entry so it is evicted last, another process may have just evicted it.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+
+        return [samples[i * frame_count:(i + 1) * frame_count] for i in range(plug_count)]
+
+
+    def store(self, key, samples):
+        '''Store the samples of every plug for a key, evicting old entries if the cache grows too large.'''
+
+        frame_count = len(samples[0]) if samples else 0
+        values = array('d', [float(value) for plug_samples in samples for value in plug_samples])
+        if sys.byteorder == 'big':
+            values.byteswap()
+
+        data = self.header.pack(self.magic, self.version, len(samples), frame_count) + values.tobytes()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.get_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+
+        # Write to a temporary file first so readers never see half an entry.
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(data)
+        os.replace(temp_path, path)
+
+        self.get_entry_sizes()[key] = len(data)
+        self.evict()
+
+
+    def remove(self, key):
+        '''Delete an entry.'''
+
+        try:
+            os.remove(self.get_path(key))
+        except OSError:
+            pass
+
+        self.get_entry_sizes().pop(key, None)
+
+
+    def get_entry_sizes(self):
+        '''Returns the size of every entry, scanning the cache directory the first time.'''
+
+        if self.entry_sizes is None:
+            self.entry_sizes = dict()
+            if os.path.isdir(self.cache_dir):
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith(self.file_extension):
+                        self.entry_sizes[entry.name[:-len(self.file_extension)]] = entry.stat().st_size
+
+        return self.entry_sizes
+
+
+    def evict(self):
+        '''Delete the least recently used entries until the cache fits in its maximum size.'''
+
+        # Other processes share the directory, scan it again to see the entries they stored or removed.
+        self.entry_sizes = None
+        entry_sizes = self.get_entry_sizes()
+        if sum(entry_sizes.values()) <= self.max_bytes:
+            return
+
+        def last_used(key):
+            try:
+                return os.stat(self.get_path(key)).st_mtime
+            except OSError:
+                return 0
+
+        total_bytes = sum(entry_sizes.values())
+        for key in sorted(entry_sizes, key=last_used):
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= entry_sizes[key]
+            self.remove(key)
+
+
+    def clear(self):
+        '''Delete every entry.'''
+
+        for key in list(self.get_entry_sizes()):
+            self.remove(key)
@@ -0,0 +1,223 @@
+'''Build uber cams for many scene files without the window, across a pool of maya standalone processes.
+
+Run with mayapy, giving the scenes directly to build an uber cam from the keyed range of every camera:
+
+    mayapy batch_build.py seq010/*.ma --report seq010_report.json
+
+or a manifest giving the shots of each scene:
+
+    {"scenes": [{"scene": "seq010/anim.ma", "cam_name": "UberCam", "output": "seq010/anim_uber.ma",
+                 "shots": [{"camera": "|shot010_cam", "in_frame": 1001, "out_frame": 1048}, ...]}]}
+
+A scene can also list several outputs, each an uber cam built from some of its shots between optional frames,
+all baked from one sampling of the shot cameras:
+
+    "outputs": [{"cam_name": "UberCam"},
+                {"cam_name": "ReelA_cam", "cameras": ["shot010_cam", "shot020_cam"], "end_frame": 1100}]
+
+Each scene is saved next to the original with a suffix unless an output is given, and the report records the
+timing, warnings and any error of every scene. With --export-tracks every uber cam is also written to a camera
+track file, named after the saved scene and the camera, that can be read without opening the scene.
+'''
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+
+def initialize_worker():
+    '''Start maya once in every worker process.'''
+
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+
+
+def get_shots(scene_job):
+    '''Returns the shot ranges of a scene, from the job or from the keyed range of every camera, and any warnings.'''
+
+    from cam_entry import CameraEntry
+    from camera_discovery import discover_cameras
+    from shot_validator import filter_shot_ranges
+    from uber_cam_builder import ShotRange
+
+    if scene_job.get('shots'):
+        shots = [ShotRange(shot['camera'], shot['camera'].split('|')[-1], int(shot['in_frame']),
+                           int(shot['out_frame'])) for shot in scene_job['shots']]
+    else:
+        shots = [CameraEntry(camera_record).get_shot_range() for camera_record in discover_cameras()]
+
+    return filter_shot_ranges(shots)
+
+
+def get_outputs(scene_job, shots):
+    '''Returns the outputs listed for a scene, built from every shot unless they name their cameras.'''
+
+    from multi_output_builder import BuildOutput
+
+    outputs = list()
+
+    for output in scene_job['outputs']:
+        cameras = output.get('cameras')
+        output_shots = [shot for shot in shots
+                        if cameras is None or shot.camera_path in cameras or shot.camera_name in cameras]
+        outputs.append(BuildOutput(output['cam_name'], output_shots, output.get('start_frame'),
+                                   output.get('end_frame')))
+
+    return outputs
+
+
+def build_scene(scene_job):
+    '''Open a scene, build its uber cam and save it, returns the report of the scene.'''
+
+    from maya import cmds as maya_cmds
+
+    from bake_cache import BakeCache
+    from build_profiler import BuildProfiler
+    from cam_track import export_track
+    from multi_output_builder import MultiOutputBuilder
+    from uber_cam_builder import UberCamBuilder
+
+    scene_path = scene_job['scene']
+    root, extension = os.path.splitext(scene_path)
+    output_path = scene_job.get('output') or f"{root}{scene_job['suffix']}{extension}"
+    report = {'scene': scene_path, 'output': output_path, 'cam_name': scene_job['cam_name'], 'shots': 0,
+              'warnings': list(), 'error': None}
+    start_time = time.perf_counter()
+
+    try:
+        maya_cmds.file(scene_path, open=True, force=True)
+        report['open_seconds'] = time.perf_counter() - start_time
+
+        shots, warnings = get_shots(scene_job)
+        report['shots'] = len(shots)
+        report['warnings'].extend(warnings)
+
+        build_start_time = time.perf_counter()
+        if shots:
+            # There is nobody to undo a batch build, so keep it off the undo queue.
+            builder_kwargs = {'undoable': False, 'bake_cache': BakeCache(scene_job['bake_cache']),
+                              'verify_holds': scene_job['verify_holds'], 'verify_samples': scene_job['verify_samples'],
+                              'reduce_tolerance': scene_job['reduce_tolerance'],
+                              'memory_limit': scene_job['memory_limit'],
+                              'profiler': BuildProfiler() if scene_job['profile'] else None}
+            if scene_job.get('outputs'):
+                builder = MultiOutputBuilder(get_outputs(scene_job, shots), scene_job['bake'], **builder_kwargs)
+                report['cam_name'] = [output.cam_name for output in builder.outputs]
+                uber_cams = builder.build()
+            else:
+                builder = UberCamBuilder(scene_job['cam_name'], shots, scene_job['bake'], **builder_kwargs)
+                uber_cams = [builder.build()]
+            report['warnings'].extend(builder.warnings)
+            report['key_counts'] = builder.key_counts
+            if builder.profiler:
+                report['profile'] = builder.profiler.get_report()
+        else:
+            report['warnings'].append("No cameras to build an uber cam from.")
+        report['build_seconds'] = time.perf_counter() - build_start_time
+
+        if shots and scene_job['export_tracks']:
+            # Other departments read the uber cams from the tracks, without opening the scene.
+            export_start_time = time.perf_counter()
+            report['tracks'] = list()
+            for uber_cam in uber_cams:
+                track_path = f"{os.path.splitext(output_path)[0]}_{uber_cam[0].split('|')[-1]}.camtrack"
+                export_track(uber_cam[0], track_path)
+                report['tracks'].append(track_path)
+            report['export_seconds'] = time.perf_counter() - export_start_time
+
+        save_start_time = time.perf_counter()
+        maya_cmds.file(rename=output_path)
+        maya_cmds.file(save=True, force=True, type='mayaAscii' if extension.lower() == '.ma' else 'mayaBinary')
+        report['save_seconds'] = time.perf_counter() - save_start_time
+    except Exception:
+        # One broken scene should not stop the rest of the sequence.
+        report['error'] = traceback.format_exc()
+
+    report['seconds'] = time.perf_counter() - start_time
+
+    return report
+
+
+def get_scene_jobs(args):
+    '''Returns a job for every scene given on the command line or in the manifest.'''
+
+    scene_jobs = [{'scene': scene_path} for scene_path in args.scenes]
+
+    if args.manifest:
+        with open(args.manifest) as manifest_file:
+            scene_jobs.extend(json.load(manifest_file)['scenes'])
+
+    for scene_job in scene_jobs:
+        scene_job.setdefault('cam_name', args.cam_name)
+        scene_job.setdefault('bake', not args.no_bake)
+        scene_job.setdefault('reduce_tolerance', args.reduce_tolerance)
+        scene_job.setdefault('verify_holds', args.verify_holds)
+        scene_job.setdefault('verify_samples', args.verify_samples)
+        scene_job['suffix'] = args.suffix
+        scene_job['bake_cache'] = args.bake_cache
+        scene_job['profile'] = args.profile
+        scene_job['export_tracks'] = args.export_tracks
+        scene_job['memory_limit'] = args.memory_limit * 1024 * 1024 if args.memory_limit else None
+
+    return scene_jobs
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scenes', nargs='*', help="Scene files to build an uber cam in from every keyed camera.")
+    parser.add_argument('--manifest', help="JSON file listing the scenes, and optionally the shots, to build.")
+    parser.add_argument('--report', default='uber_cam_report.json', help="File to write the report to.")
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help="Maya processes to build scenes in, one per core by default.")
+    parser.add_argument('--cam-name', default='UberCam', help="Name of the uber cam when a scene does not give one.")
+    parser.add_argument('--suffix', default='_uber', help="Added to the scene name when a scene gives no output.")
+    parser.add_argument('--no-bake', action='store_true', help="Transfer keys rather than baking every frame.")
+    parser.add_argument('--reduce-tolerance', type=float, default=None,
+                        help="Remove baked keys while the curves stay within this tolerance of every frame, "
+                             "in degrees for rotations and scene units for distances.")
+    parser.add_argument('--verify-holds', action='store_true',
+                        help="Check every baked hold against keying each held frame, adding a warning if they differ.")
+    parser.add_argument('--verify-samples', action='store_true',
+                        help="Check the baked samples against querying maya on every frame, adding a warning if they "
+                             "differ.")
+    parser.add_argument('--bake-cache', help="Directory of the bake cache shared by every worker.")
+    parser.add_argument('--profile', action='store_true', help="Add the time and commands of every build stage.")
+    parser.add_argument('--memory-limit', type=int, default=None,
+                        help="Bake through windows of frames holding at most this many MB of samples per scene.")
+    parser.add_argument('--export-tracks', action='store_true',
+                        help="Write every uber cam to a camera track file next to the saved scene.")
+    parser.add_argument('--scenes-per-worker', type=int, default=None,
+                        help="Restart a worker after building this many scenes, to keep its memory in check.")
+    args = parser.parse_args()
+
+    scene_jobs = get_scene_jobs(args)
+    if not scene_jobs:
+        parser.error("No scenes to build, give scene files or a manifest.")
+
+    workers = max(min(args.workers, len(scene_jobs)), 1)
+    start_time = time.perf_counter()
+    reports = list()
+
+    # Maya can only be started in fresh processes.
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers, initializer=initialize_worker,
+                      maxtasksperchild=args.scenes_per_worker) as pool:
+        for report in pool.imap_unordered(build_scene, scene_jobs):
+            status = 'failed' if report['error'] else f"{report['shots']} shots"
+            print(f"{report['scene']}: {status} in {report['seconds']:.1f}s")
+            reports.append(report)
+
+    reports.sort(key=lambda report: report['scene'])
+    with open(args.report, 'w') as report_file:
+        json.dump({'workers': workers, 'seconds': time.perf_counter() - start_time, 'scenes': reports},
+                  report_file, indent=4)
+
+    return 1 if any(report['error'] for report in reports) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
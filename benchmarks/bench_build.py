@@ -0,0 +1,122 @@
+'''Benchmark uber cam builds on synthetic sequences in an in-memory scene.
+
+Reports the wall time and scene command calls of every build stage, e.g.
+
+    python benchmarks/bench_build.py --shots 10 100 1000 --lengths 24 96
+'''
+import argparse
+import json
+import time
+
+from synthetic_scene import build_sequence
+
+from memory_scene import MemoryScene
+from live_rig import LiveRigBuilder
+from multi_output_builder import BuildOutput, MultiOutputBuilder
+from scene_backend import cmds, use_backend
+from uber_cam_builder import UberCamBuilder
+
+
+def run_stage(stages, stage_name, stage_function, *args):
+    '''Run a build stage, adding its wall time and command calls to the stage totals.'''
+
+    calls_before = cmds.total_calls()
+    start_time = time.perf_counter()
+
+    stage_function(*args)
+
+    stage = stages.setdefault(stage_name, {'seconds': 0.0, 'calls': 0})
+    stage['seconds'] += time.perf_counter() - start_time
+    stage['calls'] += cmds.total_calls() - calls_before
+
+
+def bench_build(shot_count, shot_length, bake):
+    '''Build an uber cam from a synthetic sequence, returns the totals of every stage.'''
+
+    scene = MemoryScene()
+    stages = dict()
+
+    with use_backend(scene):
+        shots = build_sequence(scene, shot_count, shot_length)
+        builder = UberCamBuilder('UberCam', shots, bake)
+
+        run_stage(stages, 'prepare', builder.prepare)
+        run_stage(stages, 'create_camera', builder.create_camera)
+        run_stage(stages, 'signatures', builder.get_changed_shots)
+        for i in range(len(shots)):
+            run_stage(stages, 'shots', builder.build_shot, i)
+
+    return stages
+
+
+def bench_live(shot_count, shot_length):
+    '''Build a live uber cam from a synthetic sequence, returns the totals of the build.'''
+
+    scene = MemoryScene()
+    stages = dict()
+
+    with use_backend(scene):
+        shots = build_sequence(scene, shot_count, shot_length)
+        run_stage(stages, 'live_rig', LiveRigBuilder('UberCam', shots).build)
+
+    return stages
+
+
+def bench_outputs(shot_count, shot_length, reel_count):
+    '''Build a sequence uber cam and one per reel, separately and sharing one sampling, returns the totals of each.'''
+
+    stages = dict()
+
+    for stage_name in ('separate', 'shared'):
+        scene = MemoryScene()
+        with use_backend(scene):
+            shots = build_sequence(scene, shot_count, shot_length)
+            reel_length = -(-shot_count // reel_count)
+            outputs = [BuildOutput('UberCam', shots)]
+            outputs.extend(BuildOutput(f"Reel{i + 1}_cam", shots[i * reel_length:(i + 1) * reel_length])
+                           for i in range(reel_count))
+            if stage_name == 'shared':
+                run_stage(stages, stage_name, MultiOutputBuilder(outputs).build)
+            else:
+                for output in outputs:
+                    run_stage(stages, stage_name, UberCamBuilder(output.cam_name, output.get_shots()).build)
+
+    return stages
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shots', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--lengths', type=int, nargs='+', default=[24, 96])
+    parser.add_argument('--no-bake', action='store_true', help="Transfer keys rather than baking every frame.")
+    parser.add_argument('--live', action='store_true', help="Build live switching rigs instead.")
+    parser.add_argument('--reels', type=int, default=None,
+                        help="Build a sequence uber cam and this many reel cams, separately and from shared samples.")
+    parser.add_argument('--json', help="Write the results to this file as well.")
+    args = parser.parse_args()
+
+    results = list()
+    print(f"{'shots':>6} {'length':>6} {'stage':<14} {'seconds':>9} {'calls':>9}")
+
+    for shot_count in args.shots:
+        for shot_length in args.lengths:
+            if args.live:
+                stages = bench_live(shot_count, shot_length)
+            elif args.reels:
+                stages = bench_outputs(shot_count, shot_length, args.reels)
+            else:
+                stages = bench_build(shot_count, shot_length, not args.no_bake)
+            results.append({'shots': shot_count, 'length': shot_length, 'bake': not args.no_bake, 'live': args.live,
+                            'reels': args.reels, 'stages': stages})
+
+            for stage_name, stage in stages.items():
+                print(f"{shot_count:>6} {shot_length:>6} {stage_name:<14} {stage['seconds']:>9.4f} {stage['calls']:>9}")
+
+    if args.json:
+        with open(args.json, 'w') as results_file:
+            json.dump(results, results_file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+'''Benchmark writing an uber cam to a camera track file and reading it back, against a maya file round trip.
+
+Bakes an uber cam from a synthetic sequence in an in-memory scene, then times exporting its track, reading a range
+of frames from the track and importing the whole track as a camera, e.g.
+
+    python benchmarks/bench_cam_track.py --frames 1000 10000 100000
+
+Run with mayapy and --maya to time the same uber cam exported to, opened from and read out of .ma and .mb files.
+'''
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from synthetic_scene import build_sequence
+
+from cam_track import CameraTrack, export_track, get_channel_plugs, import_track
+from memory_scene import MemoryScene
+from scene_backend import cmds, set_backend, use_backend
+from uber_cam_builder import UberCamBuilder
+
+
+def time_call(function, *args, **kwargs):
+    '''Returns the seconds a call took.'''
+
+    start_time = time.perf_counter()
+    function(*args, **kwargs)
+
+    return time.perf_counter() - start_time
+
+
+def read_track_range(track_path, start_frame, end_frame):
+    '''Open a track and copy every channel between start and end frame out of it.'''
+
+    with CameraTrack(track_path) as track:
+        return {channel: track.read(channel, start_frame, end_frame).tolist() for channel in track.channels}
+
+
+def bench_track(frame_count, shot_count, read_frames, temp_dir):
+    '''Bake a synthetic uber cam, returns the times of its track round trip and the track path.'''
+
+    scene = MemoryScene()
+    track_path = os.path.join(temp_dir, f"UberCam_{frame_count}.camtrack")
+
+    with use_backend(scene):
+        shots = build_sequence(scene, shot_count, max(frame_count // shot_count, 1))
+        UberCamBuilder('UberCam', shots).build()
+        read_start = shots[0].in_frame + frame_count // 2
+
+        result = {'export_seconds': time_call(export_track, 'UberCam', track_path),
+                  'read_seconds': time_call(read_track_range, track_path, read_start, read_start + read_frames - 1),
+                  'import_seconds': time_call(import_track, track_path, 'ImportedCam'),
+                  'bytes': os.path.getsize(track_path)}
+
+    return result, track_path
+
+
+def bench_maya_file(track_path, read_frames, temp_dir):
+    '''Time the uber cam of a track through a maya file and through the track, returns the times of each.'''
+
+    from maya import cmds as maya_cmds
+
+    results = dict()
+
+    with CameraTrack(track_path) as track:
+        read_start = track.start_frame + track.frame_count // 2
+    read_end = read_start + read_frames - 1
+
+    for file_type, extension in (('mayaAscii', '.ma'), ('mayaBinary', '.mb')):
+        maya_cmds.file(new=True, force=True)
+        uber_cam = import_track(track_path, 'UberCam')
+        file_path = os.path.join(temp_dir, f"{os.path.basename(track_path)}{extension}")
+
+        plug_paths = [plug_path for _, plug_path in get_channel_plugs(uber_cam[0])]
+        maya_cmds.select(uber_cam[0])
+        export_seconds = time_call(maya_cmds.file, file_path, exportSelected=True, type=file_type, force=True)
+
+        # Reading a range of frames means opening the file first.
+        maya_cmds.file(new=True, force=True)
+        start_time = time.perf_counter()
+        maya_cmds.file(file_path, open=True, force=True)
+        cmds.sample_plugs(plug_paths, read_start, read_end)
+        read_seconds = time.perf_counter() - start_time
+        maya_cmds.file(new=True, force=True)
+        import_seconds = time_call(maya_cmds.file, file_path, i=True)
+
+        results[extension] = {'export_seconds': export_seconds, 'read_seconds': read_seconds,
+                              'import_seconds': import_seconds, 'bytes': os.path.getsize(file_path)}
+
+    maya_cmds.file(new=True, force=True)
+    uber_cam = import_track(track_path, 'UberCam')
+    results['.camtrack'] = {'export_seconds': time_call(export_track, uber_cam[0], track_path),
+                            'read_seconds': time_call(read_track_range, track_path, read_start, read_end),
+                            'import_seconds': time_call(import_track, track_path, 'ImportedCam'),
+                            'bytes': os.path.getsize(track_path)}
+
+    return results
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--shots', type=int, default=10, help="Shot cameras the frames are split between.")
+    parser.add_argument('--read-frames', type=int, default=100, help="Frames read from the middle of the camera.")
+    parser.add_argument('--maya', action='store_true', help="Compare against maya files, run with mayapy.")
+    parser.add_argument('--json', help="Write the results to this file as well.")
+    args = parser.parse_args()
+
+    if args.maya:
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+        from maya_backend import MayaBackend
+
+    results = list()
+    print(f"{'frames':>7} {'format':<10} {'export s':>9} {'read s':>9} {'import s':>9} {'KB':>9}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for frame_count in args.frames:
+            track_result, track_path = bench_track(frame_count, args.shots, args.read_frames, temp_dir)
+            formats = {'.camtrack': track_result}
+            if args.maya:
+                set_backend(MayaBackend())
+                formats = bench_maya_file(track_path, args.read_frames, temp_dir)
+            results.append({'frames': frame_count, 'shots': args.shots, 'read_frames': args.read_frames,
+                            'formats': formats})
+
+            for file_format, result in formats.items():
+                print(f"{frame_count:>7} {file_format:<10} {result['export_seconds']:>9.4f} "
+                      f"{result['read_seconds']:>9.4f} {result['import_seconds']:>9.4f} {result['bytes'] / 1024:>9.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as results_file:
+            json.dump(results, results_file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+'''Benchmark the memory a baked uber cam build holds on ever longer synthetic sequences in an in-memory scene.
+
+Reports the peak memory allocated during each build less what the scene keeps once it is done, the keys written
+to the uber cam, with and without a memory limit, e.g.
+
+    python benchmarks/bench_memory.py --frames 1000 10000 100000 --memory-limit 4
+'''
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from synthetic_scene import build_sequence
+
+from memory_scene import MemoryScene
+from scene_backend import use_backend
+from uber_cam_builder import UberCamBuilder
+
+
+def build(shots, memory_limit):
+    '''Build a baked uber cam, letting the builder and its samples go once it is done.'''
+
+    builder = UberCamBuilder('UberCam', shots, memory_limit=memory_limit)
+    builder.build()
+
+
+def bench_memory(frame_count, shot_count, memory_limit):
+    '''Build an uber cam from a synthetic sequence, returns the seconds and the working memory of the build.'''
+
+    scene = MemoryScene()
+
+    with use_backend(scene):
+        shots = build_sequence(scene, shot_count, max(frame_count // shot_count, 1))
+
+        gc.collect()
+        tracemalloc.start()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        start_time = time.perf_counter()
+
+        build(shots, memory_limit)
+
+        seconds = time.perf_counter() - start_time
+        gc.collect()
+        retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {'seconds': seconds, 'peak_bytes': peak_bytes - start_bytes,
+            'retained_bytes': retained_bytes - start_bytes, 'working_bytes': peak_bytes - retained_bytes}
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--shots', type=int, default=10, help="Shot cameras the frames are split between.")
+    parser.add_argument('--memory-limit', type=float, default=4, help="Memory limit of the limited builds, in MB.")
+    parser.add_argument('--json', help="Write the results to this file as well.")
+    args = parser.parse_args()
+
+    results = list()
+    print(f"{'frames':>7} {'limit MB':>8} {'seconds':>8} {'working MB':>10} {'retained MB':>11}")
+
+    for frame_count in args.frames:
+        for memory_limit in (None, int(args.memory_limit * 1024 * 1024)):
+            result = bench_memory(frame_count, args.shots, memory_limit)
+            results.append(dict(result, frames=frame_count, shots=args.shots, memory_limit=memory_limit))
+
+            limit = f"{memory_limit / 1024 ** 2:.1f}" if memory_limit else '-'
+            print(f"{frame_count:>7} {limit:>8} {result['seconds']:>8.2f} {result['working_bytes'] / 1024 ** 2:>10.2f} "
+                  f"{result['retained_bytes'] / 1024 ** 2:>11.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as results_file:
+            json.dump(results, results_file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
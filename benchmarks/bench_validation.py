@@ -0,0 +1,76 @@
+'''Benchmark recolouring the shot table after a frame edit, as the ShotTableModel does once per event loop tick.
+
+Every tick sweeps all the included entries, since a long shot can conflict with shots far from it in the list.
+Reports the time of a tick as the number of shots grows, next to the 16ms of a 60Hz frame, e.g.
+
+    python benchmarks/bench_validation.py --shots 100 1000 10000
+'''
+import argparse
+import json
+import time
+
+import synthetic_scene  # noqa: F401, puts the tool's modules on the path.
+
+from cam_entry import CameraEntry
+from camera_discovery import CameraRecord
+from shot_validator import get_entry_colours
+
+
+def create_entries(shot_count, shot_length=48, start_frame=1001):
+    '''Returns contiguous camera entries with an overlap every 50 shots and a left out shot every 100.'''
+
+    camera_entries = list()
+
+    for i in range(shot_count):
+        in_frame = start_frame + i * shot_length
+        out_frame = in_frame + shot_length - 1 + (5 if i % 50 == 49 else 0)
+        camera_entry = CameraEntry(CameraRecord(f"|shot_{(i + 1) * 10:05d}_cam", (in_frame, out_frame)))
+        camera_entry.to_include = i % 100 != 99
+        camera_entries.append(camera_entry)
+
+    return camera_entries
+
+
+def bench_validation(shot_count, ticks):
+    '''Edit the out frame of a shot and recolour every entry on each tick, returns the seconds per tick.'''
+
+    camera_entries = create_entries(shot_count)
+    colours, _ = get_entry_colours(camera_entries)
+    changed_cells = 0
+
+    start_time = time.perf_counter()
+
+    for tick in range(ticks):
+        # Holding an arrow key on the out frame of a shot in the middle of the sequence.
+        camera_entries[shot_count // 2].out_frame += 1 if tick % 20 < 10 else -1
+        new_colours, _ = get_entry_colours(camera_entries)
+        changed_cells += sum(old != new for old_row, new_row in zip(colours, new_colours)
+                             for old, new in zip(old_row, new_row))
+        colours = new_colours
+
+    return (time.perf_counter() - start_time) / ticks, changed_cells
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shots', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--ticks', type=int, default=100, help="Edits timed per number of shots.")
+    parser.add_argument('--json', help="Write the results to this file as well.")
+    args = parser.parse_args()
+
+    results = list()
+    print(f"{'shots':>6} {'ms per tick':>12} {'cells changed':>14}")
+
+    for shot_count in args.shots:
+        seconds, changed_cells = bench_validation(shot_count, args.ticks)
+        results.append({'shots': shot_count, 'seconds_per_tick': seconds, 'changed_cells': changed_cells})
+        print(f"{shot_count:>6} {seconds * 1000:>12.3f} {changed_cells:>14}")
+
+    if args.json:
+        with open(args.json, 'w') as results_file:
+            json.dump(results, results_file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import math
+import os
+import sys
+
+# The tool's modules live at the root of the repo.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uber_cam_builder import ShotRange
+
+
+# Attributes animated on every synthetic shot camera.
+ANIMATED_ATTRIBUTES = ('translateX', 'translateY', 'translateZ', 'rotateY', 'focalLength')
+
+
+def build_sequence(scene, shot_count, shot_length, start_frame=1001, key_step=8, handles=4):
+    '''Create contiguous, animated shot cameras in a MemoryScene, returns their shot ranges in cut order.'''
+
+    shots = list()
+
+    for shot_index in range(shot_count):
+        in_frame = start_frame + shot_index * shot_length
+        out_frame = in_frame + shot_length - 1
+        transform = scene.create_camera(f"shot_{(shot_index + 1) * 10:04d}")
+
+        # Keys every few frames, over a range a little wider than the cut like a real shot camera.
+        for attr_index, attr in enumerate(ANIMATED_ATTRIBUTES):
+            node = transform if attr in transform.attributes else transform.children[0]
+            plug_path = f"{node.path}.{attr}"
+            for key_time in range(in_frame - handles, out_frame + handles + 1, key_step):
+                key_value = math.sin(key_time * 0.05 + attr_index) * 10 + 35
+                scene.setKeyframe(plug_path, time=(key_time, key_time), value=key_value)
+
+        shots.append(ShotRange(transform.path, transform.name, in_frame, out_frame))
+
+    return shots
@@ -0,0 +1,94 @@
+import functools
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from scene_backend import cmds
+
+
+# Profiler the profiled helpers record into, set for the length of each profiled stage.
+_active_profiler = None
+
+
+class BuildProfiler():
+    '''Records the wall time and scene commands of every stage of a build, and the keys written per shot.
+
+    Stages nest, so the time and commands of a helper are also counted in the stage that called it.
+    '''
+
+    def __init__(self):
+
+        # Totals per stage name, and per shot camera name.
+        self.stages = dict()
+        self.shots = dict()
+        # Hits and misses per cache name.
+        self.caches = dict()
+
+
+    @contextmanager
+    def stage(self, stage_name):
+        '''Add the wall time and commands of the block to the totals of a stage.'''
+
+        global _active_profiler
+
+        previous_profiler = _active_profiler
+        _active_profiler = self
+        calls_before = Counter(cmds.call_counts)
+        start_time = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start_time
+            commands = cmds.call_counts - calls_before
+            _active_profiler = previous_profiler
+
+            stage = self.stages.setdefault(stage_name, {'count': 0, 'seconds': 0.0, 'calls': 0, 'commands': Counter()})
+            stage['count'] += 1
+            stage['seconds'] += seconds
+            stage['calls'] += sum(commands.values())
+            stage['commands'].update(commands)
+
+
+    def add_shot(self, shot_name, seconds, calls, keys):
+        '''Add the wall time, commands and keys written of a unit of a shot to the totals of the shot.'''
+
+        shot = self.shots.setdefault(shot_name, {'seconds': 0.0, 'calls': 0, 'keys': 0})
+        shot['seconds'] += seconds
+        shot['calls'] += calls
+        shot['keys'] += keys
+
+
+    def set_cache_stats(self, cache_name, hits, misses):
+        '''Record the hits and misses of a cache over the build.'''
+        self.caches[cache_name] = {'hits': hits, 'misses': misses}
+
+
+    def get_report(self):
+        '''Returns the totals of every stage, slowest first, of every shot and of every cache.'''
+
+        stages = {stage_name: dict(stage, commands=dict(stage['commands'].most_common()))
+                  for stage_name, stage in sorted(self.stages.items(), key=lambda item: -item[1]['seconds'])}
+
+        return {'stages': stages, 'shots': self.shots, 'caches': self.caches}
+
+
+    def save(self, report_path, **extra):
+        '''Write the report to a JSON file, along with any extra values to compare runs by.'''
+
+        with open(report_path, 'w') as report_file:
+            json.dump(dict(extra, **self.get_report()), report_file, indent=4)
+
+
+def profiled(function):
+    '''Record every call to the function as a stage of the build being profiled, if any.'''
+
+    @functools.wraps(function)
+    def profiled_function(*args, **kwargs):
+        if _active_profiler is None:
+            return function(*args, **kwargs)
+        with _active_profiler.stage(function.__name__):
+            return function(*args, **kwargs)
+
+    return profiled_function
@@ -0,0 +1,145 @@
+import time
+
+from PySide2.QtCore import QObject, QTimer, Signal
+from PySide2.QtWidgets import QGridLayout, QGroupBox, QLabel, QProgressBar, QPushButton, QVBoxLayout, QWidget
+
+from anim_cam_manager_utils import suspended_scene
+from scene_backend import cmds
+
+
+class BuildScheduler(QObject):
+    '''Runs an uber cam build a unit at a time in short slices from the Qt event loop, so maya stays responsive.
+
+    An undoable build is one undo chunk from start to stop, rollback included, so it is undone in one step. Edits
+    made in maya while the build runs join that chunk.
+    '''
+
+    # Units done and the total number of units.
+    progress = Signal(int, int)
+    # Whether the build completed, False when it was cancelled or failed.
+    finished = Signal(bool)
+
+    def __init__(self, builder, slice_seconds=0.05):
+
+        super(BuildScheduler, self).__init__()
+
+        self.builder = builder
+        self.slice_seconds = slice_seconds
+        self.build_units = None
+        self.error = None
+        self.undo_chunk_open = False
+
+        # A zero interval timer runs a slice every time the event loop is idle.
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(lambda: self.run_slice())
+
+
+    def start(self):
+        '''Start running the build from the event loop.'''
+
+        if self.builder.undoable:
+            cmds.undoInfo(openChunk=True, chunkName=f"build{self.builder.cam_name}")
+            self.undo_chunk_open = True
+
+        self.build_units = self.builder.iter_build()
+        self.timer.start()
+
+
+    def run_slice(self):
+        '''Run build units until the slice time is used up.'''
+
+        slice_end = time.perf_counter() + self.slice_seconds
+        units_done, total_units = None, None
+        completed = True
+
+        try:
+            # The viewport is only suspended for the slice, so artists can keep working in between.
+            with suspended_scene(None, self.builder.undoable):
+                for units_done, total_units in self.build_units:
+                    if time.perf_counter() >= slice_end:
+                        completed = False
+                        break
+        except Exception as error:
+            self.error = error
+            self.stop(False)
+            return
+
+        if completed:
+            self.stop(True)
+        else:
+            self.progress.emit(units_done, total_units)
+
+
+    def cancel(self):
+        '''Stop the build and delete the partially built uber cam.'''
+
+        if self.timer.isActive():
+            self.stop(False)
+
+
+    def stop(self, completed):
+        '''Stop running units, rolling the build back if it did not complete.'''
+
+        self.timer.stop()
+        self.build_units = None
+
+        try:
+            if not completed:
+                with suspended_scene(None, self.builder.undoable):
+                    self.builder.rollback()
+        finally:
+            if self.undo_chunk_open:
+                cmds.undoInfo(closeChunk=True)
+                self.undo_chunk_open = False
+
+        self.finished.emit(completed)
+
+
+class BuildProgress(QWidget):
+    def __init__(self, scale, scheduler):
+        '''Show the progress of a scheduled build, with the time remaining and a cancel button.'''
+
+        super(BuildProgress, self).__init__()
+
+        self.scale = scale
+        self.scheduler = scheduler
+        self.start_time = time.perf_counter()
+        self.setWindowTitle("Building Uber Camera")
+
+        self.setContentsMargins(5 * self.scale, 5 * self.scale, 5 * self.scale, 5 * self.scale)
+        self.window_main_layout = QVBoxLayout()
+
+        settings_layout = QGridLayout()
+        settings_layout.setColumnMinimumWidth(0, 300 * self.scale)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        settings_layout.addWidget(self.progress_bar, 0, 0)
+
+        self.remaining_la = QLabel("Estimating time remaining...")
+        settings_layout.addWidget(self.remaining_la, 1, 0)
+
+        self.cancel_bt = QPushButton("Cancel", self)
+        self.cancel_bt.clicked.connect(lambda: self.scheduler.cancel())
+        settings_layout.addWidget(self.cancel_bt, 2, 0)
+
+        self.scheduler.progress.connect(self.update_progress)
+        self.scheduler.finished.connect(lambda completed: self.close())
+
+        # Window setup.
+        settings_box = QGroupBox()
+        settings_box.setLayout(settings_layout)
+        self.setLayout(self.window_main_layout)
+        self.window_main_layout.addWidget(settings_box)
+
+
+    def update_progress(self, units_done, total_units):
+        '''Update the progress bar and the estimate of the time remaining.'''
+
+        self.progress_bar.setRange(0, total_units)
+        self.progress_bar.setValue(units_done)
+
+        elapsed_seconds = time.perf_counter() - self.start_time
+        remaining_seconds = elapsed_seconds / units_done * (total_units - units_done)
+        self.remaining_la.setText(f"About {remaining_seconds:.0f}s remaining.")
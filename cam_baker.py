@@ -0,0 +1,133 @@
+import hashlib
+
+from anim_cam_manager_utils import get_keyable_attributes, get_shape_path
+from build_profiler import profiled
+from key_reducer import reduce_samples, verify_reduction
+from scene_backend import cmds
+
+
+# Frames of a plug maya has to evaluate that are hashed at a time.
+HASH_WINDOW_FRAMES = 1000
+
+
+@profiled
+def get_bake_plug_pairs(source_path, target_path):
+    '''Returns (source, target) attribute path pairs for every keyable attribute on the camera transform and shape.'''
+
+    source_shape = get_shape_path(source_path)
+    target_shape = get_shape_path(target_path)
+
+    plug_pairs = list()
+
+    for source_node, target_node in ((source_path, target_path), (source_shape, target_shape)):
+        for attr in get_keyable_attributes(source_node) or list():
+            # Custom attributes on the source camera may not exist on the target.
+            if cmds.objExists(f"{target_node}.{attr}"):
+                plug_pairs.append((f"{source_node}.{attr}", f"{target_node}.{attr}"))
+
+    return plug_pairs
+
+
+@profiled
+def hash_source_curves(source_path, start_time, end_time, sampler=None):
+    '''Returns a hash of the curves and values driving the source camera between start and end time.
+
+    A CurveSampler can be passed to reuse the curves it has pulled, and keep them for sampling.
+    '''
+
+    source_hash = hashlib.sha1()
+
+    for source_node in (source_path, get_shape_path(source_path)):
+        for attr in get_keyable_attributes(source_node) or list():
+            plug_path = f"{source_node}.{attr}"
+            curve_data = sampler.get_curve(plug_path) if sampler else cmds.get_curve_data(plug_path)
+            if curve_data is not None:
+                contents = (curve_data.times, curve_data.values, curve_data.in_slopes, curve_data.out_slopes,
+                            curve_data.out_tangent_types)
+                source_hash.update(f"{attr}{contents}".encode())
+                continue
+
+            # Plugs maya has to evaluate are hashed by their samples, kept by the sampler for baking. Long shots are
+            # sampled a window at a time, so they are never held whole.
+            for window_start in range(start_time, end_time + 1, HASH_WINDOW_FRAMES):
+                window_end = min(window_start + HASH_WINDOW_FRAMES - 1, end_time)
+                samples = sampler.sample(plug_path, window_start, window_end) if sampler else \
+                    cmds.sample_plugs([plug_path], window_start, window_end)[0]
+                source_hash.update(f"{attr}{[float(sample) for sample in samples]}".encode())
+
+    return source_hash.hexdigest()
+
+
+@profiled
+def bake_camera(source_path, target_path, start_time, end_time, hold_time=None, sampler=None, bake_cache=None,
+                curve_hash=None, reduce_tolerance=None):
+    '''Bake every frame of the source camera onto the target camera, holding the last frame until hold_time.
+
+    A CurveSampler can be passed to read the source curves from its arrays rather than sampling the scene directly.
+    With a BakeCache and the hash of the source curves, samples baked before are read from disk instead.
+    With a reduce tolerance, only the keys needed to stay within it of every sample are written, on linear tangents.
+    The tolerance is in ui units, degrees for rotations and scene units for distances.
+
+    Returns the plug pairs baked, the number of keys written and the target plugs whose reduced curves do not match
+    the samples.
+    '''
+
+    plug_pairs = get_bake_plug_pairs(source_path, target_path)
+    source_plugs = [source_plug for source_plug, _ in plug_pairs]
+
+    cache_key = None
+    samples = None
+    if bake_cache and curve_hash:
+        # Attributes are keyed without the camera path, so referenced cameras share entries across scenes.
+        attributes = [source_plug.split('.')[-1] for source_plug in source_plugs]
+        cache_key = bake_cache.get_key(curve_hash, attributes, start_time, end_time, hold_time)
+        samples = bake_cache.load(cache_key)
+
+    if samples is None:
+        if sampler:
+            samples = sampler.sample_plugs(source_plugs, start_time, end_time)
+        else:
+            samples = cmds.sample_plugs(source_plugs, start_time, end_time)
+        if cache_key:
+            bake_cache.store(cache_key, samples)
+
+    # A stepped last key holds the camera, rather than a key on every held frame.
+    hold = bool(hold_time and hold_time > end_time)
+    times = list(range(start_time, end_time + 1))
+    target_plugs = [target_plug for _, target_plug in plug_pairs]
+    key_count = 0
+
+    # The tolerance is in ui units, the samples in internal units such as radians.
+    tolerances = cmds.to_internal_units(target_plugs, reduce_tolerance) if reduce_tolerance is not None else None
+
+    for i, (target_plug, values) in enumerate(zip(target_plugs, samples)):
+        if reduce_tolerance is None:
+            cmds.write_curve(target_plug, times, values, hold)
+            key_count += len(times)
+            continue
+        key_indices = reduce_samples(values, tolerances[i])
+        cmds.write_curve(target_plug, [times[i] for i in key_indices], [values[i] for i in key_indices], hold, True)
+        key_count += len(key_indices)
+
+    mismatched_plugs = list()
+    if reduce_tolerance is not None:
+        mismatched_plugs = verify_reduction(target_plugs, samples, start_time, tolerances)
+
+    return plug_pairs, key_count, mismatched_plugs
+
+
+@profiled
+def verify_hold(target_plugs, end_time, hold_time, tolerance=1e-6):
+    '''Returns the target plugs whose held frames differ from keying the end value on every frame up to hold_time.
+
+    Run once the keys after hold_time are written, or constant infinity holds the end value whatever the tangent.
+    '''
+
+    mismatched_plugs = list()
+
+    for target_plug, values in zip(target_plugs, cmds.sample_plugs(target_plugs, end_time, hold_time)):
+        # Keying every held frame evaluates to the end value on each of them.
+        if any(abs(value - values[0]) > tolerance for value in values):
+            mismatched_plugs.append(target_plug)
+
+    return mismatched_plugs
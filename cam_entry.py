@@ -1,95 +1,55 @@
-from PySide2.QtGui import QFont
-from PySide2.QtWidgets import QCheckBox, QLabel
-
-from anim_cam_manager_utils import get_camera_name, get_keyframes
-from frame_spinbox import FrameSpinbox
-
-
 class CameraEntry():
-    def __init__(self, camera_full_name):
+    '''A scene camera and the range it covers in the uber cam, edited through the ShotTableModel.'''
 
-        self.camera_full_name = camera_full_name
-        self.camera_name = get_camera_name(camera_full_name)
-        self.camera_path = self.get_camera_path()
-        self.camera_num = self.get_camera_number()
-        self.keys = list()
+    __slots__ = ('camera_full_name', 'camera_name', 'camera_path', 'camera_num', 'in_frame', 'out_frame',
+                 'to_include', 'keyed_range')
 
-        # WIDGETS
-        self.widgets = list()
+    def __init__(self, camera_record):
 
-        # Cam name label.
-        self.camera_name_la = QLabel(self.camera_name)
-        bold_font = QFont()
-        bold_font.setBold(True)
-        self.camera_name_la.setFont(bold_font)
+        self.camera_full_name = camera_record.camera_full_name
+        self.camera_name = camera_record.camera_name
+        self.camera_path = camera_record.camera_path
+        self.camera_num = camera_record.camera_num
 
-        self.in_frame_sb = FrameSpinbox(True)
-        self.out_frame_sb = FrameSpinbox(False)
-        self.to_include_cb = QCheckBox()
-        self.to_include_cb.setChecked(True)
-        self.to_include_cb.stateChanged.connect(lambda: self.set_widgets_state())
+        self.to_include = True
+        self.keyed_range = camera_record.keyed_range
 
         self.set_def_frame_range()
-        self.set_default_widgets()
-
-
-    def set_widgets_state(self):
-        '''Update the widget states when changing the checkbox.'''
-
-        widget_state = self.to_include_cb.isChecked()
-
-        self.in_frame_sb.setEnabled(widget_state)
-        self.out_frame_sb.setEnabled(widget_state)
 
-        if not widget_state:
-            self.in_frame_sb.setStyleSheet(self.in_frame_sb.grey)
-            self.out_frame_sb.setStyleSheet(self.out_frame_sb.grey)
 
+    def set_def_frame_range(self):
+        '''Set the default cam frame range from the range of its keys.'''
 
-    def get_camera_number(self):
-        '''Get the camera number.'''
-
-        num_list = list()
-
-        for char in self.camera_name:
-            if char.isdigit():
-                num_list.append(char)
-
-        camera_number = int(''.join(num_list))
-
-        return camera_number
+        self.in_frame, self.out_frame = self.get_def_frame_range()
 
 
-    def get_camera_path(self):
-        '''Get the path of the camera, not including shape.'''
+    def get_def_frame_range(self):
+        '''Returns the default cam frame range, the range of its keys.'''
 
-        cam_path_split = self.camera_full_name.split('|')
-        cam_path = ''
+        if self.keyed_range:
+            return int(self.keyed_range[0]), int(self.keyed_range[1])
 
-        for i, cam_path_piece in enumerate(cam_path_split):
-            if i != len(cam_path_split)-1:
-                cam_path += cam_path_piece
+        return 1001, 1001
 
-        return cam_path
 
+    def update_keyed_range(self, keyed_range):
+        '''Update the range of the camera's keys, and its frame range if not edited, returns whether it changed.'''
 
-    def set_def_frame_range(self):
-        '''Set the default cam frame range.'''
+        if keyed_range == self.keyed_range:
+            return False
 
-        cam_keyframes = get_keyframes(self.camera_path)
+        edited = (self.in_frame, self.out_frame) != self.get_def_frame_range()
+        self.keyed_range = keyed_range
+        if not edited:
+            self.set_def_frame_range()
 
-        if cam_keyframes:
-            self.in_frame_sb.setValue(min(cam_keyframes))
-            self.out_frame_sb.setValue(max(cam_keyframes))
+        return True
 
 
-    def set_default_widgets(self):
-        '''Append widgets to widgets param.'''
+    def get_shot_range(self):
+        '''Returns the shot range of the entry.'''
 
-        # Reset widgets.
-        self.widgets = list()
+        # Imported here as the builder is only loaded once a build is started.
+        from uber_cam_builder import ShotRange
 
-        self.widgets.append(self.camera_name_la)
-        self.widgets.append(self.in_frame_sb)
-        self.widgets.append(self.out_frame_sb)
-        self.widgets.append(self.to_include_cb)
+        return ShotRange(self.camera_path, self.camera_name, self.in_frame, self.out_frame)
@@ -0,0 +1,176 @@
+'''Camera track files: the per-frame transform and lens channels of a camera, read without opening a scene.
+
+A track starts with a header giving the camera name, first frame and frame count, followed by an index of the
+channels and the byte offset of their samples. Every channel is a contiguous block of little-endian doubles, one
+per frame in internal units, so any frame range of a channel can be read straight from a memory map.
+'''
+import mmap
+import struct
+import sys
+from array import array
+
+from anim_cam_manager_utils import get_shape_path
+from scene_backend import cmds
+
+
+TRACK_MAGIC = b'UBERTRK\0'
+TRACK_VERSION = 1
+# Magic, version, channel count, camera name, first frame and frame count.
+HEADER = struct.Struct('<8sHH64siI')
+# Channel name and the byte offset of its samples.
+CHANNEL_ENTRY = struct.Struct('<48sQ')
+SAMPLE_BYTES = 8
+# Channel blocks start on a boundary this many bytes apart.
+ALIGNMENT = 64
+
+# Channels exported from the camera transform and shape, when the camera has them.
+TRANSFORM_CHANNELS = ('translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ')
+LENS_CHANNELS = ('focalLength', 'horizontalFilmAperture', 'verticalFilmAperture', 'horizontalFilmOffset',
+                 'verticalFilmOffset', 'lensSqueezeRatio', 'fStop', 'focusDistance', 'shutterAngle')
+
+
+def get_channel_plugs(transform_path):
+    '''Returns (channel, plug path) pairs for the track channels the camera has.'''
+
+    shape_path = get_shape_path(transform_path)
+    channel_plugs = list()
+
+    for node, channels in ((transform_path, TRANSFORM_CHANNELS), (shape_path, LENS_CHANNELS)):
+        for channel in channels:
+            if cmds.objExists(f"{node}.{channel}"):
+                channel_plugs.append((channel, f"{node}.{channel}"))
+
+    return channel_plugs
+
+
+def align(offset):
+    '''Returns the offset rounded up to the next channel block boundary.'''
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def export_track(transform_path, track_path, start_frame=None, end_frame=None, window_frames=1000):
+    '''Write the channels of a camera on every frame between start and end frame to a track file.
+
+    The keyed range of the camera is exported unless a range is given. Frames are sampled and written a window at a
+    time, so long sequences are never held whole. Returns the number of channels written.
+    '''
+
+    if start_frame is None or end_frame is None:
+        keyed_range = cmds.get_keyed_ranges([transform_path])[0]
+        if keyed_range is None:
+            raise ValueError(f"{transform_path} has no keys to export, give a frame range.")
+        start_frame = int(keyed_range[0]) if start_frame is None else start_frame
+        end_frame = int(keyed_range[1]) if end_frame is None else end_frame
+
+    channel_plugs = get_channel_plugs(transform_path)
+    frame_count = end_frame - start_frame + 1
+    camera_name = transform_path.split('|')[-1]
+
+    data_offset = align(HEADER.size + CHANNEL_ENTRY.size * len(channel_plugs))
+    block_bytes = align(frame_count * SAMPLE_BYTES)
+    offsets = [data_offset + i * block_bytes for i in range(len(channel_plugs))]
+
+    with open(track_path, 'wb') as track_file:
+        track_file.write(HEADER.pack(TRACK_MAGIC, TRACK_VERSION, len(channel_plugs), camera_name.encode(),
+                                     start_frame, frame_count))
+        for (channel, _), offset in zip(channel_plugs, offsets):
+            track_file.write(CHANNEL_ENTRY.pack(channel.encode(), offset))
+        track_file.truncate(data_offset + block_bytes * len(channel_plugs))
+
+        plug_paths = [plug_path for _, plug_path in channel_plugs]
+        for window_start in range(start_frame, end_frame + 1, window_frames):
+            window_end = min(window_start + window_frames - 1, end_frame)
+            for offset, samples in zip(offsets, cmds.sample_plugs(plug_paths, window_start, window_end)):
+                values = array('d', samples)
+                if sys.byteorder == 'big':
+                    values.byteswap()
+                track_file.seek(offset + (window_start - start_frame) * SAMPLE_BYTES)
+                track_file.write(values.tobytes())
+
+    return len(channel_plugs)
+
+
+class CameraTrack():
+    '''A track file mapped into memory, reading only the channels and frames asked for.
+
+    Samples are returned as views into the file, copy them to keep them once the track is closed. Big-endian hosts
+    get a swapped copy instead, as the file is little-endian.
+    '''
+
+    def __init__(self, track_path):
+
+        self.track_file = open(track_path, 'rb')
+        self.mapped_file = mmap.mmap(self.track_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, channel_count, camera_name, start_frame, frame_count = HEADER.unpack_from(self.mapped_file)
+        if magic != TRACK_MAGIC:
+            self.close()
+            raise ValueError(f"{track_path} is not a camera track.")
+        if version > TRACK_VERSION:
+            self.close()
+            raise ValueError(f"{track_path} is a newer version {version} camera track.")
+
+        self.camera_name = camera_name.rstrip(b'\0').decode()
+        self.start_frame = start_frame
+        self.end_frame = start_frame + frame_count - 1
+        self.frame_count = frame_count
+
+        # Byte offset of the samples per channel name, in the order they were exported.
+        self.offsets = dict()
+        for i in range(channel_count):
+            channel, offset = CHANNEL_ENTRY.unpack_from(self.mapped_file, HEADER.size + i * CHANNEL_ENTRY.size)
+            self.offsets[channel.rstrip(b'\0').decode()] = offset
+        self.channels = list(self.offsets)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def read(self, channel, start_frame=None, end_frame=None):
+        '''Returns the samples of a channel on every frame between start and end frame, the whole track if none.'''
+
+        start_frame = self.start_frame if start_frame is None else max(start_frame, self.start_frame)
+        end_frame = self.end_frame if end_frame is None else min(end_frame, self.end_frame)
+        start_offset = self.offsets[channel] + (start_frame - self.start_frame) * SAMPLE_BYTES
+        frame_count = max(end_frame - start_frame + 1, 0)
+
+        samples = memoryview(self.mapped_file)[start_offset:start_offset + frame_count * SAMPLE_BYTES].cast('d')
+        if sys.byteorder == 'big':
+            samples = array('d', samples)
+            samples.byteswap()
+
+        return samples
+
+
+    def close(self):
+        '''Unmap and close the file.'''
+
+        self.mapped_file.close()
+        self.track_file.close()
+
+
+def import_track(track_path, cam_name=None, start_frame=None, end_frame=None):
+    '''Create a camera keyed on every frame of a track between start and end frame, the whole track if none.
+
+    Every channel is written in one bulk operation. Returns the transform and shape of the camera.
+    '''
+
+    with CameraTrack(track_path) as track:
+        start_frame = track.start_frame if start_frame is None else max(start_frame, track.start_frame)
+        end_frame = track.end_frame if end_frame is None else min(end_frame, track.end_frame)
+        camera = cmds.camera(name=cam_name or track.camera_name)
+        shape_path = get_shape_path(camera[0])
+        times = list(range(start_frame, end_frame + 1))
+
+        for channel in track.channels:
+            node = camera[0] if channel in TRANSFORM_CHANNELS else shape_path
+            if times and cmds.objExists(f"{node}.{channel}"):
+                # Copied out of the map, which cannot be closed while views into it are held.
+                cmds.write_curve(f"{node}.{channel}", times, track.read(channel, start_frame, end_frame).tolist())
+
+    return camera
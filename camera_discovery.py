@@ -0,0 +1,43 @@
+from anim_cam_manager_utils import DEFAULT_CAMERAS, get_camera_name
+from scene_backend import cmds
+
+
+class CameraRecord():
+    '''A camera found in the scene, with its transform and the range of its keys.'''
+
+    __slots__ = ('camera_full_name', 'camera_path', 'camera_name', 'camera_num', 'keyed_range')
+
+    def __init__(self, camera_full_name, keyed_range):
+
+        self.camera_full_name = camera_full_name
+        self.camera_path = camera_full_name.rpartition('|')[0]
+        self.camera_name = get_camera_name(camera_full_name)
+        self.camera_num = get_camera_number(self.camera_name)
+        # First and last key time on the camera, None if it has no keys.
+        self.keyed_range = keyed_range
+
+
+def get_camera_number(camera_name):
+    '''Get the number from the digits in a camera name, None if it has no digits.'''
+
+    digits = ''.join(char for char in camera_name if char.isdigit())
+
+    return int(digits) if digits else None
+
+
+def discover_cameras(cameras_to_avoid=DEFAULT_CAMERAS):
+    '''Returns a record of every camera in the scene except the cameras to avoid.
+
+    The whole scene is read in two queries, one listing the cameras and one for the key range of all of them.
+    '''
+
+    camera_full_names = [camera_full_name for camera_full_name in cmds.ls(type=('camera'), l=True)
+                         if get_camera_name(camera_full_name) not in cameras_to_avoid]
+    if not camera_full_names:
+        return list()
+
+    keyed_ranges = cmds.get_keyed_ranges([camera_full_name.rpartition('|')[0]
+                                          for camera_full_name in camera_full_names])
+
+    return [CameraRecord(camera_full_name, keyed_range)
+            for camera_full_name, keyed_range in zip(camera_full_names, keyed_ranges)]
@@ -0,0 +1,179 @@
+import math
+from collections import OrderedDict
+
+from build_profiler import profiled
+from scene_backend import cmds, CurveData, TANGENT_STEP, TANGENT_STEP_NEXT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Estimated size of a python float in a list, and of a key of pulled curve data with its tangents.
+PYTHON_FLOAT_BYTES = 32
+CURVE_KEY_BYTES = 5 * PYTHON_FLOAT_BYTES
+
+
+def evaluate_curve(curve_data, start_time, end_time):
+    '''Evaluate a curve on every frame between start and end time as one vectorized operation.'''
+
+    frames = np.arange(start_time, end_time + 1, dtype=np.float64)
+    times = np.asarray(curve_data.times, dtype=np.float64)
+    values = np.asarray(curve_data.values, dtype=np.float64)
+
+    if len(times) == 1:
+        return np.full(len(frames), values[0])
+
+    # Index of the key starting the segment each frame falls in.
+    index = np.clip(np.searchsorted(times, frames, side='right') - 1, 0, len(times) - 2)
+    start_values, end_values = values[index], values[index + 1]
+    segment_frames = times[index + 1] - times[index]
+    s = (frames - times[index]) / segment_frames
+
+    # Tangent slopes are per frame, scale them to the length of the segment.
+    start_tangents = np.asarray(curve_data.out_slopes, dtype=np.float64)[index] * segment_frames
+    end_tangents = np.asarray(curve_data.in_slopes, dtype=np.float64)[index + 1] * segment_frames
+
+    s2 = s * s
+    s3 = s2 * s
+    samples = (2 * s3 - 3 * s2 + 1) * start_values + (s3 - 2 * s2 + s) * start_tangents + \
+              (-2 * s3 + 3 * s2) * end_values + (s3 - s2) * end_tangents
+
+    # Stepped segments hold a key's value until the next one.
+    out_tangent_types = np.asarray(curve_data.out_tangent_types)[index]
+    samples = np.where(out_tangent_types == TANGENT_STEP, start_values, samples)
+    samples = np.where((out_tangent_types == TANGENT_STEP_NEXT) & (s > 0), end_values, samples)
+
+    # Constant infinity either side of the curve.
+    samples[frames <= times[0]] = values[0]
+    samples[frames >= times[-1]] = values[-1]
+
+    return samples
+
+
+class CurveSampler():
+    '''Samples source camera plugs into contiguous per-attribute arrays, kept for the length of a build.
+
+    With max_bytes, the least recently used arrays, then curves, are forgotten to keep what is held under that size,
+    so a build streaming windows of frames through it holds the same memory whatever the length of the sequence.
+    '''
+
+    def __init__(self, max_bytes=None):
+
+        self.max_bytes = max_bytes
+        # Curve data per plug path, None for plugs maya has to evaluate.
+        self.curves = OrderedDict()
+        # Sample arrays per (plug path, start time, end time), and the ranges sampled per plug path.
+        self.arrays = OrderedDict()
+        self.sampled_ranges = dict()
+        # Estimated size of the curves and arrays held.
+        self.held_bytes = 0
+
+
+    def get_curve(self, plug_path):
+        '''Returns the curve data of a plug, pulled from maya on first use.'''
+
+        if plug_path in self.curves:
+            self.curves.move_to_end(plug_path)
+            return self.curves[plug_path]
+
+        curve_data = cmds.get_curve_data(plug_path)
+        self.curves[plug_path] = curve_data
+        self.held_bytes += get_held_bytes(curve_data)
+        self.release_memory()
+
+        return curve_data
+
+
+    def sample(self, plug_path, start_time, end_time):
+        '''Returns the samples of a plug on every frame between start and end time.'''
+
+        key = (plug_path, start_time, end_time)
+
+        if key in self.arrays:
+            self.arrays.move_to_end(key)
+            return self.arrays[key]
+
+        # Ranges inside one already sampled, as when several outputs share a shot, are sliced from its array.
+        for sampled_start, sampled_end in self.sampled_ranges.get(plug_path, ()):
+            if sampled_start <= start_time and end_time <= sampled_end:
+                sampled_key = (plug_path, sampled_start, sampled_end)
+                self.arrays.move_to_end(sampled_key)
+                return self.arrays[sampled_key][start_time - sampled_start:end_time - sampled_start + 1]
+
+        curve_data = self.get_curve(plug_path) if np is not None else None
+
+        if curve_data is not None:
+            array = evaluate_curve(curve_data, start_time, end_time)
+        else:
+            samples = cmds.sample_plugs([plug_path], start_time, end_time)[0]
+            array = np.asarray(samples, dtype=np.float64) if np is not None else samples
+
+        self.arrays[key] = array
+        self.sampled_ranges.setdefault(plug_path, list()).append((start_time, end_time))
+        self.held_bytes += get_held_bytes(array)
+        self.release_memory()
+
+        return array
+
+
+    def sample_plugs(self, plug_paths, start_time, end_time):
+        '''Returns the samples of every plug on every frame between start and end time.'''
+        return [self.sample(plug_path, start_time, end_time) for plug_path in plug_paths]
+
+
+    def release_memory(self):
+        '''Forget the least recently used arrays, then curves, until what is held fits in max_bytes.'''
+
+        if self.max_bytes is None:
+            return
+
+        # Arrays can be sampled again from the curves without asking maya.
+        while self.held_bytes > self.max_bytes and self.arrays:
+            (plug_path, start_time, end_time), array = self.arrays.popitem(last=False)
+            self.sampled_ranges[plug_path].remove((start_time, end_time))
+            self.held_bytes -= get_held_bytes(array)
+
+        while self.held_bytes > self.max_bytes and self.curves:
+            _, curve_data = self.curves.popitem(last=False)
+            self.held_bytes -= get_held_bytes(curve_data)
+
+
+    def clear(self):
+        '''Forget every curve and array.'''
+
+        self.curves = OrderedDict()
+        self.arrays = OrderedDict()
+        self.sampled_ranges = dict()
+        self.held_bytes = 0
+
+
+def get_held_bytes(samples_or_curve):
+    '''Returns the estimated size of a sample array or of the curve data of a plug.'''
+
+    if samples_or_curve is None:
+        return 0
+    if isinstance(samples_or_curve, CurveData):
+        return len(samples_or_curve.times) * CURVE_KEY_BYTES
+    if np is not None and isinstance(samples_or_curve, np.ndarray):
+        return samples_or_curve.nbytes
+
+    return len(samples_or_curve) * PYTHON_FLOAT_BYTES
+
+
+@profiled
+def verify_against_maya(sampler, plug_paths, start_time, end_time, tolerance=1e-4):
+    '''Compare the sampler against a getAttr on every frame, returns the largest error of each mismatching plug.'''
+
+    mismatches = dict()
+
+    for plug_path, queried_samples in zip(plug_paths, cmds.query_samples(plug_paths, start_time, end_time)):
+        samples = sampler.sample(plug_path, start_time, end_time)
+        errors = [abs(queried_sample - sample) for queried_sample, sample in zip(queried_samples, samples)]
+
+        largest_error = max(errors) if errors else 0.0
+        if largest_error > tolerance or math.isnan(largest_error):
+            mismatches[plug_path] = largest_error
+
+    return mismatches
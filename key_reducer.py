@@ -0,0 +1,80 @@
+from build_profiler import profiled
+from scene_backend import cmds
+
+
+def reduce_samples(values, tolerance):
+    '''Returns the indices of the samples to key so linear segments between them stay within tolerance of every sample.
+
+    Each segment is grown from its first key while a line from it can still pass within tolerance of every sample
+    it spans, narrowing the range of slopes that can, then ends on the last sample such a line reaches.
+    '''
+
+    # Plain floats are much faster to step through one at a time than array elements.
+    values = [float(value) for value in values]
+    last_index = len(values) - 1
+    key_indices = [0] if values else list()
+    anchor = 0
+
+    while anchor < last_index:
+        min_slope, max_slope = float('-inf'), float('inf')
+        end = anchor + 1
+
+        for i in range(anchor + 1, last_index + 1):
+            frames = i - anchor
+            slope = (values[i] - values[anchor]) / frames
+            if min_slope <= slope <= max_slope:
+                end = i
+            min_slope = max(min_slope, (values[i] - values[anchor] - tolerance) / frames)
+            max_slope = min(max_slope, (values[i] - values[anchor] + tolerance) / frames)
+            if min_slope > max_slope:
+                break
+
+        key_indices.append(end)
+        anchor = end
+
+    return key_indices
+
+
+@profiled
+def verify_reduction(target_plugs, samples, start_time, tolerances):
+    '''Returns the target plugs whose reduced curves differ from the baked samples by more than their tolerance.
+
+    Tolerances are given per target plug, in its internal units like the samples.
+    '''
+
+    end_time = start_time + len(samples[0]) - 1 if samples else start_time
+    mismatched_plugs = list()
+
+    for target_plug, values, tolerance, reduced_values in zip(target_plugs, samples, tolerances,
+                                                              cmds.sample_plugs(target_plugs, start_time, end_time)):
+        # Allow for the rounding of the curve evaluation on top of the tolerance.
+        if any(abs(value - reduced_value) > tolerance * 1.001 + 1e-9
+               for value, reduced_value in zip(values, reduced_values)):
+            mismatched_plugs.append(target_plug)
+
+    return mismatched_plugs
+
+
+@profiled
+def drop_static_curves(target_plugs, tolerance):
+    '''Replace the curves whose keys all lie within tolerance of each other with their value.
+
+    The tolerance is in ui units, degrees for rotations and scene units for distances. Returns the number of keys
+    removed.
+    '''
+
+    removed_keys = 0
+
+    # Curve values are in internal units, radians and centimetres.
+    for target_plug, internal_tolerance in zip(target_plugs, cmds.to_internal_units(target_plugs, tolerance)):
+        curve_data = cmds.get_curve_data(target_plug)
+        if curve_data is None or max(curve_data.values) - min(curve_data.values) > internal_tolerance:
+            continue
+
+        # The value is read in ui units before the curve driving it is removed.
+        value = cmds.getAttr(target_plug)
+        cmds.cutKey(target_plug, clear=True)
+        cmds.setAttr(target_plug, value)
+        removed_keys += len(curve_data.times)
+
+    return removed_keys
@@ -0,0 +1,185 @@
+import json
+
+from anim_cam_manager_utils import query_cache, suspended_scene
+from cam_baker import get_bake_plug_pairs
+from scene_backend import cmds
+from uber_cam_builder import ShotRange, UberCamBuilder
+
+
+# Largest difference between a shot camera and the live uber cam on its in frame, in internal units.
+VERIFY_TOLERANCE = 1e-6
+
+
+# String attribute on a live uber cam recording its shots and switch nodes.
+RIG_ATTR = 'uberCamRig'
+RIG_VERSION = 1
+# Attribute on a live uber cam keyed with the index of the shot on every frame.
+SELECTOR_ATTR = 'uberCamShot'
+
+
+class LiveRigBuilder():
+    '''Builds an uber cam driven by the shot cameras through a switch keyed at every cut, with no frames baked.
+
+    Every attribute of the uber cam is the output of a choice node with an input from each shot camera, and the
+    selectors of the choice nodes follow one stepped curve keyed with the index of the shot at each in frame.
+    Between shots the uber cam follows the previous shot camera, where a bake holds its out frame.
+
+    Choice inputs and outputs are generic, so angle and distance plugs go through a unit conversion each way. The
+    connections are checked once built, comparing every attribute of the uber cam with the shot camera in internal
+    units on the in frame of each shot.
+    '''
+
+    def __init__(self, cam_name, shots, undoable=True):
+
+        self.cam_name = cam_name
+        self.shots = shots
+        self.undoable = undoable
+
+        self.warnings = []
+        self.uber_cam = None
+        self.choice_nodes = list()
+        # Source and target plugs connected for each shot.
+        self.plug_pairs = list()
+
+
+    def build(self):
+        '''Create the uber cam and connect the shot cameras to it, returns the uber cam.'''
+
+        with suspended_scene(f"buildLive{self.cam_name}", self.undoable):
+            query_cache.clear()
+            self.uber_cam = cmds.camera(name=self.cam_name)
+            self.key_selector()
+            self.connect_shots()
+            self.write_rig()
+            self.verify_connections()
+
+        return self.uber_cam
+
+
+    def key_selector(self):
+        '''Key the shot index at the in frame of every shot, stepped so it holds until the next cut.'''
+
+        cmds.addAttr(self.uber_cam[0], longName=SELECTOR_ATTR, attributeType='long')
+        selector_plug = f"{self.uber_cam[0]}.{SELECTOR_ATTR}"
+
+        for i, scene_camera in enumerate(self.shots):
+            cmds.setKeyframe(selector_plug, time=(scene_camera.in_frame, scene_camera.in_frame), value=i)
+        cmds.keyTangent(selector_plug, outTangentType='step')
+
+
+    def connect_shots(self):
+        '''Drive every attribute of the uber cam from the same attribute of the shot camera picked by the selector.'''
+
+        # Choice node per uber cam attribute, created the first time a shot camera has that attribute.
+        choice_nodes = dict()
+        selector_plug = f"{self.uber_cam[0]}.{SELECTOR_ATTR}"
+
+        self.plug_pairs = list()
+
+        for i, scene_camera in enumerate(self.shots):
+            plug_pairs = get_bake_plug_pairs(scene_camera.camera_path, self.uber_cam[0])
+            self.plug_pairs.append(plug_pairs)
+            for source_plug, target_plug in plug_pairs:
+                if target_plug not in choice_nodes:
+                    choice_node = cmds.createNode('choice', name=f"{self.cam_name}_{target_plug.split('.')[-1]}_choice")
+                    cmds.connectAttr(selector_plug, f"{choice_node}.selector")
+                    cmds.connectAttr(f"{choice_node}.output", target_plug, force=True)
+                    choice_nodes[target_plug] = choice_node
+                cmds.connectAttr(source_plug, f"{choice_nodes[target_plug]}.input[{i}]")
+
+        self.choice_nodes = list(choice_nodes.values())
+
+
+    def write_rig(self):
+        '''Record the shots and switch nodes on the uber cam, so it can be finalized later.'''
+
+        cmds.addAttr(self.uber_cam[0], longName=RIG_ATTR, dataType='string')
+
+        rig = {'version': RIG_VERSION,
+               'shots': [{'camera_path': scene_camera.camera_path, 'camera_name': scene_camera.camera_name,
+                          'in_frame': scene_camera.in_frame, 'out_frame': scene_camera.out_frame}
+                         for scene_camera in self.shots],
+               'choice_nodes': self.choice_nodes}
+        cmds.setAttr(f"{self.uber_cam[0]}.{RIG_ATTR}", json.dumps(rig), type='string')
+
+
+    def verify_connections(self):
+        '''Warn of uber cam attributes that differ from the shot camera on its in frame, such as after a unit mixup.'''
+
+        for scene_camera, plug_pairs in zip(self.shots, self.plug_pairs):
+            if not plug_pairs:
+                continue
+            source_plugs, target_plugs = zip(*plug_pairs)
+            frame = scene_camera.in_frame
+            source_values = cmds.sample_plugs(list(source_plugs), frame, frame)
+            target_values = cmds.sample_plugs(list(target_plugs), frame, frame)
+
+            mismatched = [target_plug.split('.')[-1]
+                          for target_plug, source, target in zip(target_plugs, source_values, target_values)
+                          if abs(source[0] - target[0]) > VERIFY_TOLERANCE]
+            if mismatched:
+                self.warnings.append(f"Live uber cam differs from {scene_camera.camera_name} on frame {frame} "
+                                     f"on {', '.join(mismatched)}.")
+
+
+def read_rig(transform_path):
+    '''Returns the rig recorded on a live uber cam, None if it is not one.'''
+
+    if not cmds.objExists(f"{transform_path}.{RIG_ATTR}"):
+        return None
+
+    rig = json.loads(cmds.getAttr(f"{transform_path}.{RIG_ATTR}") or 'null')
+    if not rig or rig['version'] != RIG_VERSION:
+        return None
+
+    return rig
+
+
+def get_rig_shots(rig):
+    '''Returns the shot ranges a live uber cam was built from.'''
+    return [ShotRange(shot['camera_path'], shot['camera_name'], shot['in_frame'], shot['out_frame'])
+            for shot in rig['shots']]
+
+
+def remove_rig(transform_path, rig):
+    '''Delete a live uber cam and its switch nodes, before the cameras are baked in its place.'''
+
+    choice_nodes = [choice_node for choice_node in rig['choice_nodes'] if cmds.objExists(choice_node)]
+    if choice_nodes:
+        cmds.delete(choice_nodes)
+    cmds.delete(transform_path)
+    query_cache.shape_paths.pop(transform_path, None)
+
+
+def finalize_rig(transform_path, undoable=True, **builder_kwargs):
+    '''Replace a live uber cam with one baked from the same shots, returns the builder that baked it.
+
+    Keyword arguments are passed on to the UberCamBuilder. If the bake fails it is rolled back and the live uber cam
+    is built again before the error is raised.
+    '''
+
+    rig = read_rig(transform_path)
+    if rig is None:
+        raise ValueError(f"{transform_path} is not a live uber cam.")
+
+    cam_name = transform_path.split('|')[-1]
+    shots = get_rig_shots(rig)
+    builder = UberCamBuilder(cam_name, shots, bake=True, undoable=undoable, **builder_kwargs)
+
+    build_error = None
+
+    with suspended_scene(f"finalize{cam_name}", undoable):
+        remove_rig(transform_path, rig)
+        try:
+            for _ in builder.iter_build():
+                pass
+        except Exception as error:
+            builder.rollback()
+            build_error = error
+
+    # Rebuilt once the scene is no longer suspended, as a nested suspension would resume the refresh on exiting.
+    if build_error is not None:
+        LiveRigBuilder(cam_name, shots, undoable).build()
+        raise build_error
+
+    return builder
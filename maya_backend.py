@@ -0,0 +1,252 @@
+import os
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import maya.cmds
+
+from scene_backend import CurveData, TANGENT_STEP, TANGENT_STEP_NEXT
+
+
+# Plugin whose command puts the curve edits made through the api on the undo queue.
+UNDO_PLUGIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uber_cam_undo.py')
+
+# Curve edits made since the undo plugin command last took them.
+_curve_edits = list()
+
+
+def take_curve_edits():
+    '''Returns the curve edits waiting to be put on the undo queue, and forgets them.'''
+
+    global _curve_edits
+
+    curve_edits, _curve_edits = _curve_edits, list()
+
+    return curve_edits
+
+
+def get_plug(plug_path):
+    '''Returns the MPlug of an attribute path.'''
+
+    selection = om.MSelectionList()
+    selection.add(plug_path)
+
+    return selection.getPlug(0)
+
+
+def get_anim_curve(plug):
+    '''Returns the anim curve function set driving the plug, None if the plug is not driven by a time curve.'''
+
+    for source_plug in plug.connectedTo(True, False):
+        if source_plug.node().hasFn(om.MFn.kAnimCurve):
+            anim_curve = oma.MFnAnimCurve(source_plug.node())
+            # Driven key curves are evaluated from another plug, not from time.
+            if not anim_curve.isUnitlessInput:
+                return anim_curve
+
+    return None
+
+
+def to_internal_unit(plug, value):
+    '''Convert a value queried with getAttr from ui units to the internal units used by the api.'''
+
+    attribute = plug.attribute()
+    if not attribute.hasFn(om.MFn.kUnitAttribute):
+        return value
+
+    unit_type = om.MFnUnitAttribute(attribute).unitType()
+    if unit_type == om.MFnUnitAttribute.kAngle:
+        return om.MAngle(value, om.MAngle.uiUnit()).asRadians()
+    if unit_type == om.MFnUnitAttribute.kDistance:
+        return om.MDistance(value, om.MDistance.uiUnit()).asCentimeters()
+
+    return value
+
+
+class MayaBackend():
+    '''Scene backend running commands in the current maya session.
+
+    Any maya.cmds command is forwarded as is, bulk operations on curves go through the api.
+    '''
+
+    def __getattr__(self, name):
+        return getattr(maya.cmds, name)
+
+
+    def sample_plugs(self, plug_paths, start_time, end_time):
+        '''Sample the plugs on every frame between start and end time in a single pass, returns one value list per plug.
+
+        Curve driven plugs are evaluated directly on their curve, static plugs are read once and only plugs
+        driven by anything else fall back to a getAttr per frame. All values are returned in internal units.
+        '''
+
+        frames = range(start_time, end_time + 1)
+        time_unit = om.MTime.uiUnit()
+        samples = list()
+
+        for plug_path in plug_paths:
+            plug = get_plug(plug_path)
+            anim_curve = get_anim_curve(plug)
+
+            if anim_curve is not None:
+                samples.append([anim_curve.evaluate(om.MTime(frame, time_unit)) for frame in frames])
+            elif not plug.isDestination:
+                samples.append([plug.asDouble()] * len(frames))
+            else:
+                samples.append([to_internal_unit(plug, maya.cmds.getAttr(plug_path, time=frame)) for frame in frames])
+
+        return samples
+
+
+    def get_keyed_ranges(self, node_paths):
+        '''Returns the first and last key time on each node and its shapes, None for nodes with no keys.
+
+        Key times are read from the curves through the api, rather than querying every key with cmds.keyframe.
+        '''
+
+        time_unit = om.MTime.uiUnit()
+        keyed_ranges = list()
+
+        for node_path in node_paths:
+            selection = om.MSelectionList()
+            selection.add(node_path)
+            dag_path = selection.getDagPath(0)
+            nodes = [dag_path.node()] + [dag_path.child(i) for i in range(dag_path.childCount())
+                                         if dag_path.child(i).hasFn(om.MFn.kShape)]
+            key_times = list()
+
+            for node in nodes:
+                for plug in om.MFnDependencyNode(node).getConnections():
+                    anim_curve = get_anim_curve(plug)
+                    if anim_curve is not None and anim_curve.numKeys:
+                        key_times.append(anim_curve.input(0).asUnits(time_unit))
+                        key_times.append(anim_curve.input(anim_curve.numKeys - 1).asUnits(time_unit))
+
+            keyed_ranges.append((min(key_times), max(key_times)) if key_times else None)
+
+        return keyed_ranges
+
+
+    def to_internal_units(self, plug_paths, value):
+        '''Returns a value given in the ui units of each plug, such as degrees or scene units, in its internal units.'''
+        return [to_internal_unit(get_plug(plug_path), value) for plug_path in plug_paths]
+
+
+    def query_samples(self, plug_paths, start_time, end_time):
+        '''Sample the plugs with a getAttr on every frame, the reference faster sampling is checked against.'''
+
+        samples = list()
+
+        for plug_path in plug_paths:
+            plug = get_plug(plug_path)
+            samples.append([to_internal_unit(plug, maya.cmds.getAttr(plug_path, time=frame))
+                            for frame in range(start_time, end_time + 1)])
+
+        return samples
+
+
+    def write_curve(self, plug_path, times, values, hold=False, linear=False):
+        '''Write all keys of a curve in one bulk operation, merging them with any existing keys on the plug.
+
+        With hold, the out tangent of the last key is stepped so its value is held until the next key on the curve.
+        With linear, keys are interpolated linearly rather than with the default tangents. While the undo queue is
+        on, the edits are put on it through the uber_cam_undo plugin, so they undo with the rest of the build.
+        '''
+
+        plug = get_plug(plug_path)
+        anim_curve = get_anim_curve(plug)
+
+        # The api bypasses the undo queue, so while it is on the edits are recorded and handed to the undo plugin.
+        undoable = maya.cmds.undoInfo(query=True, state=True)
+        curve_change = oma.MAnimCurveChange() if undoable else None
+
+        if anim_curve is None:
+            anim_curve = oma.MFnAnimCurve()
+            if undoable:
+                modifier = om.MDGModifier()
+                anim_curve.create(plug, oma.MFnAnimCurve.kAnimCurveUnknown, modifier)
+                modifier.doIt()
+                _curve_edits.append(modifier)
+            else:
+                anim_curve.create(plug)
+
+        time_unit = om.MTime.uiUnit()
+        key_times = om.MTimeArray([om.MTime(time, time_unit) for time in times])
+
+        tangent_type = oma.MFnAnimCurve.kTangentLinear if linear else oma.MFnAnimCurve.kTangentGlobal
+        anim_curve.addKeys(key_times, om.MDoubleArray([float(value) for value in values]), tangent_type, tangent_type,
+                           True, curve_change)
+
+        if hold:
+            anim_curve.setOutTangentType(anim_curve.find(key_times[-1]), oma.MFnAnimCurve.kTangentStep, curve_change)
+
+        if undoable:
+            _curve_edits.append(curve_change)
+            self.register_curve_edits()
+
+
+    def register_curve_edits(self):
+        '''Put the curve edits recorded so far on the undo queue, as part of the undo chunk open.'''
+
+        if not maya.cmds.pluginInfo('uber_cam_undo', query=True, loaded=True):
+            maya.cmds.loadPlugin(UNDO_PLUGIN_PATH, quiet=True)
+
+        getattr(maya.cmds, 'uberCamCurveEdits')()
+
+
+    def add_key_edit_callback(self, callback):
+        '''Run the callback whenever keys are set, edited or removed, or a camera is deleted.
+
+        Maya has no script job event for either, so the api messages are used. Returns the ids to remove them with.
+        '''
+
+        def run_callback(*args):
+            callback()
+
+        return [oma.MAnimMessage.addAnimCurveEditedCallback(run_callback),
+                oma.MAnimMessage.addAnimKeyframeEditedCallback(run_callback),
+                om.MDGMessage.addNodeAddedCallback(run_callback, 'animCurve'),
+                om.MDGMessage.addNodeRemovedCallback(run_callback, 'camera')]
+
+
+    def remove_callbacks(self, callback_ids):
+        '''Stop running the callbacks added by add_key_edit_callback.'''
+        om.MMessage.removeCallbacks(callback_ids)
+
+
+    def get_curve_data(self, plug_path):
+        '''Pull the keys and tangents of the curve driving a plug.
+
+        Returns None if the plug is not curve driven or the curve cannot be evaluated as a hermite spline.
+        '''
+
+        anim_curve = get_anim_curve(get_plug(plug_path))
+        if anim_curve is None:
+            return None
+
+        # Weighted tangents and cycling infinities are left to maya to evaluate.
+        if anim_curve.isWeighted:
+            return None
+        if anim_curve.preInfinityType != oma.MFnAnimCurve.kConstant or \
+                anim_curve.postInfinityType != oma.MFnAnimCurve.kConstant:
+            return None
+
+        time_unit = om.MTime.uiUnit()
+        seconds_per_frame = om.MTime(1, time_unit).asUnits(om.MTime.kSeconds)
+        tangent_names = {oma.MFnAnimCurve.kTangentStep: TANGENT_STEP,
+                         oma.MFnAnimCurve.kTangentStepNext: TANGENT_STEP_NEXT}
+        times, values, in_slopes, out_slopes, out_tangent_types = list(), list(), list(), list(), list()
+
+        for index in range(anim_curve.numKeys):
+            times.append(anim_curve.input(index).asUnits(time_unit))
+            values.append(anim_curve.value(index))
+            out_tangent_types.append(tangent_names.get(anim_curve.outTangentType(index), ''))
+
+            for is_in_tangent, slopes in ((True, in_slopes), (False, out_slopes)):
+                tangent_x, tangent_y = anim_curve.getTangentXY(index, is_in_tangent)
+                # Vertical tangents have no slope to interpolate with.
+                if tangent_x == 0:
+                    return None
+                # Tangents are stored per second.
+                slopes.append(tangent_y / tangent_x * seconds_per_frame)
+
+        return CurveData(times, values, in_slopes, out_slopes, out_tangent_types)
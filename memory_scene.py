@@ -0,0 +1,660 @@
+from bisect import bisect_left, bisect_right
+
+from scene_backend import CurveData, TANGENT_STEP, TANGENT_STEP_NEXT
+
+
+# Keyable attributes and their default values on the nodes created by MemoryScene.camera.
+TRANSFORM_ATTRIBUTES = {'visibility': 1.0, 'translateX': 0.0, 'translateY': 0.0, 'translateZ': 0.0,
+                        'rotateX': 0.0, 'rotateY': 0.0, 'rotateZ': 0.0, 'scaleX': 1.0, 'scaleY': 1.0, 'scaleZ': 1.0}
+CAMERA_ATTRIBUTES = {'horizontalFilmAperture': 1.417, 'verticalFilmAperture': 0.945, 'focalLength': 35.0,
+                     'lensSqueezeRatio': 1.0, 'fStop': 5.6, 'focusDistance': 5.0, 'shutterAngle': 144.0,
+                     'centerOfInterest': 5.0}
+
+
+class MemoryCurve():
+    '''An anim curve with linear or stepped segments, evaluated with constant infinity.'''
+
+    __slots__ = ('times', 'values', 'out_tangent_types')
+
+    def __init__(self):
+
+        self.times = list()
+        self.values = list()
+        self.out_tangent_types = list()
+
+
+    def set_key(self, time, value, out_tangent_type='linear'):
+        '''Add a key, replacing any key already at that time.'''
+
+        index = bisect_left(self.times, time)
+
+        if index < len(self.times) and self.times[index] == time:
+            self.values[index] = value
+            self.out_tangent_types[index] = out_tangent_type
+        else:
+            self.times.insert(index, time)
+            self.values.insert(index, value)
+            self.out_tangent_types.insert(index, out_tangent_type)
+
+
+    def remove_keys(self, start_time, end_time):
+        '''Remove every key between start and end time.'''
+
+        start_index = bisect_left(self.times, start_time)
+        end_index = bisect_right(self.times, end_time)
+
+        del self.times[start_index:end_index]
+        del self.values[start_index:end_index]
+        del self.out_tangent_types[start_index:end_index]
+
+
+    def evaluate(self, time):
+        '''Returns the value of the curve at a time.'''
+
+        if time <= self.times[0]:
+            return self.values[0]
+        if time >= self.times[-1]:
+            return self.values[-1]
+
+        index = bisect_right(self.times, time) - 1
+        start_time, end_time = self.times[index], self.times[index + 1]
+        start_value, end_value = self.values[index], self.values[index + 1]
+
+        if self.out_tangent_types[index] == TANGENT_STEP:
+            return start_value
+        if self.out_tangent_types[index] == TANGENT_STEP_NEXT:
+            return end_value if time > start_time else start_value
+
+        return start_value + (end_value - start_value) * (time - start_time) / (end_time - start_time)
+
+
+    def get_keys(self, start_time, end_time):
+        '''Returns (time, value, out tangent type) of every key between start and end time.'''
+
+        start_index = bisect_left(self.times, start_time)
+        end_index = bisect_right(self.times, end_time)
+
+        return list(zip(self.times[start_index:end_index], self.values[start_index:end_index],
+                        self.out_tangent_types[start_index:end_index]))
+
+
+class MemoryNode():
+    '''A transform or shape in a MemoryScene.'''
+
+    __slots__ = ('name', 'node_type', 'parent', 'children', 'attributes', 'keyable', 'curves', 'inputs')
+
+    def __init__(self, name, node_type, parent, attributes):
+
+        self.name = name
+        self.node_type = node_type
+        self.parent = parent
+        self.children = list()
+        self.attributes = dict(attributes)
+        self.keyable = list(attributes)
+        # Anim curves per attribute name, and the plug connected into each other driven attribute.
+        self.curves = dict()
+        self.inputs = dict()
+
+        if parent:
+            parent.children.append(self)
+
+
+    @property
+    def path(self):
+        '''The full dag path of the node.'''
+        return f"{self.parent.path if self.parent else ''}|{self.name}"
+
+
+class MemoryScene():
+    '''In-memory stand-in for the maya.cmds calls the tool makes, and the bulk curve operations of MayaBackend.
+
+    Only the flags the tool uses are supported. Values have no units, so ui and internal units are the same.
+    '''
+
+    def __init__(self):
+
+        self.nodes = list()
+        # Nodes per full path and per short name, rebuilt after nodes are created, renamed or deleted.
+        self.path_index = None
+        self.name_index = None
+        self.current_time = 1
+        self.clipboard = list()
+        self.script_jobs = dict()
+        self.next_script_job = 1
+        # Callbacks run after every key edit, per id.
+        self.key_edit_callbacks = dict()
+        self.next_callback = 1
+        # Session settings, and the names of undo chunks left open.
+        self.settings = {'undo': True, 'refresh_suspended': False, 'ogs_paused': False, 'auto_key': False}
+        self.open_undo_chunks = list()
+        # Names of the chunks closed onto the undo queue, chunks opened inside another are part of it.
+        self.undo_chunks = list()
+
+
+    # SCENE HELPERS
+
+    def create_camera(self, name, attribute_values=None, parent=None):
+        '''Create a camera transform and shape, returns the transform.'''
+
+        transform = MemoryNode(self.unique_name(name), 'transform', parent, TRANSFORM_ATTRIBUTES)
+        shape = MemoryNode(f"{transform.name}Shape", 'camera', transform, CAMERA_ATTRIBUTES)
+        self.nodes.extend((transform, shape))
+        self.path_index = None
+
+        for attr, value in (attribute_values or dict()).items():
+            node = transform if attr in transform.attributes else shape
+            node.attributes[attr] = value
+
+        return transform
+
+
+    def unique_name(self, name):
+        '''Returns the name with a number appended if a node of that name already exists.'''
+
+        existing_names = {node.name for node in self.nodes}
+        if name not in existing_names:
+            return name
+
+        base_name = name.rstrip('0123456789')
+        number = 1
+        while f"{base_name}{number}" in existing_names:
+            number += 1
+
+        return f"{base_name}{number}"
+
+
+    def find_node(self, node_path):
+        '''Returns the node at a full path or with a unique short name.'''
+
+        node_path = node_path.split('.', 1)[0]
+
+        if self.path_index is None:
+            self.path_index = {node.path: node for node in self.nodes}
+            self.name_index = dict()
+            for node in self.nodes:
+                self.name_index.setdefault(node.name, list()).append(node)
+
+        if node_path.startswith('|'):
+            if node_path in self.path_index:
+                return self.path_index[node_path]
+        else:
+            matches = [node for node in self.name_index.get(node_path.split('|')[-1], list())
+                       if node.path.endswith(f"|{node_path}")]
+            if len(matches) > 1:
+                raise ValueError(f"More than one object matches name: {node_path}")
+            if matches:
+                return matches[0]
+
+        raise ValueError(f"No object matches name: {node_path}")
+
+
+    def find_plug(self, plug_path):
+        '''Returns the node and attribute name of a plug path.'''
+
+        node_path, attr = plug_path.rsplit('.', 1)
+        node = self.find_node(node_path)
+
+        if attr not in node.attributes:
+            raise ValueError(f"No object matches name: {plug_path}")
+
+        return node, attr
+
+
+    def get_nodes_and_attributes(self, object_path, include_shapes=True):
+        '''Returns (node, attribute) pairs for a plug path, or every keyable attribute of a node and its shapes.'''
+
+        if '.' in object_path:
+            return [self.find_plug(object_path)]
+
+        node = self.find_node(object_path)
+        nodes = [node] + (node.children if include_shapes else list())
+
+        return [(found_node, attr) for found_node in nodes for attr in found_node.keyable]
+
+
+    def evaluate(self, node, attr, time=None):
+        '''Returns the value of an attribute at a time, the current time if none is given.'''
+
+        if attr in node.inputs:
+            return self.evaluate(*self.find_plug(node.inputs[attr]), time)
+        # A choice node outputs the input picked by its selector.
+        if node.node_type == 'choice' and attr == 'output':
+            selector = int(self.evaluate(node, 'selector', time))
+            return self.evaluate(node, f"input[{selector}]", time) if f"input[{selector}]" in node.attributes else 0.0
+
+        curve = node.curves.get(attr)
+        if curve is None:
+            return node.attributes[attr]
+
+        return curve.evaluate(self.current_time if time is None else time)
+
+
+    def delete_node(self, node):
+        '''Remove a node and its children from the scene.'''
+
+        for child in list(node.children):
+            self.delete_node(child)
+
+        if node.parent:
+            node.parent.children.remove(node)
+        self.nodes.remove(node)
+        self.path_index = None
+
+        # Connections from a deleted node are broken.
+        for other_node in self.nodes:
+            for attr, source_plug in list(other_node.inputs.items()):
+                if not self.objExists(source_plug):
+                    del other_node.inputs[attr]
+
+
+    def emit(self, event):
+        '''Run the script jobs listening to an event, as maya would when it happens.'''
+
+        for job_event, callback in list(self.script_jobs.values()):
+            if job_event == event:
+                callback()
+
+
+    def keys_edited(self):
+        '''Run the key edit callbacks, as maya would after keys are edited or a camera deleted.'''
+
+        for callback in list(self.key_edit_callbacks.values()):
+            callback()
+
+
+    # COMMANDS
+
+    def ls(self, *args, type=None, long=False, l=False):
+
+        node_types = (type,) if isinstance(type, str) else type
+        nodes = [node for node in self.nodes if not node_types or node.node_type in node_types]
+
+        return [node.path if long or l else node.name for node in nodes]
+
+
+    def objExists(self, object_path):
+
+        try:
+            if '.' in object_path:
+                self.find_plug(object_path)
+            else:
+                self.find_node(object_path)
+        except ValueError:
+            return False
+
+        return True
+
+
+    def camera(self, name='camera1'):
+
+        transform = self.create_camera(name)
+
+        return [transform.name, transform.children[0].name]
+
+
+    def duplicate(self, object_path):
+
+        node = self.find_node(object_path)
+        new_transform = self.create_camera(node.name, parent=node.parent)
+
+        # Like maya, attribute values are duplicated but not the anim curves driving them.
+        for source_node, new_node in zip([node] + node.children, [new_transform] + new_transform.children):
+            new_node.attributes.update(source_node.attributes)
+
+        return [new_transform.name]
+
+
+    def rename(self, object_path, new_name):
+
+        node = self.find_node(object_path)
+        node.name = self.unique_name(new_name)
+        self.path_index = None
+
+        return node.name
+
+
+    def delete(self, *object_paths):
+
+        deleted_nodes = list()
+
+        for object_path in object_paths:
+            for path in [object_path] if isinstance(object_path, str) else object_path:
+                node = self.find_node(path)
+                deleted_nodes.extend([node] + node.children)
+                self.delete_node(node)
+
+        if any(node.node_type == 'camera' for node in deleted_nodes):
+            self.keys_edited()
+
+
+    def listAttr(self, object_path, keyable=False):
+
+        node = self.find_node(object_path)
+
+        return list(node.keyable if keyable else node.attributes)
+
+
+    def listRelatives(self, object_paths, shapes=False, parent=False, fullPath=False):
+
+        relatives = list()
+
+        for object_path in [object_paths] if isinstance(object_paths, str) else object_paths:
+            node = self.find_node(object_path)
+            if parent:
+                relatives.extend([node.parent] if node.parent else list())
+            else:
+                relatives.extend(child for child in node.children if not shapes or child.node_type != 'transform')
+
+        return [node.path if fullPath else node.name for node in relatives] or None
+
+
+    def listConnections(self, object_path, source=True, destination=True, connections=False, plugs=False,
+                        type=None):
+
+        node = self.find_node(object_path)
+        found = list()
+
+        # Anim curves are the only connections in the scene.
+        if source and type in (None, 'animCurve'):
+            for attr in node.curves:
+                curve_name = f"{node.name}_{attr}"
+                found.extend([f"{node.name}.{attr}", curve_name] if connections else [curve_name])
+
+        return found or None
+
+
+    def addAttr(self, object_path, longName, dataType=None, attributeType=None, keyable=False):
+
+        node = self.find_node(object_path)
+        node.attributes[longName] = '' if dataType == 'string' else 0.0
+        if keyable:
+            node.keyable.append(longName)
+
+
+    def createNode(self, node_type, name=None):
+
+        # Only choice nodes are supported, their inputs are added as they are connected.
+        node = MemoryNode(self.unique_name(name or f"{node_type}1"), node_type, None, {'selector': 0.0, 'output': 0.0})
+        self.nodes.append(node)
+        self.path_index = None
+
+        return node.name
+
+
+    def connectAttr(self, source_plug, destination_plug, force=False):
+
+        node_path, attr = destination_plug.rsplit('.', 1)
+        node = self.find_node(node_path)
+        self.find_plug(source_plug)
+
+        if node.node_type == 'choice' and attr.startswith('input['):
+            node.attributes.setdefault(attr, 0.0)
+        elif attr not in node.attributes:
+            raise ValueError(f"No object matches name: {destination_plug}")
+        if attr in node.inputs and not force:
+            raise RuntimeError(f"{destination_plug} is already connected.")
+
+        node.inputs[attr] = source_plug
+
+
+    def setAttr(self, plug_path, value, type=None):
+
+        node, attr = self.find_plug(plug_path)
+        node.attributes[attr] = value
+
+
+    def getAttr(self, plug_path, time=None):
+
+        node, attr = self.find_plug(plug_path)
+
+        return self.evaluate(node, attr, time)
+
+
+    def setKeyframe(self, object_path, attribute=None, insert=False, time=None, value=None):
+
+        key_time = self.current_time if time is None else (time[0] if isinstance(time, tuple) else time)
+        plug_path = f"{object_path}.{attribute}" if attribute else object_path
+
+        for node, attr in self.get_nodes_and_attributes(plug_path):
+            # Insert only adds keys to existing curves.
+            if insert and attr not in node.curves:
+                continue
+            key_value = self.evaluate(node, attr, key_time) if value is None else value
+            node.curves.setdefault(attr, MemoryCurve()).set_key(key_time, key_value)
+
+        self.keys_edited()
+
+        return 1
+
+
+    def keyTangent(self, plug_path, time=None, outTangentType=None):
+
+        for node, attr in self.get_nodes_and_attributes(plug_path):
+            curve = node.curves.get(attr)
+            if curve is None:
+                continue
+            for index, key_time in enumerate(curve.times):
+                if time is None or time[0] <= key_time <= time[1]:
+                    curve.out_tangent_types[index] = outTangentType
+
+        self.keys_edited()
+
+
+    def keyframe(self, object_path, query=False, keyframeCount=False, timeChange=False, valueChange=False):
+
+        keys = list()
+
+        for node, attr in self.get_nodes_and_attributes(object_path):
+            curve = node.curves.get(attr)
+            if curve:
+                keys.extend(curve.get_keys(float('-inf'), float('inf')))
+
+        if keyframeCount:
+            return len(keys)
+        if valueChange:
+            return [key_value for _, key_value, _ in keys] or None
+
+        return [key_time for key_time, _, _ in keys] or None
+
+
+    def cutKey(self, object_path, time=None, clear=False):
+
+        for node, attr in self.get_nodes_and_attributes(object_path):
+            curve = node.curves.get(attr)
+            if curve is None:
+                continue
+            curve.remove_keys(*(time or (float('-inf'), float('inf'))))
+            if not curve.times:
+                del node.curves[attr]
+
+        self.keys_edited()
+
+
+    def copyKey(self, object_path, time=None, option='keys'):
+
+        start_time, end_time = time or (float('-inf'), float('inf'))
+        self.clipboard = list()
+
+        transform = self.find_node(object_path)
+        for node, attr in self.get_nodes_and_attributes(object_path):
+            curve = node.curves.get(attr)
+            if curve is None:
+                continue
+            keys = curve.get_keys(start_time, end_time)
+            # The curve option evaluates keys at the ends of the time range.
+            if option == 'curve' and time:
+                for boundary_time in (start_time, end_time):
+                    if boundary_time not in curve.times:
+                        keys.append((boundary_time, curve.evaluate(boundary_time), 'linear'))
+                keys.sort()
+            if keys:
+                self.clipboard.append((node is not transform, attr, keys))
+
+        return len(self.clipboard)
+
+
+    def pasteKey(self, object_path, time=None, option='replace'):
+
+        transform = self.find_node(object_path)
+        shape = transform.children[0] if transform.children else None
+
+        for is_shape, attr, keys in self.clipboard:
+            node = shape if is_shape else transform
+            if node is None or attr not in node.attributes:
+                continue
+            curve = node.curves.setdefault(attr, MemoryCurve())
+            if option == 'replace':
+                curve.remove_keys(*(time or (keys[0][0], keys[-1][0])))
+            for key_time, key_value, out_tangent_type in keys:
+                curve.set_key(key_time, key_value, out_tangent_type)
+
+        self.keys_edited()
+
+        return len(self.clipboard)
+
+
+    def scriptJob(self, event=None, exists=None, kill=None, force=False):
+
+        if exists is not None:
+            return exists in self.script_jobs
+        if kill is not None:
+            self.script_jobs.pop(kill, None)
+            return None
+
+        job_id = self.next_script_job
+        self.next_script_job += 1
+        self.script_jobs[job_id] = tuple(event)
+
+        return job_id
+
+
+    def add_key_edit_callback(self, callback):
+        '''Run the callback whenever keys are set, edited or removed, or a camera is deleted, returns its ids.'''
+
+        callback_id = self.next_callback
+        self.next_callback += 1
+        self.key_edit_callbacks[callback_id] = callback
+
+        return [callback_id]
+
+
+    def remove_callbacks(self, callback_ids):
+
+        for callback_id in callback_ids:
+            self.key_edit_callbacks.pop(callback_id, None)
+
+
+    def undoInfo(self, query=False, state=False, openChunk=False, closeChunk=False, chunkName='',
+                 stateWithoutFlush=None):
+
+        if query and state:
+            return self.settings['undo']
+        if openChunk:
+            self.open_undo_chunks.append(chunkName)
+        if closeChunk:
+            chunk_name = self.open_undo_chunks.pop()
+            if not self.open_undo_chunks:
+                self.undo_chunks.append(chunk_name)
+        if stateWithoutFlush is not None:
+            self.settings['undo'] = stateWithoutFlush
+
+
+    def refresh(self, suspend=None):
+
+        if suspend is not None:
+            self.settings['refresh_suspended'] = suspend
+
+
+    def ogs(self, query=False, pause=False):
+
+        if query:
+            return self.settings['ogs_paused']
+        if pause:
+            self.settings['ogs_paused'] = not self.settings['ogs_paused']
+
+
+    def autoKeyframe(self, query=False, state=None):
+
+        if query:
+            return self.settings['auto_key']
+        self.settings['auto_key'] = state
+
+
+    # BULK OPERATIONS
+
+    def sample_plugs(self, plug_paths, start_time, end_time):
+        '''Sample the plugs on every frame between start and end time, returns one value list per plug.'''
+
+        samples = list()
+
+        for plug_path in plug_paths:
+            node, attr = self.find_plug(plug_path)
+            curve = node.curves.get(attr)
+            if attr in node.inputs:
+                samples.append([self.evaluate(node, attr, frame) for frame in range(start_time, end_time + 1)])
+            elif curve is None:
+                samples.append([node.attributes[attr]] * (end_time - start_time + 1))
+            else:
+                samples.append([curve.evaluate(frame) for frame in range(start_time, end_time + 1)])
+
+        return samples
+
+
+    def get_keyed_ranges(self, node_paths):
+        '''Returns the first and last key time on each node and its shapes, None for nodes with no keys.'''
+
+        keyed_ranges = list()
+
+        for node_path in node_paths:
+            curves = [node.curves[attr] for node, attr in self.get_nodes_and_attributes(node_path)
+                      if node.curves.get(attr)]
+            keyed_ranges.append((min(curve.times[0] for curve in curves), max(curve.times[-1] for curve in curves))
+                                if curves else None)
+
+        return keyed_ranges
+
+
+    def to_internal_units(self, plug_paths, value):
+        '''Returns the value for every plug, values have no units.'''
+        return [value] * len(plug_paths)
+
+
+    def query_samples(self, plug_paths, start_time, end_time):
+        '''Sample the plugs with a getAttr on every frame, the reference faster sampling is checked against.'''
+
+        return [[self.getAttr(plug_path, time=frame) for frame in range(start_time, end_time + 1)]
+                for plug_path in plug_paths]
+
+
+    def write_curve(self, plug_path, times, values, hold=False, linear=False):
+        '''Write all keys of a curve, merging them with any existing keys on the plug. Keys are always linear.'''
+
+        node, attr = self.find_plug(plug_path)
+        curve = node.curves.setdefault(attr, MemoryCurve())
+
+        for key_time, key_value in zip(times, values):
+            curve.set_key(key_time, float(key_value))
+
+        if hold:
+            curve.out_tangent_types[curve.times.index(times[-1])] = TANGENT_STEP
+
+        self.keys_edited()
+
+
+    def get_curve_data(self, plug_path):
+        '''Returns the keys and tangents of the curve driving a plug, None if the plug is not curve driven.'''
+
+        node, attr = self.find_plug(plug_path)
+        curve = node.curves.get(attr)
+        if curve is None:
+            return None
+
+        # Linear tangents take the slope of the segment either side of a key.
+        segment_slopes = [(end_value - start_value) / (end_time - start_time) for start_time, end_time, start_value,
+                          end_value in zip(curve.times, curve.times[1:], curve.values, curve.values[1:])]
+        segment_slopes = segment_slopes or [0.0]
+        in_slopes = segment_slopes[:1] + segment_slopes
+        out_slopes = segment_slopes + segment_slopes[-1:]
+
+        return CurveData(list(curve.times), list(curve.values), in_slopes[:len(curve.times)],
+                         out_slopes[:len(curve.times)], list(curve.out_tangent_types))
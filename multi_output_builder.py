@@ -0,0 +1,141 @@
+from contextlib import nullcontext
+
+from anim_cam_manager_utils import get_keyable_attributes, get_shape_path, query_cache, suspended_scene
+from curve_sampler import CurveSampler
+from uber_cam_builder import ShotRange, UberCamBuilder
+
+
+class BuildOutput():
+    '''An uber cam to build from some of the shots, clipped to a start and end frame when given.'''
+
+    __slots__ = ('cam_name', 'shots', 'start_frame', 'end_frame')
+
+    def __init__(self, cam_name, shots, start_frame=None, end_frame=None):
+
+        self.cam_name = cam_name
+        self.shots = shots
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+
+
+    def get_shots(self):
+        '''Returns the shot ranges clipped to the frames of the output, leaving out shots entirely outside them.'''
+
+        clipped_shots = list()
+
+        for shot in self.shots:
+            in_frame = shot.in_frame if self.start_frame is None else max(shot.in_frame, self.start_frame)
+            out_frame = shot.out_frame if self.end_frame is None else min(shot.out_frame, self.end_frame)
+            if in_frame <= out_frame:
+                clipped_shots.append(ShotRange(shot.camera_path, shot.camera_name, in_frame, out_frame))
+
+        return clipped_shots
+
+
+class MultiOutputBuilder():
+    '''Builds several uber cams, such as one for the sequence and one per reel, from one sampling of the shots.
+
+    Every source camera is sampled once over all the frames any output uses, and each output bakes from slices of
+    those samples. With a memory limit the samples cannot all be held, so each output streams its own windows
+    through the shared sampler instead. Keyword arguments are passed on to the UberCamBuilder of every output.
+    '''
+
+    def __init__(self, outputs, bake=True, undoable=True, **builder_kwargs):
+
+        self.outputs = outputs
+        self.bake = bake
+        self.undoable = undoable
+        self.cam_name = '_'.join(output.cam_name for output in outputs)
+
+        self.warnings = []
+        self.profiler = builder_kwargs.get('profiler')
+        # Source curves and samples shared by the builds of every output.
+        self.memory_limit = builder_kwargs.get('memory_limit')
+        self.sampler = CurveSampler(self.memory_limit)
+        self.bake_cache = builder_kwargs.get('bake_cache')
+        self.builders = [UberCamBuilder(output.cam_name, output.get_shots(), bake, undoable=undoable,
+                                        sampler=self.sampler, **builder_kwargs) for output in outputs]
+        self.started_builders = list()
+
+
+    @property
+    def key_counts(self):
+        '''Keys a full bake would have written and keys left on the uber cams, for the shots of every output.'''
+        return {key: sum(builder.key_counts[key] for builder in self.builders) for key in ('baked', 'reduced')}
+
+
+    @property
+    def rollback_warnings(self):
+        '''What rolling back did to the uber cams of the outputs started, for the artist to know what was kept.'''
+        return [warning for builder in self.started_builders for warning in builder.rollback_warnings]
+
+
+    def build(self):
+        '''Build every output with the scene suspended, returns the uber cam of each.'''
+
+        with suspended_scene(f"build{self.cam_name}", self.undoable):
+            for _ in self.iter_build():
+                pass
+
+        return [builder.uber_cam for builder in self.builders]
+
+
+    def iter_build(self):
+        '''Sample the shots, then build the outputs a unit at a time, yielding the units done and the total.'''
+
+        query_cache.clear()
+        query_cache.reset_stats()
+        self.sampler.clear()
+        if self.bake_cache:
+            self.bake_cache.reset_stats()
+        self.started_builders = list()
+
+        if self.bake and self.memory_limit is None:
+            with self.profiler.stage('sample_sources') if self.profiler else nullcontext():
+                self.sample_sources()
+
+        # Outputs updated in place may rebuild fewer units than this, their totals are corrected as they start.
+        unit_counts = [sum(1 for _ in builder.iter_build_units()) for builder in self.builders]
+        units_before = 0
+
+        for i, builder in enumerate(self.builders):
+            self.started_builders.append(builder)
+            units_done = 0
+            for units_done, unit_count in builder.iter_build():
+                unit_counts[i] = unit_count
+                yield units_before + units_done, sum(unit_counts)
+            unit_counts[i] = units_done
+            units_before += units_done
+
+            for warning in builder.warnings:
+                if warning not in self.warnings:
+                    self.warnings.append(warning)
+
+
+    def get_source_ranges(self):
+        '''Returns the first and last frame every output uses of each source camera.'''
+
+        source_ranges = dict()
+
+        for builder in self.builders:
+            for shot in builder.shots:
+                start_time, end_time = source_ranges.get(shot.camera_path, (shot.in_frame, shot.out_frame))
+                source_ranges[shot.camera_path] = (min(start_time, shot.in_frame), max(end_time, shot.out_frame))
+
+        return source_ranges
+
+
+    def sample_sources(self):
+        '''Sample every keyable attribute of the source cameras once, over all the frames the outputs use.'''
+
+        for camera_path, (start_time, end_time) in self.get_source_ranges().items():
+            plug_paths = [f"{node}.{attr}" for node in (camera_path, get_shape_path(camera_path))
+                          for attr in get_keyable_attributes(node) or list()]
+            self.sampler.sample_plugs(plug_paths, start_time, end_time)
+
+
+    def rollback(self):
+        '''Undo every output built or started by a build that did not finish.'''
+
+        for builder in self.started_builders:
+            builder.rollback()
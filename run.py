@@ -1,5 +1,4 @@
 import sys
-import maya.cmds as cmds
 
 
 SCRIPT_PATH = ''
@@ -8,15 +7,14 @@ SCRIPT_PATH = ''
 def run_anim_cam_manager():
 
     # Ensure scripts as accessible in maya.
-    script_path = SCRIPT_PATH.trim().replace('\\', '/')
+    script_path = SCRIPT_PATH.strip().replace('\\', '/')
 
     if script_path not in sys.path:
         sys.path.append(script_path)
-    cmds.refresh(scripts=True)
 
-    # Run a new window.
+    # The window is kept between runs, so running this again only reopens it.
     import anim_cam_manager
-    anim_cam_manager.create_new_window()
+    anim_cam_manager.show_window()
 
 
 run_anim_cam_manager()
@@ -0,0 +1,83 @@
+from collections import Counter
+from contextlib import contextmanager
+
+# Out tangent types the samplers need to tell apart, every other type is interpolated.
+TANGENT_STEP = 'step'
+TANGENT_STEP_NEXT = 'stepnext'
+
+
+class CurveData():
+    '''Keys and tangents of an anim curve, the form curves are exchanged in between backends and samplers.'''
+
+    __slots__ = ('times', 'values', 'in_slopes', 'out_slopes', 'out_tangent_types')
+
+    def __init__(self, times, values, in_slopes, out_slopes, out_tangent_types):
+
+        # Key times in frames, values in internal units and tangent slopes in internal units per frame.
+        self.times = times
+        self.values = values
+        self.in_slopes = in_slopes
+        self.out_slopes = out_slopes
+        self.out_tangent_types = out_tangent_types
+
+
+class SceneCommands():
+    '''Forwards maya.cmds style calls to the active scene backend, counting every call made.'''
+
+    def __init__(self):
+
+        self.call_counts = Counter()
+
+
+    def __getattr__(self, name):
+
+        command = getattr(get_backend(), name)
+        call_counts = self.call_counts
+
+        def counted_command(*args, **kwargs):
+            call_counts[name] += 1
+            return command(*args, **kwargs)
+
+        return counted_command
+
+
+    def total_calls(self):
+        '''Returns the number of calls made through every command.'''
+        return sum(self.call_counts.values())
+
+
+# Every module issues its scene commands through here instead of importing maya.cmds.
+cmds = SceneCommands()
+_active_backend = None
+
+
+def get_backend():
+    '''Returns the active scene backend, the running maya session unless another one was set.'''
+
+    global _active_backend
+
+    if _active_backend is None:
+        from maya_backend import MayaBackend
+        _active_backend = MayaBackend()
+
+    return _active_backend
+
+
+def set_backend(backend):
+    '''Set the scene backend every command is sent to.'''
+
+    global _active_backend
+    _active_backend = backend
+
+
+@contextmanager
+def use_backend(backend):
+    '''Send every command to the backend for the length of the context.'''
+
+    previous_backend = _active_backend
+    set_backend(backend)
+
+    try:
+        yield backend
+    finally:
+        set_backend(previous_backend)
@@ -0,0 +1,228 @@
+from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PySide2.QtGui import QColor, QFont
+from PySide2.QtWidgets import QStyledItemDelegate
+
+from frame_spinbox import FrameSpinbox
+from shot_validator import get_entry_colours
+
+
+# Role holding the name of a frame cell's colour.
+COLOUR_ROLE = Qt.UserRole + 1
+
+
+class ShotTableModel(QAbstractTableModel):
+    '''Table of the camera entries on the board, one row per entry.'''
+
+    NAME_COLUMN, IN_COLUMN, OUT_COLUMN, INCLUDE_COLUMN = range(4)
+    headers = ["Camera Name", "In Frame", "Out Frame", "Include Cam"]
+
+    def __init__(self, camera_entries):
+
+        super(ShotTableModel, self).__init__()
+
+        self.camera_entries = camera_entries
+        # Colour names per (row, column) of every frame cell.
+        self.colours = dict()
+        # Conflicts between the ranges of the included entries, found when the colours were last updated.
+        self.conflicts = list()
+        self.colours_queued = False
+
+        self.bold_font = QFont()
+        self.bold_font.setBold(True)
+        self.brushes = {colour: QColor(*rgb) for colour, rgb in FrameSpinbox.colour_rgb.items()}
+
+        self.update_colours()
+
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.camera_entries)
+
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+
+        return None
+
+
+    def flags(self, index):
+
+        camera_entry = self.camera_entries[index.row()]
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+        if index.column() == self.INCLUDE_COLUMN:
+            flags |= Qt.ItemIsUserCheckable
+        elif index.column() in (self.IN_COLUMN, self.OUT_COLUMN):
+            # Frames of excluded cameras are greyed out and can't be edited.
+            flags = flags | Qt.ItemIsEditable if camera_entry.to_include else Qt.ItemIsSelectable
+
+        return flags
+
+
+    def data(self, index, role=Qt.DisplayRole):
+
+        camera_entry = self.camera_entries[index.row()]
+        column = index.column()
+
+        if column == self.NAME_COLUMN:
+            if role == Qt.DisplayRole:
+                return camera_entry.camera_name
+            if role == Qt.FontRole:
+                return self.bold_font
+        elif column == self.INCLUDE_COLUMN:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if camera_entry.to_include else Qt.Unchecked
+        else:
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return camera_entry.in_frame if column == self.IN_COLUMN else camera_entry.out_frame
+            if role == COLOUR_ROLE:
+                return self.colours.get((index.row(), column))
+            if role == Qt.BackgroundRole and (index.row(), column) in self.colours:
+                return self.brushes[self.colours[(index.row(), column)]]
+            if role == Qt.ForegroundRole and (index.row(), column) in self.colours:
+                return QColor(0, 0, 0)
+
+        return None
+
+
+    def setData(self, index, value, role=Qt.EditRole):
+
+        camera_entry = self.camera_entries[index.row()]
+        column = index.column()
+
+        if column == self.INCLUDE_COLUMN and role == Qt.CheckStateRole:
+            to_include = int(value) == int(Qt.Checked)
+            if to_include == camera_entry.to_include:
+                return True
+            camera_entry.to_include = to_include
+            # Including or excluding a camera changes whether its frames can be edited.
+            self.dataChanged.emit(self.index(index.row(), self.IN_COLUMN), index)
+        elif column in (self.IN_COLUMN, self.OUT_COLUMN) and role == Qt.EditRole:
+            attribute = 'in_frame' if column == self.IN_COLUMN else 'out_frame'
+            if getattr(camera_entry, attribute) == int(value):
+                return True
+            setattr(camera_entry, attribute, int(value))
+            self.dataChanged.emit(index, index)
+        else:
+            return False
+
+        self.queue_colours()
+
+        return True
+
+
+    def reset_entries(self, camera_entries):
+        '''Replace every entry on the board.'''
+
+        self.beginResetModel()
+        self.camera_entries[:] = camera_entries
+        self.colours = dict()
+        self.endResetModel()
+
+        self.queue_colours()
+
+
+    def append_entries(self, camera_entries):
+        '''Add entries to the end of the board.'''
+
+        if not camera_entries:
+            return
+
+        row = len(self.camera_entries)
+        self.beginInsertRows(QModelIndex(), row, row + len(camera_entries) - 1)
+        self.camera_entries.extend(camera_entries)
+        self.endInsertRows()
+
+        self.queue_colours()
+
+
+    def remove_rows(self, rows):
+        '''Remove the entries of the rows from the board.'''
+
+        for row in sorted(rows, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.camera_entries[row]
+            self.endRemoveRows()
+
+        if rows:
+            # Colours are kept per row, so the rows after a removed one all move up.
+            self.colours = dict()
+            self.queue_colours()
+
+
+    def update_rows(self, rows):
+        '''Signal that the entries of the rows changed outside the board.'''
+
+        for row in rows:
+            self.dataChanged.emit(self.index(row, self.NAME_COLUMN), self.index(row, self.INCLUDE_COLUMN))
+
+        if rows:
+            self.queue_colours()
+
+
+    def queue_colours(self):
+        '''Update the colours once control returns to the event loop.'''
+
+        # Edits made in the same tick, like a held spinbox arrow, share one update.
+        if not self.colours_queued:
+            self.colours_queued = True
+            QTimer.singleShot(0, self.update_colours)
+
+
+    def update_colours(self):
+        '''Colour the frame cells from the conflicts between the ranges of the included entries.
+
+        Only the cells whose colour changed are signalled to the view.
+        '''
+
+        self.colours_queued = False
+
+        # A full sweep costs well under a frame at thousands of shots, see benchmarks/bench_validation.py.
+        entry_colours, self.conflicts = get_entry_colours(self.camera_entries)
+
+        colours = dict()
+        for row, (in_colour, out_colour) in enumerate(entry_colours):
+            colours[(row, self.IN_COLUMN)] = in_colour
+            colours[(row, self.OUT_COLUMN)] = out_colour
+
+        old_colours = self.colours
+        self.colours = colours
+
+        for row, column in colours:
+            if old_colours.get((row, column)) != colours[(row, column)]:
+                self.dataChanged.emit(self.index(row, column), self.index(row, column))
+
+
+class FrameDelegate(QStyledItemDelegate):
+    '''Creates a FrameSpinbox only for the frame cell being edited.'''
+
+    def createEditor(self, parent, option, index):
+
+        editor = FrameSpinbox(index.column() == ShotTableModel.IN_COLUMN, parent)
+        # Commit every change as it is made so the colours follow the value.
+        editor.valueChanged.connect(lambda: self.commitData.emit(editor))
+
+        return editor
+
+
+    def setEditorData(self, editor, index):
+
+        value = index.data(Qt.EditRole)
+        if editor.value() != value:
+            editor.setValue(value)
+        editor.set_colour(index.data(COLOUR_ROLE))
+
+
+    def setModelData(self, editor, model, index):
+
+        editor.interpretText()
+        model.setData(index, editor.value(), Qt.EditRole)
+
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
@@ -0,0 +1,151 @@
+import heapq
+
+
+# Kinds of conflict between shot ranges.
+INVERTED = 'inverted'
+OVERLAP = 'overlap'
+GAP = 'gap'
+COVERED = 'covered'
+
+
+class ShotConflict():
+    '''A conflict found between shot ranges.
+
+    Shots are indices into the validated ranges. An overlap lists the earlier shot first, a covered shot lists the
+    covering shot first and a gap lists the shot before it first. Start and end are the frames in conflict.
+    '''
+
+    __slots__ = ('kind', 'shots', 'start', 'end')
+
+    def __init__(self, kind, shots, start, end):
+
+        self.kind = kind
+        self.shots = shots
+        self.start = start
+        self.end = end
+
+
+    def __repr__(self):
+        return f"ShotConflict({self.kind!r}, {self.shots!r}, {self.start!r}, {self.end!r})"
+
+
+def validate_shot_ranges(shots):
+    '''Returns every conflict between the in and out frames of the shots, ordered by frame.
+
+    Shots are swept in order of in frame, keeping a heap of the shots still running, so every overlapping pair is
+    found in O(n log n + conflicts) whatever order the shots are in.
+    '''
+
+    conflicts = list()
+    ordered_shots = list()
+
+    for i, shot in enumerate(shots):
+        if shot.in_frame > shot.out_frame:
+            conflicts.append(ShotConflict(INVERTED, (i,), shot.out_frame, shot.in_frame))
+        else:
+            ordered_shots.append((shot.in_frame, -shot.out_frame, i))
+
+    # Longer shots come first when shots start on the same frame, so shorter ones are covered by them.
+    ordered_shots.sort()
+
+    # Out frame and index of the shots still running at the current in frame.
+    running_shots = list()
+    last_out_frame, last_shot = None, None
+
+    for in_frame, out_frame, i in ordered_shots:
+        out_frame = -out_frame
+
+        while running_shots and running_shots[0][0] < in_frame:
+            heapq.heappop(running_shots)
+
+        if last_shot is not None and in_frame > last_out_frame + 1:
+            conflicts.append(ShotConflict(GAP, (last_shot, i), last_out_frame + 1, in_frame - 1))
+
+        for running_out_frame, running_shot in running_shots:
+            if running_out_frame >= out_frame:
+                conflicts.append(ShotConflict(COVERED, (running_shot, i), in_frame, out_frame))
+            else:
+                conflicts.append(ShotConflict(OVERLAP, (running_shot, i), in_frame, running_out_frame))
+
+        heapq.heappush(running_shots, (out_frame, i))
+        if last_shot is None or out_frame > last_out_frame:
+            last_out_frame, last_shot = out_frame, i
+
+    conflicts.sort(key=lambda conflict: (conflict.start, conflict.end))
+
+    return conflicts
+
+
+def get_frame_colours(shots, conflicts=None):
+    '''Returns the colour names of the in and out frame of every shot given the conflicts between them.
+
+    Frames in conflict are red, frames next to a gap are orange and every other frame is green.
+    '''
+
+    if conflicts is None:
+        conflicts = validate_shot_ranges(shots)
+
+    colours = [['green', 'green'] for _ in shots]
+
+    def set_colour(i, frame, colour):
+        if colours[i][frame] != 'red':
+            colours[i][frame] = colour
+
+    for conflict in conflicts:
+        if conflict.kind in (INVERTED, COVERED):
+            colours[conflict.shots[-1]] = ['red', 'red']
+        elif conflict.kind == OVERLAP:
+            set_colour(conflict.shots[0], 1, 'red')
+            set_colour(conflict.shots[1], 0, 'red')
+        else:
+            set_colour(conflict.shots[0], 1, 'orange')
+            set_colour(conflict.shots[1], 0, 'orange')
+
+    return colours
+
+
+def get_entry_colours(camera_entries):
+    '''Returns the in and out frame colour names of every entry, grey when left out, and the conflicts between the
+    entries included.
+
+    Every included entry is swept, as a long shot can overlap or cover shots far from it in the list.
+    '''
+
+    included_rows = [row for row, camera_entry in enumerate(camera_entries) if camera_entry.to_include]
+    included_entries = [camera_entries[row] for row in included_rows]
+    conflicts = validate_shot_ranges(included_entries)
+
+    colours = [['grey', 'grey'] for _ in camera_entries]
+    for row, frame_colours in zip(included_rows, get_frame_colours(included_entries, conflicts)):
+        colours[row] = frame_colours
+
+    return colours, conflicts
+
+
+def filter_shot_ranges(shots):
+    '''Returns the shots that can be built, ordered by in frame, and a warning for every shot left out.
+
+    Inverted and covered shots are left out, as is the earlier of two overlapping shots.
+    '''
+
+    shots_to_ignore = dict()
+
+    for conflict in validate_shot_ranges(shots):
+        if conflict.kind == INVERTED:
+            ignored_shot = conflict.shots[0]
+            reason = "in frame greater than out frame"
+        elif conflict.kind == COVERED:
+            ignored_shot = conflict.shots[1]
+            reason = f"its frames are covered by {shots[conflict.shots[0]].camera_name}"
+        elif conflict.kind == OVERLAP:
+            ignored_shot = conflict.shots[0]
+            reason = f"out frame overlaps with {shots[conflict.shots[1]].camera_name}"
+        else:
+            continue
+        shots_to_ignore.setdefault(ignored_shot, f"Ignoring {shots[ignored_shot].camera_name} as {reason}.")
+
+    # The uber cam cuts between the shots in order of their in frames.
+    shots_to_build = [shot for i, shot in enumerate(shots) if i not in shots_to_ignore]
+    shots_to_build.sort(key=lambda shot: shot.in_frame)
+
+    return shots_to_build, list(shots_to_ignore.values())
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+# The tool's modules live at the root of the repo, the synthetic scenes are shared with the benchmarks.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT_DIR, os.path.join(ROOT_DIR, 'benchmarks')]
+
+from anim_cam_manager_utils import query_cache
+from memory_scene import MemoryScene
+from scene_backend import use_backend
+from synthetic_scene import build_sequence
+
+
+@pytest.fixture
+def scene():
+    '''An in-memory scene every command is sent to, holding one camera named cam.'''
+
+    # Paths cached from the scene of another test mean nothing in this one.
+    query_cache.clear()
+
+    with use_backend(MemoryScene()) as memory_scene:
+        memory_scene.create_camera('cam')
+        yield memory_scene
+
+
+@pytest.fixture
+def shots(scene):
+    '''Four contiguous animated shot cameras of 24 frames, in cut order.'''
+    return build_sequence(scene, 4, 24)
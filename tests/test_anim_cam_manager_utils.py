@@ -0,0 +1,91 @@
+import pytest
+
+from anim_cam_manager_utils import SceneQueryCache, suspended_scene, transfer_keyframes
+
+
+@pytest.mark.parametrize('undoable', [True, False])
+def test_suspended_scene_restores_settings_when_raising(scene, undoable):
+
+    scene.autoKeyframe(state=True)
+    settings = dict(scene.settings)
+
+    with pytest.raises(RuntimeError):
+        with suspended_scene('chunk', undoable):
+            assert scene.settings['refresh_suspended'] and scene.settings['ogs_paused']
+            assert not scene.settings['auto_key']
+            assert scene.settings['undo'] == undoable
+            assert scene.open_undo_chunks == (['chunk'] if undoable else [])
+            raise RuntimeError('build failed')
+
+    assert scene.settings == settings
+    assert scene.open_undo_chunks == []
+
+
+def test_suspended_scene_leaves_a_paused_viewport_paused(scene):
+
+    scene.ogs(pause=True)
+
+    with suspended_scene('chunk'):
+        assert scene.ogs(query=True, pause=True)
+
+    assert scene.ogs(query=True, pause=True)
+
+
+def test_transfer_keyframes_leaves_the_source_untouched(scene):
+
+    for key_time, key_value in ((1, 0.0), (10, 9.0), (20, -9.0), (30, 1.0)):
+        scene.setKeyframe('cam.translateX', time=(key_time, key_time), value=key_value)
+    scene.setAttr('cam|camShape.focalLength', 50.0)
+    source_keys = scene.keyframe('cam', query=True)
+    source_samples = scene.query_samples(['cam.translateX'], 1, 30)[0]
+    scene.camera(name='target')
+
+    transfer_keyframes('|cam', '|target', 5, 15)
+
+    assert scene.keyframe('cam', query=True) == source_keys
+    assert scene.query_samples(['cam.translateX'], 1, 30)[0] == source_samples
+    # Keys inside the window are copied, with the source evaluated on its ends.
+    assert scene.keyframe('target.translateX', query=True) == [5, 10, 15]
+    assert scene.query_samples(['target.translateX'], 5, 15)[0] == pytest.approx(source_samples[4:15])
+    # Static attributes are keyed with their value on both ends.
+    assert scene.keyframe('target|targetShape.focalLength', query=True) == [5, 15]
+    assert scene.getAttr('target|targetShape.focalLength', time=10) == 50.0
+
+
+def test_query_cache_queries_each_node_once(scene):
+
+    query_cache = SceneQueryCache()
+
+    for _ in range(3):
+        assert query_cache.get_shape_path('|cam') == '|cam|camShape'
+        assert query_cache.get_keyable_attributes('|cam|camShape') == scene.listAttr('|cam|camShape', keyable=True)
+
+    assert (query_cache.hits, query_cache.misses) == (4, 2)
+    query_cache.reset_stats()
+    assert (query_cache.hits, query_cache.misses) == (0, 0)
+    query_cache.remove_scene_callbacks()
+
+
+@pytest.mark.parametrize('event', SceneQueryCache.invalidating_events)
+def test_query_cache_is_cleared_by_scene_changes(scene, event):
+
+    query_cache = SceneQueryCache()
+    query_cache.get_shape_path('|cam')
+    scene.rename('|cam', 'renamed')
+    scene.emit(event)
+
+    assert query_cache.get_shape_path('|renamed') == '|renamed|camShape'
+    assert query_cache.shape_paths == {'|renamed': '|renamed|camShape'}
+    query_cache.remove_scene_callbacks()
+
+
+def test_query_cache_script_jobs_are_killed(scene):
+
+    query_cache = SceneQueryCache()
+    query_cache.get_shape_path('|cam')
+    query_cache.get_shape_path('|cam')
+
+    # Installed once, on the first query.
+    assert len(scene.script_jobs) == len(SceneQueryCache.invalidating_events)
+    query_cache.remove_scene_callbacks()
+    assert scene.script_jobs == {}
@@ -0,0 +1,127 @@
+import os
+
+import pytest
+
+from bake_cache import BakeCache
+
+
+SAMPLES = [[0.0, 1.5, -2.25, 1e10], [5.0, 5.0, 5.0, 5.0]]
+
+
+def get_entry_bytes(samples):
+    '''Returns the size on disk of the entry of the samples.'''
+    return BakeCache.header.size + sum(len(plug_samples) for plug_samples in samples) * 8
+
+
+def set_last_used(cache, key, seconds):
+    '''Set when an entry was last used, as eviction reads it from the file times.'''
+    os.utime(cache.get_path(key), (seconds, seconds))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BakeCache(str(tmp_path))
+
+
+def test_round_trip(cache):
+
+    key = cache.get_key('curves', ['translateX', 'focalLength'], 1, 4, None)
+    cache.store(key, SAMPLES)
+
+    assert [list(plug_samples) for plug_samples in cache.load(key)] == SAMPLES
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.get_entry_sizes() == {key: get_entry_bytes(SAMPLES)}
+
+
+def test_keys_differ_with_what_was_baked(cache):
+
+    key = cache.get_key('curves', ['translateX'], 1, 4, None)
+
+    assert key == cache.get_key('curves', ['translateX'], 1, 4, None)
+    assert key != cache.get_key('edited', ['translateX'], 1, 4, None)
+    assert key != cache.get_key('curves', ['translateY'], 1, 4, None)
+    assert key != cache.get_key('curves', ['translateX'], 1, 5, None)
+    assert key != cache.get_key('curves', ['translateX'], 1, 4, 6)
+
+
+def test_missing_entry(cache):
+
+    assert cache.load(cache.get_key('curves', ['translateX'], 1, 4, None)) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_corrupt_entry_is_removed(cache):
+
+    key = cache.get_key('curves', ['translateX', 'focalLength'], 1, 4, None)
+    cache.store(key, SAMPLES)
+    with open(cache.get_path(key), 'r+b') as cache_file:
+        cache_file.truncate(get_entry_bytes(SAMPLES) - 8)
+
+    assert cache.load(key) is None
+    assert not os.path.exists(cache.get_path(key))
+    assert cache.get_entry_sizes() == {}
+
+
+def test_entries_are_found_by_a_new_cache(cache):
+
+    key = cache.get_key('curves', ['translateX', 'focalLength'], 1, 4, None)
+    cache.store(key, SAMPLES)
+
+    assert [list(plug_samples) for plug_samples in BakeCache(cache.cache_dir).load(key)] == SAMPLES
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+
+    cache = BakeCache(str(tmp_path), max_bytes=get_entry_bytes(SAMPLES) * 2)
+    keys = [cache.get_key(f"curves{i}", ['translateX', 'focalLength'], 1, 4, None) for i in range(3)]
+
+    cache.store(keys[0], SAMPLES)
+    cache.store(keys[1], SAMPLES)
+    set_last_used(cache, keys[0], 1000)
+    set_last_used(cache, keys[1], 2000)
+    # Loading the older entry makes it the most recently used.
+    cache.load(keys[0])
+    cache.store(keys[2], SAMPLES)
+
+    assert sorted(cache.get_entry_sizes()) == sorted([keys[0], keys[2]])
+    assert not os.path.exists(cache.get_path(keys[1]))
+    assert sum(cache.get_entry_sizes().values()) <= cache.max_bytes
+
+
+def test_clear(cache):
+
+    for i in range(3):
+        cache.store(cache.get_key(f"curves{i}", ['translateX'], 1, 4, None), SAMPLES[:1])
+    cache.clear()
+
+    assert cache.get_entry_sizes() == {}
+    assert os.listdir(cache.cache_dir) == []
+
+
+def test_entry_evicted_by_another_process_while_loading(cache, monkeypatch):
+
+    key = cache.get_key('curves', ['translateX', 'focalLength'], 1, 4, None)
+    cache.store(key, SAMPLES)
+
+    def evicted(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, 'utime', evicted)
+
+    assert [list(plug_samples) for plug_samples in cache.load(key)] == SAMPLES
+
+
+def test_entries_of_other_processes_count_towards_the_size(tmp_path):
+
+    max_bytes = get_entry_bytes(SAMPLES) * 2
+    caches = [BakeCache(str(tmp_path), max_bytes=max_bytes) for _ in range(2)]
+    keys = [caches[0].get_key(f"curves{i}", ['translateX', 'focalLength'], 1, 4, None) for i in range(4)]
+
+    # Both caches have scanned the directory before the other stores anything.
+    for cache in caches:
+        cache.get_entry_sizes()
+    for i, key in enumerate(keys):
+        caches[i % 2].store(key, SAMPLES)
+        set_last_used(caches[0], key, 1000 * (i + 1))
+
+    assert sorted(os.listdir(str(tmp_path))) == sorted(os.path.basename(caches[0].get_path(key)) for key in keys[2:])
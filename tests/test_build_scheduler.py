@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip('PySide2.QtCore')
+
+from build_scheduler import BuildScheduler
+from uber_cam_builder import UberCamBuilder
+
+
+def run_scheduler(scheduler, slice_count=None):
+    '''Run the slices the event loop would, all of them or the first few, returns the slices run.'''
+
+    scheduler.start()
+    slices_run = 0
+
+    while scheduler.timer.isActive() and slices_run != slice_count:
+        scheduler.run_slice()
+        slices_run += 1
+
+    return slices_run
+
+
+@pytest.mark.parametrize('undoable', [True, False])
+def test_build_is_one_undo_chunk(scene, shots, undoable):
+
+    # No slice time, so every slice builds one unit.
+    scheduler = BuildScheduler(UberCamBuilder('UberCam', shots, batch_frames=5, undoable=undoable), 0)
+
+    assert run_scheduler(scheduler) > 1
+    assert scene.undo_chunks == (['buildUberCam'] if undoable else [])
+    assert scene.open_undo_chunks == []
+    assert scene.settings['undo'] and not scene.settings['refresh_suspended']
+
+
+def test_cancel_rolls_back_in_the_build_chunk(scene, shots):
+
+    scheduler = BuildScheduler(UberCamBuilder('UberCam', shots, batch_frames=5), 0)
+    run_scheduler(scheduler, 3)
+    scheduler.cancel()
+
+    assert not scene.objExists('UberCam')
+    assert scene.undo_chunks == ['buildUberCam']
+    assert scene.open_undo_chunks == []
+
+
+def test_failed_build_closes_the_undo_chunk(scene, shots):
+
+    builder = UberCamBuilder('UberCam', shots, batch_frames=5)
+    scheduler = BuildScheduler(builder, 0)
+    builder.build_shot = None
+
+    run_scheduler(scheduler)
+
+    assert isinstance(scheduler.error, TypeError)
+    assert not scene.objExists('UberCam')
+    assert scene.undo_chunks == ['buildUberCam']
+    assert scene.open_undo_chunks == []
@@ -0,0 +1,136 @@
+import pytest
+
+import struct
+import sys
+
+from cam_track import ALIGNMENT, CameraTrack, export_track, get_channel_plugs, import_track
+
+
+# Key times and values of the channels keyed on the exported camera.
+CHANNEL_KEYS = {'translateX': ((1, 0.0), (10, 25.0), (24, -3.5)),
+                'rotateY': ((1, 0.5), (24, -1.25)),
+                'focalLength': ((1, 35.0), (12, 50.0), (24, 85.0))}
+
+
+def key_camera(scene):
+    '''Key the channels of the camera of the scene.'''
+
+    for channel, keys in CHANNEL_KEYS.items():
+        node_path = '|cam' if channel != 'focalLength' else '|cam|camShape'
+        for key_time, key_value in keys:
+            scene.setKeyframe(f"{node_path}.{channel}", time=(key_time, key_time), value=key_value)
+
+
+@pytest.fixture
+def track_path(scene, tmp_path):
+
+    key_camera(scene)
+    track_path = str(tmp_path / 'cam.camtrack')
+    export_track('|cam', track_path)
+
+    return track_path
+
+
+def get_channel_samples(transform_path, start_frame, end_frame, scene):
+    '''Returns the samples of every track channel of a camera, per channel.'''
+
+    channel_plugs = get_channel_plugs(transform_path)
+    samples = scene.sample_plugs([plug_path for _, plug_path in channel_plugs], start_frame, end_frame)
+
+    return {channel: plug_samples for (channel, _), plug_samples in zip(channel_plugs, samples)}
+
+
+def test_export_writes_the_keyed_range(scene, track_path):
+
+    with CameraTrack(track_path) as track:
+        assert (track.camera_name, track.start_frame, track.end_frame, track.frame_count) == ('cam', 1, 24, 24)
+        assert track.channels == [channel for channel, _ in get_channel_plugs('|cam')]
+        assert all(offset % ALIGNMENT == 0 for offset in track.offsets.values())
+
+        expected_samples = get_channel_samples('|cam', 1, 24, scene)
+        assert {channel: track.read(channel).tolist() for channel in track.channels} == expected_samples
+
+
+def test_read_range_is_clamped_to_the_track(scene, track_path):
+
+    expected_samples = get_channel_samples('|cam', 1, 24, scene)
+
+    with CameraTrack(track_path) as track:
+        assert track.read('translateX', 5, 8).tolist() == expected_samples['translateX'][4:8]
+        assert track.read('translateX', -10, 3).tolist() == expected_samples['translateX'][:3]
+        assert track.read('translateX', 20, 100).tolist() == expected_samples['translateX'][19:]
+        assert track.read('translateX', 30, 40).tolist() == []
+
+
+def test_windowed_export_matches_a_single_window(scene, tmp_path):
+
+    key_camera(scene)
+    track_paths = [str(tmp_path / f"{window_frames}.camtrack") for window_frames in (1000, 5)]
+    for track_path, window_frames in zip(track_paths, (1000, 5)):
+        export_track('|cam', track_path, window_frames=window_frames)
+
+    with open(track_paths[0], 'rb') as track_file, open(track_paths[1], 'rb') as windowed_track_file:
+        assert track_file.read() == windowed_track_file.read()
+
+
+def test_round_trip(scene, track_path):
+
+    imported_camera = import_track(track_path, 'importedCam')
+
+    assert imported_camera[0] == 'importedCam'
+    assert get_channel_samples('|importedCam', 1, 24, scene) == get_channel_samples('|cam', 1, 24, scene)
+
+
+def test_import_range(scene, track_path):
+
+    imported_camera = import_track(track_path, start_frame=10, end_frame=12)
+
+    assert imported_camera[0] != 'cam'
+    assert scene.keyframe(f"{imported_camera[0]}.translateX", query=True) == [10, 11, 12]
+
+
+def test_export_of_unkeyed_camera_needs_a_range(scene, tmp_path):
+
+    scene.create_camera('emptyCam')
+    track_path = str(tmp_path / 'emptyCam.camtrack')
+
+    with pytest.raises(ValueError):
+        export_track('|emptyCam', track_path)
+
+    export_track('|emptyCam', track_path, 1, 3)
+    with CameraTrack(track_path) as track:
+        assert track.read('focalLength').tolist() == [35.0] * 3
+
+
+def test_other_files_are_not_read_as_tracks(tmp_path):
+
+    other_path = tmp_path / 'other.camtrack'
+    other_path.write_bytes(b'\0' * 256)
+
+    with pytest.raises(ValueError):
+        CameraTrack(str(other_path))
+
+
+def test_samples_are_little_endian(scene, track_path):
+
+    with CameraTrack(track_path) as track:
+        offset = track.offsets['translateX']
+        expected_samples = track.read('translateX').tolist()
+
+    with open(track_path, 'rb') as track_file:
+        track_file.seek(offset)
+        assert list(struct.unpack('<24d', track_file.read(24 * 8))) == expected_samples
+
+
+def test_big_endian_hosts_swap_the_samples(scene, track_path, tmp_path, monkeypatch):
+
+    with CameraTrack(track_path) as track:
+        expected_samples = track.read('translateX').tolist()
+
+    # Swapped on both writing and reading, the samples come back the same.
+    monkeypatch.setattr(sys, 'byteorder', 'big' if sys.byteorder == 'little' else 'little')
+    swapped_track_path = str(tmp_path / 'swapped.camtrack')
+    export_track('|cam', swapped_track_path)
+
+    with CameraTrack(swapped_track_path) as track:
+        assert list(track.read('translateX')) == expected_samples
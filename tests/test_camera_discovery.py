@@ -0,0 +1,33 @@
+import pytest
+
+from camera_discovery import discover_cameras, get_camera_number
+
+
+@pytest.mark.parametrize('camera_name, expected', [('shot_0010', 10), ('sh2_v3', 23), ('cam', None)])
+def test_get_camera_number(camera_name, expected):
+    assert get_camera_number(camera_name) == expected
+
+
+def test_discover_cameras(scene):
+
+    scene.create_camera('persp')
+    scene.create_camera('shot_0020', parent=scene.create_camera('rig'))
+    scene.setKeyframe('shot_0020.translateX', time=(1010, 1010), value=0.0)
+    # Keys on the shape count towards the range.
+    scene.setKeyframe('shot_0020|shot_0020Shape.focalLength', time=(1040, 1040), value=35.0)
+    scene.setKeyframe('shot_0020.translateY', time=(1020, 1020), value=1.0)
+
+    records = {record.camera_name: record for record in discover_cameras()}
+
+    # Default cameras are skipped.
+    assert sorted(records) == ['cam', 'rig', 'shot_0020']
+    record = records['shot_0020']
+    assert (record.camera_full_name, record.camera_path) == ('|rig|shot_0020|shot_0020Shape', '|rig|shot_0020')
+    assert (record.camera_num, record.keyed_range) == (20, (1010, 1040))
+    # Unkeyed cameras have no range, and no number without digits.
+    assert (records['cam'].camera_num, records['cam'].keyed_range) == (None, None)
+
+
+def test_discover_cameras_in_an_empty_scene(scene):
+
+    assert discover_cameras(['cam']) == []
@@ -0,0 +1,134 @@
+import pytest
+
+from curve_sampler import CurveSampler, evaluate_curve, get_held_bytes, verify_against_maya
+from scene_backend import CurveData, TANGENT_STEP_NEXT, use_backend
+
+
+# Key times and values every curve is keyed with, uneven so segments differ in length.
+KEYS = ((1, 0.0), (5, 10.0), (12, -4.0), (20, -4.0), (31, 7.5))
+
+
+def hermite(start_value, end_value, start_slope, end_slope, segment_frames, s):
+    '''Reference hermite interpolation of one segment, with slopes per frame.'''
+
+    return (2 * s ** 3 - 3 * s ** 2 + 1) * start_value + (s ** 3 - 2 * s ** 2 + s) * start_slope * segment_frames + \
+        (-2 * s ** 3 + 3 * s ** 2) * end_value + (s ** 3 - s ** 2) * end_slope * segment_frames
+
+
+@pytest.mark.parametrize('tangent_type', ['linear', 'step', TANGENT_STEP_NEXT, 'flat'])
+def test_sampler_matches_memory_scene(scene, tangent_type):
+
+    for key_time, key_value in KEYS:
+        key_value = 0.0 if tangent_type == 'flat' else key_value
+        scene.setKeyframe('cam.translateX', time=(key_time, key_time), value=key_value)
+    if tangent_type != 'flat':
+        scene.keyTangent('cam.translateX', outTangentType=tangent_type)
+
+    # Frames before and after the keys check constant infinity too.
+    assert verify_against_maya(CurveSampler(), ['cam.translateX'], -5, 40, tolerance=1e-9) == {}
+
+
+def test_spline_matches_hermite_reference():
+
+    times = [key_time for key_time, _ in KEYS]
+    values = [key_value for _, key_value in KEYS]
+    in_slopes = [0.5, 2.0, -1.0, 0.0, 0.25]
+    out_slopes = [1.5, 2.0, -0.5, 0.75, 0.25]
+    curve_data = CurveData(times, values, in_slopes, out_slopes, [''] * len(times))
+
+    samples = evaluate_curve(curve_data, 1, 31)
+
+    for i in range(len(times) - 1):
+        segment_frames = times[i + 1] - times[i]
+        for frame in range(times[i], times[i + 1] + 1):
+            expected = hermite(values[i], values[i + 1], out_slopes[i], in_slopes[i + 1], segment_frames,
+                               (frame - times[i]) / segment_frames)
+            assert samples[frame - 1] == pytest.approx(expected)
+
+
+@pytest.fixture(scope='module')
+def maya_scene():
+
+    standalone = pytest.importorskip('maya.standalone')
+    standalone.initialize(name='python')
+
+    from maya import cmds as maya_cmds
+    from maya_backend import MayaBackend
+
+    with use_backend(MayaBackend()):
+        yield maya_cmds
+
+
+@pytest.mark.parametrize('tangent_type', ['spline', 'linear', 'flat', 'step', 'stepnext'])
+def test_sampler_matches_maya(maya_scene, tangent_type):
+
+    maya_scene.file(new=True, force=True)
+    transform = maya_scene.camera()[0]
+
+    for key_time, key_value in KEYS:
+        in_tangent_type = 'linear' if tangent_type in ('step', 'stepnext') else tangent_type
+        maya_scene.setKeyframe(f"{transform}.rotateY", time=key_time, value=key_value,
+                               inTangentType=in_tangent_type, outTangentType=tangent_type)
+
+    # Rotations check the sampler returns the same internal units as maya.
+    assert verify_against_maya(CurveSampler(), [f"{transform}.rotateY"], -5, 40) == {}
+
+
+def key_camera(scene):
+    '''Key translateX and rotateY of the camera with the test keys, linear on one and stepped on the other.'''
+
+    for key_time, key_value in KEYS:
+        scene.setKeyframe('cam.translateX', time=(key_time, key_time), value=key_value)
+        scene.setKeyframe('cam.rotateY', time=(key_time, key_time), value=-key_value)
+    scene.keyTangent('cam.rotateY', outTangentType='step')
+
+
+def test_sub_ranges_are_sliced_from_sampled_arrays(scene):
+
+    key_camera(scene)
+    sampler = CurveSampler()
+    sampler.sample_plugs(['cam.translateX', 'cam.rotateY'], -5, 40)
+    held_bytes = sampler.held_bytes
+    # Curves pulled from the scene again would fail.
+    scene.get_curve_data = None
+
+    for start_time, end_time in ((-5, 40), (1, 31), (3, 3), (12, 40)):
+        samples = sampler.sample_plugs(['cam.translateX', 'cam.rotateY'], start_time, end_time)
+        expected_samples = scene.query_samples(['cam.translateX', 'cam.rotateY'], start_time, end_time)
+        for plug_samples, expected_plug_samples in zip(samples, expected_samples):
+            assert list(plug_samples) == pytest.approx(expected_plug_samples)
+
+    # Nothing was pulled from the scene or held again.
+    assert len(sampler.arrays) == 2
+    assert sampler.held_bytes == held_bytes
+
+
+def test_ranges_outside_sampled_ones_are_sampled(scene):
+
+    key_camera(scene)
+    sampler = CurveSampler()
+    sampler.sample('cam.translateX', 1, 20)
+
+    assert list(sampler.sample('cam.translateX', 15, 31)) == \
+        pytest.approx(scene.query_samples(['cam.translateX'], 15, 31)[0])
+    assert sampler.sampled_ranges['cam.translateX'] == [(1, 20), (15, 31)]
+
+
+def test_memory_limit_evicts_least_recently_used(scene):
+
+    key_camera(scene)
+    sampler = CurveSampler()
+    array_bytes = get_held_bytes(sampler.sample('cam.translateX', 1, 31))
+    curve_bytes = sampler.held_bytes - array_bytes
+
+    sampler = CurveSampler(max_bytes=curve_bytes * 2 + array_bytes * 2)
+    for start_time in (1, 41, 81):
+        sampler.sample('cam.translateX', start_time, start_time + 30)
+        sampler.sample('cam.rotateY', start_time, start_time + 30)
+
+    assert sampler.held_bytes <= sampler.max_bytes
+    assert list(sampler.arrays) == [('cam.translateX', 81, 111), ('cam.rotateY', 81, 111)]
+    assert sampler.sampled_ranges == {'cam.translateX': [(81, 111)], 'cam.rotateY': [(81, 111)]}
+    # Evicted ranges are sampled again from the curves held.
+    assert list(sampler.sample('cam.translateX', 1, 31)) == \
+        pytest.approx(scene.query_samples(['cam.translateX'], 1, 31)[0])
@@ -0,0 +1,91 @@
+import math
+
+import pytest
+
+from key_reducer import drop_static_curves, reduce_samples, verify_reduction
+from memory_scene import TRANSFORM_ATTRIBUTES
+from uber_cam_builder import UberCamBuilder
+
+
+def interpolate(values, key_indices):
+    '''Returns the values rebuilt by linear interpolation between the keys kept.'''
+
+    rebuilt_values = list()
+
+    for start, end in zip(key_indices, key_indices[1:]):
+        for i in range(start, end):
+            rebuilt_values.append(values[start] + (values[end] - values[start]) * (i - start) / (end - start))
+
+    return rebuilt_values + [values[key_indices[-1]]]
+
+
+def test_reduce_short_samples():
+
+    assert reduce_samples([], 0.1) == []
+    assert reduce_samples([3.0], 0.1) == [0]
+    assert reduce_samples([3.0, 4.0], 0.1) == [0, 1]
+
+
+def test_reduce_lines_to_their_ends():
+
+    assert reduce_samples([2.0] * 50, 1e-6) == [0, 49]
+    assert reduce_samples([0.5 * i - 3 for i in range(50)], 1e-6) == [0, 49]
+
+
+def test_reduce_keeps_corners():
+
+    values = [float(i) for i in range(11)] + [float(10 - i) for i in range(1, 10)]
+
+    assert reduce_samples(values, 1e-6) == [0, 10, 19]
+
+
+@pytest.mark.parametrize('tolerance', [0.0, 1e-3, 0.05, 0.5])
+def test_reduced_samples_stay_within_tolerance(tolerance):
+
+    values = [math.sin(i * 0.07) * 10 + math.sin(i * 0.61) for i in range(300)]
+
+    key_indices = reduce_samples(values, tolerance)
+
+    assert key_indices[0] == 0 and key_indices[-1] == len(values) - 1
+    assert max(abs(value - rebuilt) for value, rebuilt in zip(values, interpolate(values, key_indices))) <= \
+        tolerance + 1e-9
+    if tolerance:
+        assert len(key_indices) < len(values)
+
+
+def test_verify_reduction(scene):
+
+    values = [math.sin(i * 0.1) for i in range(100)]
+    target_plugs = ['cam.translateX', 'cam.translateY']
+
+    for target_plug in target_plugs:
+        key_indices = reduce_samples(values, 0.01)
+        scene.write_curve(target_plug, [i + 1 for i in key_indices], [values[i] for i in key_indices], linear=True)
+
+    assert verify_reduction(target_plugs, [values, values], 1, [0.01, 0.01]) == []
+    # Tolerances are per plug, so only the plug held to a tighter one fails.
+    assert verify_reduction(target_plugs, [values, values], 1, [0.01, 1e-4]) == ['cam.translateY']
+
+
+def test_drop_static_curves(scene):
+
+    scene.write_curve('cam.translateX', [1, 10, 20], [4.0, 4.0005, 4.0])
+    scene.write_curve('cam.translateY', [1, 10, 20], [4.0, 5.0, 4.0])
+
+    assert drop_static_curves(['cam.translateX', 'cam.translateY'], 1e-3) == 3
+    assert scene.get_curve_data('cam.translateX') is None
+    assert scene.getAttr('cam.translateX') == pytest.approx(4.0)
+    assert scene.get_curve_data('cam.translateY') is not None
+
+
+def test_reduced_bake_follows_shots_within_tolerance(scene, shots):
+
+    UberCamBuilder('UberCam', shots).build()
+    builder = UberCamBuilder('ReducedCam', shots, reduce_tolerance=1e-3)
+    builder.build()
+
+    assert builder.key_counts['reduced'] < builder.key_counts['baked']
+    for attr in TRANSFORM_ATTRIBUTES:
+        samples = scene.query_samples([f"|UberCam.{attr}", f"|ReducedCam.{attr}"], shots[0].in_frame,
+                                      shots[-1].out_frame)
+        assert samples[1] == pytest.approx(samples[0], abs=1e-3), attr
@@ -0,0 +1,72 @@
+import pytest
+
+from live_rig import finalize_rig, LiveRigBuilder, read_rig
+from memory_scene import CAMERA_ATTRIBUTES, TRANSFORM_ATTRIBUTES
+from uber_cam_builder import UberCamBuilder
+
+
+def get_shot_samples(scene, cam_name, shots):
+    '''Returns the samples of every attribute of an uber cam inside the shots, where a live rig matches a bake.'''
+
+    plug_paths = [f"|{cam_name}.{attr}" for attr in TRANSFORM_ATTRIBUTES] + \
+        [f"|{cam_name}|{cam_name}Shape.{attr}" for attr in CAMERA_ATTRIBUTES]
+
+    return [value for shot in shots for plug_samples in scene.query_samples(plug_paths, shot.in_frame, shot.out_frame)
+            for value in plug_samples]
+
+
+def test_live_rig_follows_shots(scene, shots):
+
+    UberCamBuilder('BakedCam', shots).build()
+    builder = LiveRigBuilder('UberCam', shots)
+    builder.build()
+
+    assert get_shot_samples(scene, 'UberCam', shots) == pytest.approx(get_shot_samples(scene, 'BakedCam', shots))
+    assert builder.warnings == []
+    assert [shot['camera_name'] for shot in read_rig('|UberCam')['shots']] == [shot.camera_name for shot in shots]
+    assert scene.keyframe('|UberCam.translateX', query=True) is None
+
+
+def test_verify_connections_warns_of_mismatches(scene, shots):
+
+    builder = LiveRigBuilder('UberCam', shots)
+    builder.build()
+    # Drive translateX from the first shot camera whatever the shot.
+    scene.connectAttr(f"{shots[0].camera_path}.translateX", '|UberCam.translateX', force=True)
+    builder.verify_connections()
+
+    assert len(builder.warnings) == len(shots) - 1
+    assert builder.warnings[0] == f"Live uber cam differs from {shots[1].camera_name} on frame {shots[1].in_frame} " \
+        f"on translateX."
+
+
+def test_finalize_replaces_the_rig_with_a_bake(scene, shots):
+
+    UberCamBuilder('BakedCam', shots).build()
+    LiveRigBuilder('UberCam', shots).build()
+    finalize_rig('|UberCam')
+
+    assert get_shot_samples(scene, 'UberCam', shots) == pytest.approx(get_shot_samples(scene, 'BakedCam', shots))
+    assert read_rig('|UberCam') is None
+    assert scene.ls(type='choice') == []
+    assert scene.settings['undo'] and not scene.settings['refresh_suspended']
+
+
+def test_failed_finalize_restores_the_rig(scene, shots, monkeypatch):
+
+    LiveRigBuilder('UberCam', shots).build()
+    live_samples = get_shot_samples(scene, 'UberCam', shots)
+
+    def fail(self, i, start_time, end_time):
+        raise RuntimeError('bake failed')
+
+    monkeypatch.setattr(UberCamBuilder, 'build_shot', fail)
+    with pytest.raises(RuntimeError):
+        finalize_rig('|UberCam')
+
+    assert read_rig('|UberCam') is not None
+    assert get_shot_samples(scene, 'UberCam', shots) == live_samples
+    assert scene.settings['undo'] and not scene.settings['refresh_suspended']
+    # The live uber cam is built again after the finalize, not nested in it.
+    assert scene.undo_chunks == ['buildLiveUberCam', 'finalizeUberCam', 'buildLiveUberCam']
+    assert scene.open_undo_chunks == []
@@ -0,0 +1,87 @@
+import pytest
+
+from bake_cache import BakeCache
+from build_profiler import BuildProfiler
+from memory_scene import TRANSFORM_ATTRIBUTES
+from multi_output_builder import BuildOutput, MultiOutputBuilder
+from scene_backend import cmds
+from uber_cam_builder import UberCamBuilder
+
+
+def get_outputs(shots):
+    '''Returns a sequence output, a reel of the first shots and a reel clipped to frames across the last ones.'''
+    return [BuildOutput('SeqCam', shots), BuildOutput('ReelA', shots[:2]),
+            BuildOutput('ReelB', shots[2:], shots[2].in_frame + 5, shots[3].in_frame + 5)]
+
+
+def get_samples(scene, cam_name, output):
+    '''Returns the samples of every transform attribute of an uber cam over the frames of its output, in one list.'''
+
+    output_shots = output.get_shots()
+    plug_paths = [f"|{cam_name}.{attr}" for attr in TRANSFORM_ATTRIBUTES]
+
+    return [value for plug_samples in scene.query_samples(plug_paths, output_shots[0].in_frame,
+                                                          output_shots[-1].out_frame)
+            for value in plug_samples]
+
+
+def test_get_shots_clips_to_the_output_frames(shots):
+
+    output_shots = get_outputs(shots)[2].get_shots()
+
+    assert [shot.camera_name for shot in output_shots] == [shots[2].camera_name, shots[3].camera_name]
+    assert (output_shots[0].in_frame, output_shots[-1].out_frame) == (shots[2].in_frame + 5, shots[3].in_frame + 5)
+    assert BuildOutput('Empty', shots, 1, 10).get_shots() == []
+
+
+@pytest.mark.parametrize('memory_limit', [None, 4096])
+def test_outputs_match_separate_builds(scene, shots, memory_limit):
+
+    outputs = get_outputs(shots)
+    for output in outputs:
+        UberCamBuilder(f"Separate{output.cam_name}", output.get_shots()).build()
+
+    uber_cams = MultiOutputBuilder(outputs, memory_limit=memory_limit).build()
+
+    assert [uber_cam[0] for uber_cam in uber_cams] == ['SeqCam', 'ReelA', 'ReelB']
+    for output in outputs:
+        assert get_samples(scene, output.cam_name, output) == \
+            pytest.approx(get_samples(scene, f"Separate{output.cam_name}", output)), output.cam_name
+
+
+def test_sources_are_sampled_once(scene, shots):
+
+    cmds.call_counts.clear()
+    MultiOutputBuilder(get_outputs(shots)).build()
+    curve_queries = cmds.call_counts['get_curve_data']
+
+    cmds.call_counts.clear()
+    UberCamBuilder('SeqCam2', shots).build()
+
+    # Every curve of the sequence is pulled once, however many outputs use it.
+    assert curve_queries == cmds.call_counts['get_curve_data']
+
+
+def test_failed_build_rolls_back_every_output(scene, shots):
+
+    builder = MultiOutputBuilder(get_outputs(shots))
+    builder.builders[1].build_shot = None
+
+    with pytest.raises(TypeError):
+        for _ in builder.iter_build():
+            pass
+    builder.rollback()
+
+    assert not [cam_name for cam_name in ('SeqCam', 'ReelA', 'ReelB') if scene.objExists(cam_name)]
+
+
+def test_bake_cache_stats_cover_every_output(scene, shots, tmp_path):
+
+    bake_cache = BakeCache(str(tmp_path))
+    UberCamBuilder('UberCam', shots, bake_cache=bake_cache).build()
+    profiler = BuildProfiler()
+
+    MultiOutputBuilder([BuildOutput('SeqCam', shots), BuildOutput('ReelA', shots[:2])], bake_cache=bake_cache,
+                       profiler=profiler).build()
+
+    assert profiler.get_report()['caches']['bake_cache'] == {'hits': len(shots) + 2, 'misses': 0}
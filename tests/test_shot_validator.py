@@ -0,0 +1,77 @@
+import pytest
+
+from shot_validator import COVERED, filter_shot_ranges, GAP, get_frame_colours, INVERTED, OVERLAP, \
+    validate_shot_ranges
+from uber_cam_builder import ShotRange
+
+
+def make_shots(*frame_ranges):
+    '''Returns a shot range per (in frame, out frame), named after its index.'''
+    return [ShotRange(f"|shot{i}", f"shot{i}", in_frame, out_frame)
+            for i, (in_frame, out_frame) in enumerate(frame_ranges)]
+
+
+def get_conflicts(*frame_ranges):
+    '''Returns the (kind, shots, start, end) of every conflict between the frame ranges.'''
+    return [(conflict.kind, conflict.shots, conflict.start, conflict.end)
+            for conflict in validate_shot_ranges(make_shots(*frame_ranges))]
+
+
+def test_contiguous_shots_have_no_conflicts():
+    assert get_conflicts((1, 10), (11, 20), (21, 21), (22, 40)) == []
+
+
+def test_single_frame_and_empty_sequences():
+
+    assert get_conflicts() == []
+    assert get_conflicts((5, 5)) == []
+
+
+@pytest.mark.parametrize('frame_ranges, expected', [
+    (((1, 10), (8, 20)), [(OVERLAP, (0, 1), 8, 10)]),
+    (((1, 10), (15, 20)), [(GAP, (0, 1), 11, 14)]),
+    (((1, 20), (5, 10)), [(COVERED, (0, 1), 5, 10)]),
+    (((10, 1), (11, 20)), [(INVERTED, (0,), 1, 10)]),
+    # The longer of two shots starting together covers the shorter one.
+    (((1, 5), (1, 10)), [(COVERED, (1, 0), 1, 5)]),
+])
+def test_conflict_kinds(frame_ranges, expected):
+    assert get_conflicts(*frame_ranges) == expected
+
+
+def test_shots_in_any_order():
+
+    # The same sequence as in the overlap case, listed backwards.
+    assert get_conflicts((8, 20), (1, 10)) == [(OVERLAP, (1, 0), 8, 10)]
+
+
+def test_long_shot_conflicts_with_shots_far_from_it():
+
+    conflicts = get_conflicts((1, 100), (10, 20), (21, 30), (31, 40), (95, 120))
+
+    assert conflicts == [(COVERED, (0, 1), 10, 20), (COVERED, (0, 2), 21, 30), (COVERED, (0, 3), 31, 40),
+                         (OVERLAP, (0, 4), 95, 100)]
+
+
+def test_gap_after_covering_shot_is_measured_from_its_out_frame():
+    assert get_conflicts((1, 50), (5, 10), (60, 70)) == [(COVERED, (0, 1), 5, 10), (GAP, (0, 2), 51, 59)]
+
+
+def test_frame_colours():
+
+    shots = make_shots((1, 10), (8, 20), (25, 30), (40, 30))
+
+    assert get_frame_colours(shots) == [['green', 'red'], ['red', 'orange'], ['orange', 'green'], ['red', 'red']]
+
+
+def test_filter_shot_ranges():
+
+    shots = make_shots((20, 30), (1, 10), (8, 19), (12, 15), (50, 40))
+
+    shots_to_build, warnings = filter_shot_ranges(shots)
+
+    assert [shot.camera_name for shot in shots_to_build] == ['shot2', 'shot0']
+    # Warned in order of the frames in conflict.
+    assert warnings == ["Ignoring shot1 as out frame overlaps with shot2.",
+                        "Ignoring shot3 as its frames are covered by shot2.",
+                        "Ignoring shot4 as in frame greater than out frame."]
@@ -0,0 +1,223 @@
+import pytest
+
+from bake_cache import BakeCache
+from build_profiler import BuildProfiler
+from memory_scene import CAMERA_ATTRIBUTES, TRANSFORM_ATTRIBUTES
+from uber_cam_builder import UberCamBuilder
+
+
+def get_keys(scene, plug_path):
+    '''Returns the times, values and out tangent types of the keys on a plug, None if it has no curve.'''
+
+    curve_data = scene.get_curve_data(plug_path)
+
+    return curve_data and (curve_data.times, curve_data.values, curve_data.out_tangent_types)
+
+
+def assert_follows_shots(scene, uber_cam_path, shots, hold=True):
+    '''Compare every attribute of the uber cam with the shot camera it cuts to, frame by frame.
+
+    With hold, the out frame of every shot is expected to be held until the next shot.
+    '''
+
+    for i, shot in enumerate(shots):
+        end_frame = shots[i + 1].in_frame - 1 if hold and i < len(shots) - 1 else shot.out_frame
+        shape_paths = scene.listRelatives([shot.camera_path, uber_cam_path], shapes=True, fullPath=True)
+        node_pairs = ((shot.camera_path, uber_cam_path, TRANSFORM_ATTRIBUTES),
+                      (shape_paths[0], shape_paths[1], CAMERA_ATTRIBUTES))
+
+        for source_node, target_node, attributes in node_pairs:
+            for attr in attributes:
+                expected = scene.query_samples([f"{source_node}.{attr}"], shot.in_frame, shot.out_frame)[0]
+                expected += [expected[-1]] * (end_frame - shot.out_frame)
+                values = scene.query_samples([f"{target_node}.{attr}"], shot.in_frame, end_frame)[0]
+                assert values == pytest.approx(expected), f"{attr} of {shot.camera_name}"
+
+
+def get_key_times(scene, plug_path):
+    '''Returns the times of the keys on a plug.'''
+    return scene.keyframe(plug_path, query=True) or list()
+
+
+@pytest.mark.parametrize('batch_frames', [250, 7, 1])
+def test_bake_follows_shots(scene, shots, batch_frames):
+
+    uber_cam = UberCamBuilder('UberCam', shots, batch_frames=batch_frames).build()
+
+    assert uber_cam[0] == 'UberCam'
+    assert_follows_shots(scene, '|UberCam', shots)
+    assert get_key_times(scene, '|UberCam.translateX') == list(range(shots[0].in_frame, shots[-1].out_frame + 1))
+
+
+def test_bake_holds_gaps_with_a_stepped_key(scene, shots):
+
+    for shot in shots[:-1]:
+        shot.out_frame -= 5
+
+    builder = UberCamBuilder('UberCam', shots, verify_holds=True, batch_frames=7)
+    builder.build()
+
+    assert_follows_shots(scene, '|UberCam', shots)
+    # Held frames are not keyed, and the check of every hold once the next shot is baked passes.
+    key_times = get_key_times(scene, '|UberCam.translateX')
+    for shot, next_shot in zip(shots, shots[1:]):
+        assert not [key_time for key_time in key_times if shot.out_frame < key_time < next_shot.in_frame]
+    assert not [warning for warning in builder.warnings if warning.startswith('Hold')]
+    assert any('gaps' in warning for warning in builder.warnings)
+
+
+def test_transfer_follows_shots(scene, shots):
+
+    source_keys = [get_key_times(scene, f"{shot.camera_path}.translateX") for shot in shots]
+
+    UberCamBuilder('UberCam', shots, bake=False).build()
+
+    assert_follows_shots(scene, '|UberCam', shots, hold=False)
+    # Only the keys inside each shot are transferred, with a key on its in and out frame.
+    key_times = get_key_times(scene, '|UberCam.translateX')
+    for shot, shot_keys in zip(shots, source_keys):
+        expected_keys = sorted({shot.in_frame, shot.out_frame} |
+                               {key_time for key_time in shot_keys if shot.in_frame <= key_time <= shot.out_frame})
+        assert [key_time for key_time in key_times if shot.in_frame <= key_time <= shot.out_frame] == expected_keys
+
+
+def test_single_shot_is_duplicated(scene, shots):
+
+    uber_cam = UberCamBuilder('UberCam', shots[:1]).build()
+
+    assert uber_cam == ['UberCam']
+    assert_follows_shots(scene, '|UberCam', shots[:1])
+    assert get_key_times(scene, '|UberCam.translateX') == get_key_times(scene, f"{shots[0].camera_path}.translateX")
+
+
+def test_build_leaves_sources_untouched(scene, shots):
+
+    plug_paths = [f"{shot.camera_path}.{attr}" for shot in shots for attr in TRANSFORM_ATTRIBUTES]
+    source_keys = [get_keys(scene, plug_path) for plug_path in plug_paths]
+    source_samples = scene.query_samples(plug_paths, shots[0].in_frame - 10, shots[-1].out_frame + 10)
+
+    UberCamBuilder('UberCam', shots).build()
+    UberCamBuilder('TransferCam', shots, bake=False).build()
+
+    assert [get_keys(scene, plug_path) for plug_path in plug_paths] == source_keys
+    assert scene.query_samples(plug_paths, shots[0].in_frame - 10, shots[-1].out_frame + 10) == source_samples
+
+
+def edit_shots(scene, shots):
+    '''Move the cut between the first two shots and re-key the third, returns the shots changed.'''
+
+    shots[0].out_frame -= 3
+    shots[1].in_frame -= 3
+    scene.setKeyframe(f"{shots[2].camera_path}.translateX", time=(shots[2].in_frame + 5, shots[2].in_frame + 5),
+                      value=99.0)
+
+    return [0, 1, 2]
+
+
+def get_samples(scene, uber_cam_path, shots):
+    '''Returns the samples of every transform attribute of the uber cam over the shots.'''
+
+    plug_paths = [f"{uber_cam_path}.{attr}" for attr in TRANSFORM_ATTRIBUTES]
+    return scene.query_samples(plug_paths, shots[0].in_frame, shots[-1].out_frame)
+
+
+@pytest.mark.parametrize('bake', [True, False])
+def test_update_rebuilds_changed_shots(scene, shots, bake):
+
+    UberCamBuilder('UberCam', shots, bake).build()
+    changed_shots = edit_shots(scene, shots)
+    # The last shot is dropped, its frames are cleared.
+    builder = UberCamBuilder('UberCam', shots[:-1], bake, update=True)
+    builder.build()
+
+    assert builder.changed_shots == changed_shots
+    assert_follows_shots(scene, '|UberCam', shots[:-1], hold=bake)
+    assert get_key_times(scene, '|UberCam.translateX')[-1] == shots[-2].out_frame
+
+    # Nothing is left to rebuild.
+    builder = UberCamBuilder('UberCam', shots[:-1], bake, update=True)
+    builder.build()
+    assert builder.changed_shots == []
+
+
+def test_update_with_other_settings_rebuilds_every_shot(scene, shots):
+
+    UberCamBuilder('UberCam', shots, bake=False).build()
+    builder = UberCamBuilder('UberCam', shots, update=True)
+    builder.build()
+
+    assert builder.changed_shots == [0, 1, 2, 3]
+    assert_follows_shots(scene, '|UberCam', shots)
+    assert get_key_times(scene, '|UberCam.translateX') == list(range(shots[0].in_frame, shots[-1].out_frame + 1))
+
+
+def test_cancelled_update_leaves_every_shot_whole(scene, shots):
+
+    UberCamBuilder('UberCam', shots).build()
+    old_samples = get_samples(scene, '|UberCam', shots)
+    edit_shots(scene, shots)
+
+    # Cancelled after the first unit.
+    builder = UberCamBuilder('UberCam', shots, batch_frames=5, update=True)
+    next(builder.iter_build())
+    builder.rollback()
+
+    # The first shot is finished, the shots not reached are as they were, with no frames left unkeyed.
+    assert_follows_shots(scene, '|UberCam', shots[:1])
+    samples = get_samples(scene, '|UberCam', shots)
+    rebuilt_frames = shots[0].out_frame - shots[0].in_frame + 1
+    assert [plug_samples[rebuilt_frames:] for plug_samples in samples] == \
+        [plug_samples[rebuilt_frames:] for plug_samples in old_samples]
+    assert get_key_times(scene, '|UberCam.translateX') == list(range(shots[0].in_frame, shots[-1].out_frame + 1))
+    assert builder.rollback_warnings == ["Update of UberCam stopped after rebuilding 1 of 3 changed shots, the rest "
+                                         "were left as they were."]
+
+    # The next update rebuilds the rest.
+    builder = UberCamBuilder('UberCam', shots, update=True)
+    builder.build()
+    assert builder.changed_shots == [1, 2]
+    assert_follows_shots(scene, '|UberCam', shots)
+
+
+def test_failed_update_clears_the_shot_it_stopped_in(scene, shots):
+
+    UberCamBuilder('UberCam', shots).build()
+    edit_shots(scene, shots)
+
+    builder = UberCamBuilder('UberCam', shots, batch_frames=5, update=True)
+    build_shot = builder.build_shot
+
+    def fail_on_second_shot(i, start_time, end_time):
+        if i == 1:
+            raise RuntimeError('source deleted')
+        return build_shot(i, start_time, end_time)
+
+    builder.build_shot = fail_on_second_shot
+    with pytest.raises(RuntimeError):
+        for _ in builder.iter_build():
+            pass
+    builder.rollback()
+
+    assert builder.rollback_warnings[0] == "shot_0020 could not be rebuilt and was cleared from UberCam: source deleted"
+    key_times = get_key_times(scene, '|UberCam.translateX')
+    assert not [key_time for key_time in key_times if shots[1].in_frame <= key_time < shots[2].in_frame]
+    assert_follows_shots(scene, '|UberCam', shots[:1])
+
+    builder = UberCamBuilder('UberCam', shots, update=True)
+    builder.build()
+    assert builder.changed_shots == [1, 2]
+    assert_follows_shots(scene, '|UberCam', shots)
+
+
+def test_bake_cache_stats_are_profiled_per_build(scene, shots, tmp_path):
+
+    bake_cache = BakeCache(str(tmp_path))
+    reports = list()
+
+    for cam_name in ('UberCam', 'CachedCam'):
+        profiler = BuildProfiler()
+        UberCamBuilder(cam_name, shots, bake_cache=bake_cache, profiler=profiler).build()
+        reports.append(profiler.get_report()['caches']['bake_cache'])
+
+    assert reports == [{'hits': 0, 'misses': len(shots)}, {'hits': len(shots), 'misses': 0}]
+    assert_follows_shots(scene, '|CachedCam', shots)
@@ -0,0 +1,458 @@
+import json
+import time
+from contextlib import nullcontext
+
+from anim_cam_manager_utils import duplicate_camera, get_keyable_attributes, get_shape_path, transfer_keyframes, \
+    query_cache, suspended_scene
+from cam_baker import bake_camera, hash_source_curves, verify_hold
+from curve_sampler import CurveSampler, verify_against_maya
+from key_reducer import drop_static_curves
+from scene_backend import cmds
+
+
+class ShotRange():
+    '''The frame range a scene camera covers in the uber cam.'''
+
+    __slots__ = ('camera_path', 'camera_name', 'in_frame', 'out_frame')
+
+    def __init__(self, camera_path, camera_name, in_frame, out_frame):
+
+        self.camera_path = camera_path
+        self.camera_name = camera_name
+        self.in_frame = in_frame
+        self.out_frame = out_frame
+
+
+# Estimated bytes a baked window holds per attribute and frame, its samples and the values written or verified.
+WINDOW_SAMPLE_BYTES = 64
+
+
+class UberCamBuilder():
+    '''Builds an uber cam from ordered shot ranges, independently of the window.'''
+
+    # String attribute on the uber cam recording what each shot was built from.
+    manifest_attr = 'uberCamManifest'
+    manifest_version = 1
+
+    def __init__(self, cam_name, shots, bake=True, verify_holds=False, undoable=True, batch_frames=250, update=False,
+                 bake_cache=None, reduce_tolerance=None, profiler=None, sampler=None,
+                 memory_limit=None, verify_samples=False):
+
+        self.cam_name = cam_name
+        self.shots = shots
+        self.bake = bake
+        # Rebuild only the shots that changed on an existing uber cam of the same name.
+        self.update = update
+        # Frames baked per unit when the build is run a unit at a time.
+        self.batch_frames = batch_frames
+        # Undo the whole build in one step, or keep it off the undo queue.
+        self.undoable = undoable
+        # Sample the held frames once every shot is baked to check they match the end frame.
+        self.verify_holds = verify_holds
+        # Check the samples of every baked unit against querying maya on every frame, a debugging aid as it is slow.
+        self.verify_samples = verify_samples
+        # Target plugs, end time and hold time of every hold baked, with the name of the shot camera.
+        self.holds = list()
+
+        self.warnings = []
+        self.uber_cam = None
+        self.created_camera = False
+        # Signatures of the shots currently built on the uber cam, and of the shots this build will build.
+        self.built_signatures = dict()
+        self.signatures = list()
+        self.changed_shots = list()
+        # Frame ranges still keyed from shots no longer built there, cleared once an update completes.
+        self.stale_ranges = list()
+        # Index of the shot whose frames are cleared but not all rebuilt, and the first frame left to rebuild.
+        self.shot_in_progress = None
+        # What a rollback did to an updated uber cam, for the artist to know what was kept.
+        self.rollback_warnings = list()
+        # Source curves and their sampled arrays, kept for the length of a build. A sampler shared with other
+        # builds is reset by whoever shares it, along with the query cache.
+        self.sampler = sampler or CurveSampler(memory_limit)
+        # Largest size in bytes of the samples and curves held at once, baked frames are streamed through windows
+        # small enough to fit in it. None bakes batch_frames at a time and keeps every sample for the build.
+        self.memory_limit = memory_limit
+        self.shared_sampler = sampler is not None
+        # Samples of shots baked in earlier builds, on disk.
+        self.bake_cache = bake_cache
+        # Largest difference from the baked samples allowed when removing redundant keys, None to keep every key.
+        self.reduce_tolerance = reduce_tolerance if bake else None
+        # Keys a full bake would have written and keys left on the uber cam, for the shots built.
+        self.key_counts = {'baked': 0, 'reduced': 0}
+        self.baked_plugs = set()
+        # Records the time and commands of every stage of the build when given.
+        self.profiler = profiler
+
+
+    def build(self):
+        '''Run every stage of the build with the scene suspended, returns the uber cam.'''
+
+        with suspended_scene(f"build{self.cam_name}", self.undoable):
+            for _ in self.iter_build():
+                pass
+
+        return self.uber_cam
+
+
+    def iter_build(self):
+        '''Run the build one unit at a time, yielding the number of units done and the total after each one.'''
+
+        with self.profile('prepare'):
+            self.prepare()
+
+        with self.profile('create_camera'):
+            if not (self.update and self.find_camera()):
+                self.create_camera()
+        with self.profile('get_changed_shots'):
+            self.changed_shots = self.get_changed_shots()
+
+        # Units are generated as they are built, so long sequences do not hold a list of every window.
+        unit_count = sum(1 for _ in self.iter_build_units(self.changed_shots))
+        for units_done, (i, start_time, end_time) in enumerate(self.iter_build_units(self.changed_shots), 1):
+            # The old frames of a shot are only cleared once it is rebuilt, so an update stopped part way leaves
+            # every shot it has not reached as it was.
+            if start_time == self.shots[i].in_frame:
+                with self.profile('clear_frames'):
+                    self.clear_shot(i)
+            self.shot_in_progress = (i, start_time)
+            calls_before = cmds.total_calls()
+            start_seconds = time.perf_counter()
+            with self.profile('build_shot'):
+                key_count = self.build_shot(i, start_time, end_time)
+            if self.profiler:
+                self.profiler.add_shot(self.shots[i].camera_name, time.perf_counter() - start_seconds,
+                                       cmds.total_calls() - calls_before, key_count)
+            # The shot is built once its last unit is.
+            if end_time == self.shots[i].out_frame:
+                self.built_signatures[self.shots[i].camera_path] = self.signatures[i]
+                self.shot_in_progress = None
+            else:
+                self.shot_in_progress = (i, end_time + 1)
+            yield units_done, unit_count
+
+        with self.profile('clear_frames'):
+            self.clear_stale_frames()
+
+        # Holds are only tested once the keys of the next shot end them.
+        if self.holds:
+            with self.profile('verify_holds'):
+                self.verify_baked_holds()
+
+        if self.reduce_tolerance is not None:
+            with self.profile('drop_static_curves'):
+                self.key_counts['reduced'] -= drop_static_curves(sorted(self.baked_plugs), self.reduce_tolerance)
+
+        with self.profile('write_manifest'):
+            self.write_manifest()
+
+        # The caches are shared by every build, their counts are reset when a build prepares them.
+        if self.profiler:
+            self.profiler.set_cache_stats('query_cache', query_cache.hits, query_cache.misses)
+            if self.bake_cache:
+                self.profiler.set_cache_stats('bake_cache', self.bake_cache.hits, self.bake_cache.misses)
+
+
+    def profile(self, stage_name):
+        '''Returns a context recording a stage of the build when profiling, one doing nothing otherwise.'''
+        return self.profiler.stage(stage_name) if self.profiler else nullcontext()
+
+
+    def iter_build_units(self, shot_indices=None):
+        '''Yields the (shot index, start time, end time) units building the shots is split into, every shot if none.'''
+
+        # The only camera is duplicated whole when creating the camera.
+        if len(self.shots) < 2:
+            return
+
+        for i in range(len(self.shots)) if shot_indices is None else shot_indices:
+            scene_camera = self.shots[i]
+            # Keys can only be transferred a whole shot at a time, baked shots are split into windows of frames.
+            batch_frames = self.get_window_frames(scene_camera) if self.bake else \
+                scene_camera.out_frame - scene_camera.in_frame + 1
+            for start_time in range(scene_camera.in_frame, scene_camera.out_frame + 1, max(batch_frames, 1)):
+                yield i, start_time, min(start_time + batch_frames - 1, scene_camera.out_frame)
+
+
+    def get_window_frames(self, scene_camera):
+        '''Returns the frames of a shot baked per unit, fewer than batch_frames to fit within the memory limit.'''
+
+        if self.memory_limit is None:
+            return self.batch_frames
+
+        plug_count = sum(len(get_keyable_attributes(node) or list())
+                         for node in (scene_camera.camera_path, get_shape_path(scene_camera.camera_path)))
+
+        # A window takes at most half the limit, leaving the rest to the curves it is sampled from.
+        window_frames = self.memory_limit // (2 * max(plug_count, 1) * WINDOW_SAMPLE_BYTES)
+
+        return max(min(self.batch_frames, window_frames), 1)
+
+
+    def get_signatures(self):
+        '''Returns what each shot is built from, its range, the frame it is held until and its source curves.'''
+
+        signatures = list()
+
+        for i, scene_camera in enumerate(self.shots):
+            next_cam = self.shots[i + 1] if i < len(self.shots) - 1 else None
+            hold_time = next_cam.in_frame - 1 if self.bake and next_cam else scene_camera.out_frame
+            signatures.append({'camera_path': scene_camera.camera_path,
+                               'in_frame': scene_camera.in_frame,
+                               'out_frame': scene_camera.out_frame,
+                               'hold_time': hold_time,
+                               'curve_hash': hash_source_curves(scene_camera.camera_path, scene_camera.in_frame,
+                                                                scene_camera.out_frame, self.sampler)})
+
+        return signatures
+
+
+    def get_changed_shots(self):
+        '''Returns the shots that changed since the uber cam was built, which are the shots to rebuild.
+
+        Nothing is cleared yet, the frames of each shot are cleared as it is rebuilt.
+        '''
+
+        self.signatures = self.get_signatures()
+
+        return [i for i, signature in enumerate(self.signatures)
+                if self.built_signatures.get(signature['camera_path']) != signature]
+
+
+    def clear_shot(self, i):
+        '''Clear the frames a shot is about to be rebuilt on, forgetting the old shots built on any of them.
+
+        Frames of those old shots outside of every new shot are left to be cleared once the update completes.
+        '''
+
+        signature = self.signatures[i]
+        self.clear_frames(signature['in_frame'], signature['hold_time'])
+
+        for camera_path, old_signature in list(self.built_signatures.items()):
+            if old_signature['in_frame'] <= signature['hold_time'] and \
+                    signature['in_frame'] <= old_signature['hold_time']:
+                del self.built_signatures[camera_path]
+                self.stale_ranges.append((old_signature['in_frame'], old_signature['hold_time']))
+
+
+    def clear_stale_frames(self):
+        '''Clear the frames left keyed by old shots that no new shot is built on, once every shot is rebuilt.'''
+
+        camera_paths = {signature['camera_path'] for signature in self.signatures}
+        for camera_path, old_signature in list(self.built_signatures.items()):
+            if camera_path not in camera_paths:
+                del self.built_signatures[camera_path]
+                self.stale_ranges.append((old_signature['in_frame'], old_signature['hold_time']))
+
+        shot_ranges = sorted((signature['in_frame'], signature['hold_time']) for signature in self.signatures)
+
+        for start_time, end_time in self.stale_ranges:
+            # Clear the parts of the stale range between the shots.
+            for shot_start, shot_end in shot_ranges + [(end_time + 1, end_time + 1)]:
+                if shot_start > start_time:
+                    self.clear_frames(start_time, min(shot_start - 1, end_time))
+                start_time = max(start_time, shot_end + 1)
+                if start_time > end_time:
+                    break
+
+        self.stale_ranges = list()
+
+
+    def verify_baked_holds(self):
+        '''Check every stepped hold baked against keying every held frame, adding a warning for any that differ.'''
+
+        for camera_name, target_plugs, end_time, hold_time in self.holds:
+            mismatched_plugs = verify_hold(target_plugs, end_time, hold_time)
+            if mismatched_plugs:
+                self.warnings.append(f"Hold after {camera_name} is not constant on {', '.join(mismatched_plugs)}.")
+
+        self.holds = list()
+
+
+    def clear_frames(self, start_time, end_time):
+        '''Remove the keys of the uber cam and its shape between start and end time.'''
+
+        if not self.created_camera:
+            cmds.cutKey(self.uber_cam[0], time=(start_time, end_time), clear=True)
+
+
+    def find_camera(self):
+        '''Find an uber cam built earlier with the same name, returns whether it was found.'''
+
+        manifest = self.read_manifest(self.cam_name)
+
+        if not manifest or manifest['version'] != self.manifest_version or len(self.shots) < 2:
+            return False
+
+        self.uber_cam = [self.cam_name, get_shape_path(self.cam_name)]
+        self.created_camera = False
+        self.built_signatures = {signature['camera_path']: signature for signature in manifest['shots']}
+        self.stale_ranges = [tuple(stale_range) for stale_range in manifest.get('stale_ranges', list())]
+
+        # Shots built with other settings are all rebuilt, as are reduced shots since static curves may be dropped.
+        if manifest['bake'] != self.bake or manifest.get('reduce_tolerance') != self.reduce_tolerance or \
+                self.reduce_tolerance is not None:
+            self.stale_ranges.extend((signature['in_frame'], signature['hold_time'])
+                                     for signature in self.built_signatures.values())
+            self.built_signatures = dict()
+
+        return True
+
+
+    def read_manifest(self, transform_path):
+        '''Returns the manifest recorded on an uber cam, None if there is none.'''
+
+        if not cmds.objExists(f"{transform_path}.{self.manifest_attr}"):
+            return None
+
+        return json.loads(cmds.getAttr(f"{transform_path}.{self.manifest_attr}") or 'null')
+
+
+    def write_manifest(self):
+        '''Record the shots built on the uber cam, so later builds can update only the shots that changed.'''
+
+        if not self.uber_cam:
+            return
+
+        manifest_plug = f"{self.uber_cam[0]}.{self.manifest_attr}"
+        if not cmds.objExists(manifest_plug):
+            cmds.addAttr(self.uber_cam[0], longName=self.manifest_attr, dataType='string')
+
+        manifest = {'version': self.manifest_version, 'bake': self.bake, 'reduce_tolerance': self.reduce_tolerance,
+                    'shots': list(self.built_signatures.values()), 'stale_ranges': self.stale_ranges}
+        cmds.setAttr(manifest_plug, json.dumps(manifest), type='string')
+
+
+    def rollback(self):
+        '''Undo a build that did not finish, deleting a created uber cam or recording what is left of an updated one.
+
+        An updated uber cam keeps every shot whole, the old shots not reached yet and the new shots rebuilt. A shot
+        stopped part way is finished, or cleared if it cannot be.
+        '''
+
+        if not self.created_camera:
+            if self.shot_in_progress is not None:
+                self.finish_shot(*self.shot_in_progress)
+
+            rebuilt_count = sum(self.built_signatures.get(self.signatures[i]['camera_path']) == self.signatures[i]
+                                for i in self.changed_shots)
+            if rebuilt_count < len(self.changed_shots):
+                self.rollback_warnings.append(f"Update of {self.cam_name} stopped after rebuilding {rebuilt_count} of "
+                                              f"{len(self.changed_shots)} changed shots, the rest were left as they "
+                                              f"were.")
+            self.write_manifest()
+            return
+
+        if self.uber_cam and cmds.objExists(self.uber_cam[0]):
+            cmds.delete(self.uber_cam[0])
+
+        self.uber_cam = None
+
+
+    def finish_shot(self, i, start_time):
+        '''Rebuild the rest of a shot stopped part way, clearing it entirely if that fails.'''
+
+        scene_camera = self.shots[i]
+        self.shot_in_progress = None
+
+        try:
+            for _, unit_start, unit_end in self.iter_build_units([i]):
+                if unit_start >= start_time:
+                    self.build_shot(i, unit_start, unit_end)
+        except Exception as error:
+            self.clear_frames(self.signatures[i]['in_frame'], self.signatures[i]['hold_time'])
+            self.rollback_warnings.append(f"{scene_camera.camera_name} could not be rebuilt and was cleared from "
+                                          f"{self.cam_name}: {error}")
+            return
+
+        self.built_signatures[scene_camera.camera_path] = self.signatures[i]
+
+
+    def prepare(self):
+        '''Reset the caches used for the length of the build, unless they are shared with other builds.'''
+
+        if self.shared_sampler:
+            return
+
+        # Attributes and shapes are queried once per node for the whole build.
+        query_cache.clear()
+        query_cache.reset_stats()
+        self.sampler.clear()
+        if self.bake_cache:
+            self.bake_cache.reset_stats()
+
+
+    def create_camera(self):
+        '''Create the uber cam the shots are copied to.'''
+
+        self.created_camera = True
+        self.built_signatures = dict()
+
+        # Simply duplicate the only camera as the uber camera if there is only one cam to include.
+        if len(self.shots) == 1:
+            new_cam_path = duplicate_camera(self.shots[0].camera_path)
+            self.uber_cam = [cmds.rename(new_cam_path, self.cam_name)]
+            return
+
+        self.uber_cam = cmds.camera(name=self.cam_name)
+
+
+    def build_shot(self, i, start_time=None, end_time=None):
+        '''Copy the keyframes of a shot, or of a batch of its frames, to the uber cam, returns the keys written.
+
+        Adds a warning if there is a gap before the next shot.
+        '''
+
+        scene_camera = self.shots[i]
+        next_cam = self.shots[i + 1] if i < len(self.shots) - 1 else None
+        start_time = scene_camera.in_frame if start_time is None else start_time
+        end_time = scene_camera.out_frame if end_time is None else end_time
+
+        # Append warning if the out frame of this camera is not the frame before in frame of the next.
+        if next_cam and end_time == scene_camera.out_frame and scene_camera.out_frame + 1 != next_cam.in_frame:
+            warning = "On at lease one occasion," \
+                      " there are gaps of more than one frame between out frame and next in frame."
+            if warning not in self.warnings:
+                self.warnings.append(warning)
+
+        curve_hash = self.signatures[i]['curve_hash'] if self.signatures else None
+        return self.copy_cam_keyframes(scene_camera, next_cam, start_time, end_time, curve_hash)
+
+
+    def copy_cam_keyframes(self, scene_camera, next_cam, start_time, end_time, curve_hash=None):
+        '''Copy the camera keyframes between start and end time from the scene_camera to the uber_cam.
+
+        Returns the number of keys written, only counted for transferred keys when profiling.
+        '''
+
+        # If bake every frame is checked.
+        if self.bake:
+            # Bake every frame in the ui range straight onto the uber cam, holding the last frame until the next camera.
+            hold_time = next_cam.in_frame - 1 if next_cam and end_time == scene_camera.out_frame else end_time
+            plug_pairs, key_count, mismatched_plugs = bake_camera(scene_camera.camera_path, self.uber_cam[0],
+                                                                  start_time, end_time, hold_time, self.sampler,
+                                                                  self.bake_cache, curve_hash, self.reduce_tolerance)
+            self.key_counts['baked'] += len(plug_pairs) * (end_time - start_time + 1)
+            self.key_counts['reduced'] += key_count
+            self.baked_plugs.update(target_plug for _, target_plug in plug_pairs)
+            if mismatched_plugs:
+                self.warnings.append(f"Reduced keys of {scene_camera.camera_name} differ from the baked frames on "
+                                     f"{', '.join(mismatched_plugs)}.")
+            if self.verify_samples:
+                mismatches = verify_against_maya(self.sampler, [source_plug for source_plug, _ in plug_pairs],
+                                                 start_time, end_time)
+                if mismatches:
+                    errors = ', '.join(f"{plug} by {error:.6g}" for plug, error in mismatches.items())
+                    self.warnings.append(f"Samples of {scene_camera.camera_name} differ from maya on {errors}.")
+            if self.verify_holds and hold_time > end_time:
+                self.holds.append((scene_camera.camera_name, [target_plug for _, target_plug in plug_pairs], end_time,
+                                   hold_time))
+            return key_count
+
+        # Counting the keys pasted means querying every key on the uber cam, so only do it when profiling.
+        keys_before = cmds.keyframe(self.uber_cam[0], query=True, keyframeCount=True) if self.profiler else 0
+
+        # Transfer the keys in the ui range straight from the scene camera, leaving it untouched.
+        transfer_keyframes(scene_camera.camera_path, self.uber_cam[0], start_time, end_time)
+
+        return cmds.keyframe(self.uber_cam[0], query=True, keyframeCount=True) - keys_before if self.profiler else 0
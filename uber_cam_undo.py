@@ -0,0 +1,55 @@
+'''Maya plugin putting the curve edits MayaBackend makes through the api on the undo queue.
+
+The api changes curves without telling the undo queue, so the backend records each edit in an MDGModifier or
+MAnimCurveChange and then runs this command, which takes the recorded edits and undoes or redoes them with the
+chunk they were made in.
+'''
+import maya.api.OpenMaya as om
+
+
+COMMAND_NAME = 'uberCamCurveEdits'
+
+
+def maya_useNewAPI():
+    '''Tells maya the plugin uses the python api 2.0.'''
+
+
+class CurveEditsCommand(om.MPxCommand):
+    '''Undoes and redoes the curve edits recorded by MayaBackend since the command last ran.'''
+
+    def __init__(self):
+
+        super(CurveEditsCommand, self).__init__()
+
+        self.edits = list()
+
+
+    def doIt(self, args):
+
+        # Imported by name, so the edits come from the backend the tool uses rather than a copy loaded as a plugin.
+        from maya_backend import take_curve_edits
+        self.edits = take_curve_edits()
+
+
+    def redoIt(self):
+
+        for edit in self.edits:
+            edit.doIt() if isinstance(edit, om.MDGModifier) else edit.redoIt()
+
+
+    def undoIt(self):
+
+        for edit in reversed(self.edits):
+            edit.undoIt()
+
+
+    def isUndoable(self):
+        return True
+
+
+def initializePlugin(plugin):
+    om.MFnPlugin(plugin).registerCommand(COMMAND_NAME, CurveEditsCommand)
+
+
+def uninitializePlugin(plugin):
+    om.MFnPlugin(plugin).deregisterCommand(COMMAND_NAME)